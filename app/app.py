@@ -1,13 +1,9 @@
 import streamlit as st
-from dotenv import load_dotenv
+from datetime import date, timedelta
 
-from database.questionnaires import Questionnaires
-from database.questions import Questions
-from database.likert_scales import Likert_scales
-from database.likert_scale_options import Likert_scale_options
-from database.answers import Answers
-from database.responses import Responses
-from database.profiles import Profiles
+from database.repositories import Repositories
+
+from services.response_services import retrieve_submitted_responses_page
 
 from utils import supabase_client
 from utils.components import (
@@ -22,19 +18,16 @@ from utils.redirections import (
 )
 from utils.logger_config import logger
 
-# The environment vars are getting loaded for the whole process of the app
-load_dotenv()
-
 current_page = "main_page"
 
+# The number of responses that the admin's responses list shows per page
+RESPONSES_PAGE_SIZE = 20
+
+# The number of respondents that the respondent filter shows for a search
+RESPONDENT_SEARCH_LIMIT = 20
+
 client = supabase_client.get_client()
-questionnaires_repo = Questionnaires(client)
-questions_repo = Questions(client)
-answers_repo = Answers(client)
-likert_scales_repo = Likert_scales(client)
-likert_scale_options_repo = Likert_scale_options(client)
-responses_repo = Responses(client)
-profiles_repo = Profiles(client)
+repos = Repositories(client)
 
 
 # The init_ui_state function initializes all the primary UI widgets that
@@ -76,7 +69,7 @@ if __name__ == "__main__":
     user_profile = None
     try:
         user_profile = (
-            profiles_repo.get_profile_by_id(st.session_state["user_id"])
+            repos.profiles.get_profile_by_id(st.session_state["user_id"])
         )
     except RuntimeError as e:
         logger.error(f"Database error: {e}")
@@ -99,68 +92,124 @@ if __name__ == "__main__":
         st.write("## User's responses")
         questionnaires = None
         try:
-            questionnaires = questionnaires_repo.get_all_questionnaires()
+            questionnaires = repos.questionnaires.get_all_questionnaires()
         except RuntimeError as e:
             logger.error(f"Database error: {e}")
 
-        # The app makes a selectbox with all
-        # the questionnaires' title available
-        available_filter_actions = ["All"]
-        available_questionnaires = list(
-            {item["title"] for item in questionnaires.data}
-        )
-        for q_title in available_questionnaires:
-            available_filter_actions.append(q_title)
-
-        filter_title = st.selectbox(
-            "Filter by questionnaire",
-            available_filter_actions
-        )
+        if questionnaires is None:
+            st.error("Error during the responses' filters retrieval")
+            st.stop()
+
+        # The app makes selectboxes with all the questionnaires,
+        # the respondents whose name matches a search
+        # and a date range for the responses' filters
+        questionnaire_titles = {
+            item["id"]: f"{item['title']} ({item['created_at'][:10]})"
+            for item in questionnaires.data
+        }
+
+        filter_col1, filter_col2, filter_col3 = st.columns(3)
+
+        with filter_col1:
+            filter_questionnaire_id = st.selectbox(
+                "Filter by questionnaire",
+                [None, *questionnaire_titles],
+                format_func=lambda q_id: (
+                    "All" if q_id is None else questionnaire_titles[q_id]
+                )
+            )
 
-        # If the admin does not specify a questionnaire title,
-        # the app retrieves the responses of all questionnaires
-        if filter_title == "All":
-
-            try:
-                responses = responses_repo.get_all_responses()
-            except RuntimeError as e:
-                logger.error(f"Database error: {e}")
-
-            if responses is None:
-                st.error("Error during the responses retrieval")
-            elif len(responses.data) == 0:
-                st.write("There are not any responses for the questionnaires")
-            else:
-                response_list = responses.data
-                for response in response_list:
-                    create_responses_management_ui(
-                        response,
-                        "View",
-                        redirect_to_view_page
+        with filter_col2:
+            # Only the first RESPONDENT_SEARCH_LIMIT respondents whose name
+            # matches the search get retrieved, instead of every profile.
+            respondent_search = st.text_input("Search respondent by name")
+            respondent_names = {}
+            if respondent_search.strip():
+                try:
+                    respondents = repos.profiles.search_profiles_by_name(
+                        respondent_search.strip(),
+                        RESPONDENT_SEARCH_LIMIT
                     )
+                    respondent_names = {
+                        item["id"]: item["full_name"]
+                        for item in respondents.data
+                    }
+                except RuntimeError as e:
+                    logger.error(f"Database error: {e}")
+                    st.error("Error during the respondents' retrieval")
+
+            filter_user_id = st.selectbox(
+                "Filter by respondent",
+                [None, *respondent_names],
+                format_func=lambda user_id: (
+                    "All" if user_id is None else respondent_names[user_id]
+                )
+            )
 
-        # If the admin specify a questionnaire title,
-        # the app retrieves the responses of the corresponding questionnaire
+        with filter_col3:
+            filter_dates = st.date_input(
+                "Filter by submission date",
+                value=(),
+                max_value=date.today()
+            )
+
+        submitted_from, submitted_to = None, None
+        if len(filter_dates) == 2:
+            submitted_from = filter_dates[0].isoformat()
+            submitted_to = (filter_dates[1] + timedelta(days=1)).isoformat()
+
+        # The cursors of the visited pages are kept, so the admin can
+        # go back. They get reset whenever the filters change.
+        responses_filters = (
+            filter_questionnaire_id,
+            filter_user_id,
+            submitted_from,
+            submitted_to
+        )
+        if st.session_state.get("responses_filters") != responses_filters:
+            st.session_state["responses_filters"] = responses_filters
+            st.session_state["responses_page_cursors"] = [None]
+
+        page_cursors = st.session_state["responses_page_cursors"]
+
+        response_list, next_cursor = retrieve_submitted_responses_page(
+            RESPONSES_PAGE_SIZE,
+            page_cursors[-1],
+            repos.responses,
+            logger,
+            filter_questionnaire_id,
+            filter_user_id,
+            submitted_from,
+            submitted_to
+        )
+
+        if response_list is None:
+            st.error("Error during the responses retrieval")
+        elif len(response_list) == 0:
+            st.write("There are not any responses for the questionnaires")
         else:
-            try:
-                responses_by_q_title = (
-                    responses_repo.get_responses_by_questionnaire_title(
-                        filter_title
-                    )
+            for response in response_list:
+                create_responses_management_ui(
+                    response,
+                    "View",
+                    redirect_to_view_page,
+                    repos.responses
                 )
-            except RuntimeError as e:
-                logger.error(f"Database error: {e}")
-
-            if responses_by_q_title is None:
-                st.error("Error during the responses retrieval")
-            else:
-                response_list = responses_by_q_title.data
-                for response in response_list:
-                    create_responses_management_ui(
-                        response,
-                        "View",
-                        redirect_to_view_page
-                    )
+
+        prev_col, page_col, next_col = st.columns([1, 4, 1])
+
+        with prev_col:
+            if st.button("Previous", disabled=len(page_cursors) == 1):
+                page_cursors.pop()
+                st.rerun()
+
+        with page_col:
+            st.write(f"Page {len(page_cursors)}")
+
+        with next_col:
+            if st.button("Next", disabled=next_cursor is None):
+                page_cursors.append(next_cursor)
+                st.rerun()
 
     # User's main page shows all the questionnaires
     # that the user has not responded yet.
@@ -169,7 +218,7 @@ if __name__ == "__main__":
         qs = None
         try:
             qs = (
-                questionnaires_repo.get_questionnaires_without_user_response(
+                repos.questionnaires.get_questionnaires_without_user_response(
                     st.session_state["user_id"]
                 )
             )
@@ -0,0 +1,133 @@
+import argparse
+import json
+import random
+import uuid
+
+from benchmarks.scoring_benchmark import (
+    CATEGORIES,
+    LIKERT_SCALE_OPTIONS,
+    QUESTIONS_PER_RESPONSE,
+    best_of
+)
+from utils.scoring_engine import (
+    response_matrix_from_answers,
+    response_matrix_from_values
+)
+
+# Run from the app directory with:
+# python -m benchmarks.answer_payload_benchmark --responses 20000
+
+
+'''
+The generate_payloads function builds the JSON documents of the same
+submitted answers in the nested shape of
+get_submitted_answers_by_questionnaire_id and in the normalized shape
+of get_submitted_answer_values.
+'''
+
+
+def generate_payloads(n_responses: int, seed: int):
+    rng = random.Random(seed)
+    questionnaire_id = str(uuid.UUID(int=rng.getrandbits(128)))
+    questions = [
+        {
+            "id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "question_text": f"Question {i + 1} of the questionnaire",
+            "is_custom": i >= QUESTIONS_PER_RESPONSE - 2,
+            "is_negative": i % 5 == 0
+        }
+        for i in range(QUESTIONS_PER_RESPONSE)
+    ]
+    options = [
+        {"id": str(uuid.UUID(int=rng.getrandbits(128))), **option}
+        for option in LIKERT_SCALE_OPTIONS
+    ]
+    response_ids = [
+        str(uuid.UUID(int=rng.getrandbits(128)))
+        for _ in range(n_responses)
+    ]
+    answers = [
+        (response, question, rng.randrange(len(options)))
+        for response in range(n_responses)
+        for question in range(len(questions))
+    ]
+
+    nested = [
+        {
+            "response_id": response_ids[response],
+            "question_id": questions[question]["id"],
+            "responses": {"is_submitted": True},
+            "questions": {
+                "questionnaire_id": questionnaire_id,
+                "question_text": questions[question]["question_text"],
+                "category": questions[question]["category"],
+                "is_custom": questions[question]["is_custom"],
+                "is_negative": questions[question]["is_negative"]
+            },
+            "likert_scale_options": {
+                "value": options[option]["value"],
+                "label": options[option]["label"]
+            }
+        }
+        for response, question, option in answers
+    ]
+    normalized = {
+        "questions": questions,
+        "options": options,
+        "response_ids": response_ids,
+        "answers": {
+            "responses": [response for response, _, _ in answers],
+            "questions": [question for _, question, _ in answers],
+            "values": [
+                options[option]["value"]
+                for _, _, option in answers
+            ]
+        }
+    }
+
+    return json.dumps(nested), json.dumps(normalized)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmarks the normalized answers' payload "
+                    "against the nested one"
+    )
+    parser.add_argument("--responses", type=int, default=20_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    nested, normalized = generate_payloads(args.responses, args.seed)
+
+    nested_time, nested_matrix = best_of(
+        args.repeats,
+        lambda: response_matrix_from_answers(json.loads(nested))
+    )
+    normalized_time, normalized_matrix = best_of(
+        args.repeats,
+        lambda: response_matrix_from_values(json.loads(normalized))
+    )
+
+    assert (nested_matrix.values == normalized_matrix.values).all()
+
+    print(
+        f"responses: {args.responses}, "
+        f"answers: {args.responses * QUESTIONS_PER_RESPONSE}, "
+        f"best of {args.repeats}"
+    )
+    print(f"nested payload:     {len(nested) / 2**20:.1f} MiB")
+    print(
+        f"normalized payload: {len(normalized) / 2**20:.1f} MiB "
+        f"({len(nested) / len(normalized):.1f}x smaller)"
+    )
+    print(f"nested parse + matrix:     {nested_time:.4f}s")
+    print(
+        f"normalized parse + matrix: {normalized_time:.4f}s "
+        f"({nested_time / normalized_time:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import argparse
+import time
+
+import numpy as np
+from scipy.stats import spearmanr
+
+from utils.questionnaire_scoring import mapped_categories
+from utils.scoring_engine import bootstrap_spearman_intervals
+
+# Run from the app directory with:
+# python -m benchmarks.bootstrap_benchmark --responses 3000 --resamples 10000
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmarks the bootstrap of the Spearman matrix "
+                    "against a spearmanr call per resample"
+    )
+    parser.add_argument("--responses", type=int, default=3000)
+    parser.add_argument("--resamples", type=int, default=10_000)
+    parser.add_argument("--baseline-resamples", type=int, default=200)
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--memory-mib", type=int, default=256)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    constructs = list(mapped_categories)
+    # the category means are averages of a few likert answers,
+    # so they take a small number of distinct values
+    values = np.round(
+        rng.uniform(1, 5, (args.responses, len(constructs))) * 4
+    ) / 4
+
+    start = time.perf_counter()
+    for _ in range(args.baseline_resamples):
+        spearmanr(values[rng.integers(0, args.responses, args.responses)])
+    per_resample = (time.perf_counter() - start) / args.baseline_resamples
+
+    start = time.perf_counter()
+    low, high = bootstrap_spearman_intervals(
+        values,
+        args.resamples,
+        args.seed,
+        processes=args.processes,
+        memory_bytes=args.memory_mib * 2**20
+    )
+    bootstrap_time = time.perf_counter() - start
+
+    loop_time = per_resample * args.resamples
+    print(
+        f"responses: {args.responses}, constructs: {len(constructs)}, "
+        f"resamples: {args.resamples}, processes: {args.processes}"
+    )
+    print(f"spearmanr per resample (estimated): {loop_time:.4f}s")
+    print(
+        f"bootstrap_spearman_intervals:       {bootstrap_time:.4f}s "
+        f"({loop_time / bootstrap_time:.1f}x)"
+    )
+    print(f"95% CI of r({constructs[0]}, {constructs[1]}): "
+          f"[{low[0, 1]:.3f}, {high[0, 1]:.3f}]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import argparse
+import time
+import tracemalloc
+
+from benchmarks.scoring_benchmark import (
+    CATEGORIES,
+    LIKERT_SCALE_OPTIONS,
+    QUESTIONS_PER_RESPONSE,
+    best_of,
+    generate_answers
+)
+from utils.questionnaire_scoring import (
+    construct_reliability,
+    construct_scores,
+    matrix_construct_means
+)
+from utils.scoring_engine import response_matrix_from_answers
+
+# Run from the app directory with:
+# python -m benchmarks.response_matrix_benchmark --responses 100000
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmarks the memory and the statistics of a "
+                    "ResponseMatrix against the answers' rows"
+    )
+    parser.add_argument("--responses", type=int, default=100_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    tracemalloc.start()
+    answers = generate_answers(
+        args.responses * QUESTIONS_PER_RESPONSE,
+        args.seed
+    )
+    rows_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    matrix = response_matrix_from_answers(answers)
+    build_time = time.perf_counter() - start
+
+    rows_time, rows_scores = best_of(
+        args.repeats,
+        construct_scores,
+        answers,
+        LIKERT_SCALE_OPTIONS,
+        CATEGORIES
+    )
+    matrix_time, matrix_scores = best_of(
+        args.repeats,
+        construct_scores,
+        matrix,
+        LIKERT_SCALE_OPTIONS,
+        CATEGORIES
+    )
+    means_time, _ = best_of(
+        args.repeats,
+        matrix_construct_means,
+        matrix,
+        LIKERT_SCALE_OPTIONS
+    )
+    reliability_time, _ = best_of(
+        args.repeats,
+        construct_reliability,
+        matrix,
+        LIKERT_SCALE_OPTIONS,
+        CATEGORIES
+    )
+
+    assert matrix_scores == rows_scores
+
+    print(
+        f"responses: {args.responses}, "
+        f"answers: {len(answers)}, best of {args.repeats}"
+    )
+    print(f"answers' rows:           {rows_bytes / 2**20:.1f} MiB")
+    print(
+        f"ResponseMatrix:          {matrix.nbytes / 2**20:.1f} MiB "
+        f"({rows_bytes / matrix.nbytes:.0f}x smaller)"
+    )
+    print(f"building the matrix:     {build_time:.4f}s")
+    print(f"construct_scores rows:   {rows_time:.4f}s")
+    print(
+        f"construct_scores matrix: {matrix_time:.4f}s "
+        f"({rows_time / matrix_time:.0f}x)"
+    )
+    print(f"category means:          {means_time:.4f}s")
+    print(f"reliability:             {reliability_time:.4f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+import argparse
+import random
+import time
+
+import pandas as pd
+
+from utils.questionnaire_scoring import construct_scores
+from utils.scoring_engine import response_matrix_from_answers
+
+# Run from the app directory with:
+# python -m benchmarks.scoring_benchmark --answers 1000000
+
+CATEGORIES = [
+    "Perceived Usefulness",
+    "Perceived Ease of Use",
+    "Attitude",
+    "Behavioral Intention",
+    "Technology Support",
+    "User Satisfaction",
+    "Trust"
+]
+BASIC_CATEGORIES = CATEGORIES[:4]
+LIKERT_SCALE_OPTIONS = [
+    {"id": f"opt_{value}", "value": value, "label": str(value)}
+    for value in range(1, 6)
+]
+QUESTIONS_PER_RESPONSE = 20
+
+
+'''
+The generate_answers function builds n_answers submitted answers' rows
+with the same shape as the ones of the database, over responses
+that answer QUESTIONS_PER_RESPONSE questions each.
+Every row gets its own nested dictionaries, as it does when
+the rows get decoded from the database's JSON.
+'''
+
+
+def generate_answers(n_answers: int, seed: int):
+    rng = random.Random(seed)
+    questions = [
+        {
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "is_negative": i % 5 == 0
+        }
+        for i in range(QUESTIONS_PER_RESPONSE)
+    ]
+    options = [
+        {"value": option["value"], "label": option["label"]}
+        for option in LIKERT_SCALE_OPTIONS
+    ]
+
+    return [
+        {
+            "response_id": f"res_{i // QUESTIONS_PER_RESPONSE}",
+            "question_id": f"qst_{i % QUESTIONS_PER_RESPONSE}",
+            "questions": dict(questions[i % QUESTIONS_PER_RESPONSE]),
+            "likert_scale_options": dict(
+                options[rng.randrange(len(options))]
+            )
+        }
+        for i in range(n_answers)
+    ]
+
+
+'''
+The legacy_construct_scores function is the row by row DataFrame
+implementation that the scoring engine replaced, kept as the baseline.
+'''
+
+
+def legacy_construct_scores(answers, likert_scale_options, categories):
+    answers = [
+        a for a in answers
+        if a["questions"]["category"]
+        in categories
+    ]
+
+    answer_df = pd.DataFrame([{
+        "category": answer["questions"]["category"],
+        "score":
+            (len(likert_scale_options) + 1)
+            - answer["likert_scale_options"]["value"]
+            if answer["questions"]["is_negative"]
+            else answer["likert_scale_options"]["value"]
+    } for answer in answers])
+
+    result = {}
+    for category in categories:
+        cat_df = answer_df[answer_df["category"] == category]
+        result[category] = {
+            "total_score": int(cat_df["score"].sum()),
+            "count_answers": len(cat_df)
+        }
+
+    return result
+
+
+def best_of(repeats: int, function, *args):
+    timings, result = [], None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmarks the scoring engine against the legacy scoring"
+    )
+    parser.add_argument("--answers", type=int, default=1_000_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    answers = generate_answers(args.answers, args.seed)
+    legacy_time, legacy_result = best_of(
+        args.repeats,
+        legacy_construct_scores,
+        answers,
+        LIKERT_SCALE_OPTIONS,
+        CATEGORIES
+    )
+    construct_time, construct_result = best_of(
+        args.repeats,
+        construct_scores,
+        answers,
+        LIKERT_SCALE_OPTIONS,
+        CATEGORIES
+    )
+    convert_time, matrix = best_of(
+        args.repeats,
+        response_matrix_from_answers,
+        answers,
+        CATEGORIES
+    )
+    matrix_time, matrix_result = best_of(
+        args.repeats,
+        construct_scores,
+        matrix,
+        LIKERT_SCALE_OPTIONS,
+        CATEGORIES
+    )
+
+    assert construct_result == legacy_result
+    assert matrix_result == legacy_result
+
+    # construct_scores on the answers' rows includes building their
+    # ResponseMatrix, which is most of its time
+    print(f"answers: {args.answers}, best of {args.repeats}")
+    print(f"legacy construct_scores:       {legacy_time:.4f}s")
+    print(
+        f"construct_scores on rows:      {construct_time:.4f}s "
+        f"({legacy_time / construct_time:.1f}x)"
+    )
+    print(f"response_matrix_from_answers:  {convert_time:.4f}s")
+    print(
+        f"construct_scores on a matrix:  {matrix_time:.4f}s "
+        f"({legacy_time / matrix_time:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
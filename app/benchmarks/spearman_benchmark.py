@@ -0,0 +1,54 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from scipy.stats import spearmanr
+
+from utils.questionnaire_scoring import (
+    mapped_categories,
+    construct_spearman_matrix
+)
+
+# Run from the app directory with:
+# python -m benchmarks.spearman_benchmark --responses 100000
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmarks the Spearman matrix against per-pair calls"
+    )
+    parser.add_argument("--responses", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    constructs = list(mapped_categories)
+    data = pd.DataFrame(
+        np.round(rng.uniform(1, 5, (args.responses, len(constructs))), 2),
+        columns=constructs
+    )
+    data.insert(0, "response_id", range(args.responses))
+
+    start = time.perf_counter()
+    matrix = construct_spearman_matrix(data, n_resamples=0)
+    matrix_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i, dependent in enumerate(constructs):
+        for j, response in enumerate(constructs):
+            r, p = spearmanr(data[dependent], data[response])
+            assert np.isclose(r, matrix.r[i, j])
+            assert np.isclose(p, matrix.p[i, j])
+    pairs_time = time.perf_counter() - start
+
+    print(f"responses: {args.responses}, constructs: {len(constructs)}")
+    print(f"spearmanr per pair:  {pairs_time:.4f}s")
+    print(
+        f"spearman matrix:     {matrix_time:.4f}s "
+        f"({pairs_time / matrix_time:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
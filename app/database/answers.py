@@ -29,6 +29,7 @@ class Answers:
                 self.supabase_client.table("answers").
                 select(
                     "response_id, "
+                    "question_id, "
                     "responses!inner(is_submitted), "
                     "questions!inner("
                     "questionnaire_id, "
@@ -45,6 +46,68 @@ class Answers:
         except Exception as e:
             raise RuntimeError(f"Failed to retrieve answers: {e}")
 
+    '''
+    The get_submitted_answer_label_counts function retrieves, for each
+    question of a questionnaire, the number of times that each likert scale
+    option has been selected on the submitted responses (for admins)
+    '''
+    def get_submitted_answer_label_counts(self, questionnaire_id: str):
+        try:
+            return (
+                self.supabase_client.rpc(
+                    "get_submitted_answer_label_counts",
+                    {"q_id_param": questionnaire_id}
+                ).execute()
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to retrieve the answer counts: {e}")
+
+    '''
+    The get_submitted_category_scores function retrieves, for each
+    question category of a questionnaire, the total score of the
+    submitted answers and the number of answers and responses
+    that it has been calculated on (for admins)
+    '''
+    def get_submitted_category_scores(self, questionnaire_id: str):
+        try:
+            return (
+                self.supabase_client.rpc(
+                    "get_submitted_category_scores",
+                    {"q_id_param": questionnaire_id}
+                ).execute()
+            )
+        except Exception as e:
+            raise RuntimeError(
+                f"Failed to retrieve the category scores: {e}"
+            )
+
+    '''
+    The get_submitted_answer_values function retrieves the submitted
+    answers of a questionnaire as (response, question, value) tuples,
+    with the questions, the likert scale options and the responses' ids
+    sent once as side tables (for admins).
+    Given the synced_at of a previous retrieval, it only retrieves the
+    responses submitted since then and the ids of the deleted ones.
+    '''
+    def get_submitted_answer_values(
+        self,
+        questionnaire_id: str,
+        since: str | None = None
+    ):
+        params = {"q_id_param": questionnaire_id}
+        if since is not None:
+            params["since_param"] = since
+
+        try:
+            return (
+                self.supabase_client.rpc(
+                    "get_submitted_answer_values",
+                    params
+                ).execute()
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to retrieve answers: {e}")
+
     '''
     The create_answers function inserts a new row on
     the answers' table (for users)
@@ -71,3 +134,72 @@ class Answers:
             )
         except Exception as e:
             raise RuntimeError(f"Failed to update the answers: {e}")
+
+
+# AsyncAnswers runs the aggregations of the submitted answers on an async
+# supabase client, for the fetches that the results run concurrently.
+class AsyncAnswers:
+    def __init__(self, client):
+        self.supabase_client = client
+
+    '''
+    The get_submitted_answer_label_counts function retrieves, for each
+    question of a questionnaire, the number of times that each likert scale
+    option has been selected on the submitted responses (for admins)
+    '''
+    async def get_submitted_answer_label_counts(self, questionnaire_id: str):
+        try:
+            return await (
+                self.supabase_client.rpc(
+                    "get_submitted_answer_label_counts",
+                    {"q_id_param": questionnaire_id}
+                ).execute()
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to retrieve the answer counts: {e}")
+
+    '''
+    The get_submitted_category_scores function retrieves, for each
+    question category of a questionnaire, the total score of the
+    submitted answers and the number of answers and responses
+    that it has been calculated on (for admins)
+    '''
+    async def get_submitted_category_scores(self, questionnaire_id: str):
+        try:
+            return await (
+                self.supabase_client.rpc(
+                    "get_submitted_category_scores",
+                    {"q_id_param": questionnaire_id}
+                ).execute()
+            )
+        except Exception as e:
+            raise RuntimeError(
+                f"Failed to retrieve the category scores: {e}"
+            )
+
+    '''
+    The get_submitted_answer_values function retrieves the submitted
+    answers of a questionnaire as (response, question, value) tuples,
+    with the questions, the likert scale options and the responses' ids
+    sent once as side tables (for admins).
+    Given the synced_at of a previous retrieval, it only retrieves the
+    responses submitted since then and the ids of the deleted ones.
+    '''
+    async def get_submitted_answer_values(
+        self,
+        questionnaire_id: str,
+        since: str | None = None
+    ):
+        params = {"q_id_param": questionnaire_id}
+        if since is not None:
+            params["since_param"] = since
+
+        try:
+            return await (
+                self.supabase_client.rpc(
+                    "get_submitted_answer_values",
+                    params
+                ).execute()
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to retrieve answers: {e}")
@@ -1,14 +1,30 @@
+from utils.questionnaire_cache import questionnaire_content_cache
+
+
 class Likert_scale_options:
-    def __init__(self, client):
+    def __init__(self, client, cache=questionnaire_content_cache):
         self.supabase_client = client
+        self.cache = cache
 
     '''
     The get_options_by_likert_scale_id function retrieves all the options
     of a questionnaire's likert scale by their likert scale id
     '''
     def get_options_by_likert_scale_id(self, likert_scale_id: str):
+        # the options only get cached under the questionnaire that owns the
+        # likert scale, once the scale has been retrieved through the cache,
+        # so they get dropped together with the questionnaire
+        owner_id = self.cache.owner(likert_scale_id)
+        if owner_id is not None:
+            cached_options = self.cache.get(
+                owner_id,
+                f"likert_scale_options_{likert_scale_id}"
+            )
+            if cached_options is not None:
+                return cached_options
+
         try:
-            return (
+            options = (
                 self.supabase_client.
                 table("likert_scale_options").
                 select("id, value, label").
@@ -21,6 +37,14 @@ class Likert_scale_options:
                 f"Failed to retrieve the likert scale's options: {e}"
             )
 
+        if options.data and owner_id is not None:
+            self.cache.set(
+                owner_id,
+                f"likert_scale_options_{likert_scale_id}",
+                options
+            )
+        return options
+
     '''
     The create_likert_scale_options function stores the likert scale options
     of a specific likert scale
@@ -1,14 +1,22 @@
+from utils.questionnaire_cache import questionnaire_content_cache
+
+
 class Likert_scales:
-    def __init__(self, client):
+    def __init__(self, client, cache=questionnaire_content_cache):
         self.supabase_client = client
+        self.cache = cache
 
     '''
     The get_likert_scale_by_questionnaire_id retrieves a likert scale
     by the id of the questionnaire that it belongs to.
     '''
     def get_likert_scale_by_questionnaire_id(self, questionnaire_id: str):
+        cached_likert_scale = self.cache.get(questionnaire_id, "likert_scale")
+        if cached_likert_scale is not None:
+            return cached_likert_scale
+
         try:
-            return (
+            likert_scale = (
                 self.supabase_client.
                 table("likert_scales").
                 select("id").
@@ -20,6 +28,12 @@ class Likert_scales:
                 f"Failed to retrieve the questionnaire's likert scale: {e}"
             )
 
+        if likert_scale.data:
+            for scale in likert_scale.data:
+                self.cache.alias(scale["id"], questionnaire_id)
+            self.cache.set(questionnaire_id, "likert_scale", likert_scale)
+        return likert_scale
+
     '''
     The create_likert_scale function creates a likert scale for a questionnaire
     '''
@@ -34,3 +48,42 @@ class Likert_scales:
             raise RuntimeError(
                 f"Failed to create the questionnaire's likert scale: {e}"
             )
+
+
+# AsyncLikert_scales retrieves a questionnaire's likert scale on an async
+# supabase client, for the fetches that the results run concurrently.
+class AsyncLikert_scales:
+    def __init__(self, client, cache=questionnaire_content_cache):
+        self.supabase_client = client
+        self.cache = cache
+
+    '''
+    The get_likert_scale_by_questionnaire_id retrieves a likert scale
+    by the id of the questionnaire that it belongs to.
+    '''
+    async def get_likert_scale_by_questionnaire_id(
+        self,
+        questionnaire_id: str
+    ):
+        cached_likert_scale = self.cache.get(questionnaire_id, "likert_scale")
+        if cached_likert_scale is not None:
+            return cached_likert_scale
+
+        try:
+            likert_scale = await (
+                self.supabase_client.
+                table("likert_scales").
+                select("id").
+                eq("questionnaire_id", questionnaire_id)
+                .execute()
+            )
+        except Exception as e:
+            raise RuntimeError(
+                f"Failed to retrieve the questionnaire's likert scale: {e}"
+            )
+
+        if likert_scale.data:
+            for scale in likert_scale.data:
+                self.cache.alias(scale["id"], questionnaire_id)
+            self.cache.set(questionnaire_id, "likert_scale", likert_scale)
+        return likert_scale
@@ -19,6 +19,25 @@ class Profiles:
         except Exception as e:
             raise RuntimeError(f"Failed to retrieve profiles: {e}")
 
+    """
+    The search_profiles_by_name function returns the id and the name of
+    at most limit profiles whose name contains the name parameter,
+    in alphabetical order (for admins)
+    """
+    def search_profiles_by_name(self, name: str, limit: int):
+        try:
+            return (
+                self.supabase_client.
+                table("profiles").
+                select("id, full_name").
+                ilike("full_name", f"%{name}%").
+                order("full_name").
+                limit(limit).
+                execute()
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to retrieve profiles: {e}")
+
     """
     The get_profile_by_id function returns the profile that its user_id
     matches the parameter user_id (for user)
@@ -1,7 +1,10 @@
+from utils.questionnaire_cache import questionnaire_content_cache
+
 
 class Questionnaires:
-    def __init__(self, client):
+    def __init__(self, client, cache=questionnaire_content_cache):
         self.supabase_client = client
+        self.cache = cache
 
     """
     The get_all_questionnaires function returns all the questionnaires
@@ -50,8 +53,15 @@ class Questionnaires:
     by its own id (for users)
     """
     def get_questionnaire_by_id(self, questionnaire_id: str):
+        cached_questionnaire = self.cache.get(
+            questionnaire_id,
+            "questionnaire"
+        )
+        if cached_questionnaire is not None:
+            return cached_questionnaire
+
         try:
-            return (
+            questionnaire = (
                 self.supabase_client.
                 table("questionnaires").
                 select("id, title, details, created_at")
@@ -61,6 +71,50 @@ class Questionnaires:
         except Exception as e:
             raise RuntimeError(f"Failed to retrieve questionnaire: {e}")
 
+        if questionnaire.data:
+            self.cache.set(questionnaire_id, "questionnaire", questionnaire)
+        return questionnaire
+
+    """
+    The get_questionnaire_bundle_by_id function returns a questionnaire
+    together with its questions ordered by position, its likert scale
+    and the scale's options ordered by value in a single request (for users)
+    """
+    def get_questionnaire_bundle_by_id(self, questionnaire_id: str):
+        cached_bundle = self.cache.get(questionnaire_id, "bundle")
+        if cached_bundle is not None:
+            return cached_bundle
+
+        try:
+            bundle = (
+                self.supabase_client.
+                table("questionnaires").
+                select(
+                    "id, title, details, created_at, "
+                    "questions(id, question_text, category, position), "
+                    "likert_scales(id, likert_scale_options(id, value, label))"
+                )
+                .eq("id", questionnaire_id)
+                .order("position", foreign_table="questions")
+                .order(
+                    "value",
+                    foreign_table="likert_scales.likert_scale_options"
+                )
+                .execute()
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to retrieve questionnaire: {e}")
+
+        # a bundle is cached only once the questions and the likert scale
+        # of the questionnaire have been inserted
+        if (
+            bundle.data
+            and bundle.data[0]["questions"]
+            and bundle.data[0]["likert_scales"]
+        ):
+            self.cache.set(questionnaire_id, "bundle", bundle)
+        return bundle
+
     """
     The questionnaire_without_user_response function returns
     the questionnaires that the logged in user has not responded (for users)
@@ -103,7 +157,7 @@ class Questionnaires:
     """
     def delete_questionnaire_by_id(self, questionnaire_id: str):
         try:
-            return (
+            deleted_questionnaire = (
                 self.supabase_client.
                 table("questionnaires")
                 .delete()
@@ -111,3 +165,41 @@ class Questionnaires:
                 .execute())
         except Exception as e:
             raise RuntimeError(f"Failed to delete questionnaire: {e}")
+
+        self.cache.invalidate(questionnaire_id)
+        return deleted_questionnaire
+
+
+# AsyncQuestionnaires retrieves a questionnaire on an async supabase client,
+# for the fetches that the results run concurrently.
+class AsyncQuestionnaires:
+    def __init__(self, client, cache=questionnaire_content_cache):
+        self.supabase_client = client
+        self.cache = cache
+
+    """
+    The get_questionnaire_by_id function returns a questionnaire
+    by its own id (for users)
+    """
+    async def get_questionnaire_by_id(self, questionnaire_id: str):
+        cached_questionnaire = self.cache.get(
+            questionnaire_id,
+            "questionnaire"
+        )
+        if cached_questionnaire is not None:
+            return cached_questionnaire
+
+        try:
+            questionnaire = await (
+                self.supabase_client.
+                table("questionnaires").
+                select("id, title, details, created_at")
+                .eq("id", questionnaire_id)
+                .execute()
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to retrieve questionnaire: {e}")
+
+        if questionnaire.data:
+            self.cache.set(questionnaire_id, "questionnaire", questionnaire)
+        return questionnaire
@@ -0,0 +1,30 @@
+from database.questionnaires import Questionnaires, AsyncQuestionnaires
+from database.questions import Questions
+from database.likert_scales import Likert_scales, AsyncLikert_scales
+from database.likert_scale_options import Likert_scale_options
+from database.answers import Answers, AsyncAnswers
+from database.responses import Responses
+from database.profiles import Profiles
+
+
+# Repositories groups the repositories of the app around the supabase
+# client of a session. It is built on every script run from the session's
+# client, so the queries of a request always carry that session's auth.
+class Repositories:
+    def __init__(self, client):
+        self.questionnaires = Questionnaires(client)
+        self.questions = Questions(client)
+        self.likert_scales = Likert_scales(client)
+        self.likert_scale_options = Likert_scale_options(client)
+        self.answers = Answers(client)
+        self.responses = Responses(client)
+        self.profiles = Profiles(client)
+
+
+# AsyncRepositories groups the async fetches of the results around
+# an async supabase client, so they can run concurrently.
+class AsyncRepositories:
+    def __init__(self, client):
+        self.questionnaires = AsyncQuestionnaires(client)
+        self.likert_scales = AsyncLikert_scales(client)
+        self.answers = AsyncAnswers(client)
@@ -3,23 +3,68 @@ class Responses:
         self.supabase_client = client
 
     """
-    The get_all_responses() function gets all the responses including
-    their corresponding questionnaire's info
-    and the name of the profile which has submitted it. (for admins)
+    The get_submitted_responses_page function gets a page of the submitted
+    responses, ordered by submitted_at and id from the most recent one.
+    The cursor is the submitted_at and id of the previous page's last
+    response, so the page starts right after it.
+    The responses can be filtered by questionnaire, respondent
+    and submission date range (for admins)
     """
-    def get_all_responses(self):
+    def get_submitted_responses_page(
+        self,
+        page_size: int,
+        cursor: dict | None = None,
+        questionnaire_id: str | None = None,
+        user_id: str | None = None,
+        submitted_from: str | None = None,
+        submitted_to: str | None = None
+    ):
         try:
-            return (
+            query = (
                 self.supabase_client.table("responses").
                 select(
-                    "questionnaires(*),"
+                    "questionnaires(id, title, created_at),"
                     "profiles(full_name),"
                     "id,"
                     "submitted_at,"
                     "is_submitted"
                 )
                 .eq("is_submitted", True)
-                .order("submitted_at", desc=True)
+            )
+
+            if questionnaire_id is not None:
+                query = query.eq("questionnaire_id", questionnaire_id)
+
+            if user_id is not None:
+                query = query.eq("user_id", user_id)
+
+            if submitted_from is not None:
+                query = query.gte("submitted_at", submitted_from)
+
+            if submitted_to is not None:
+                query = query.lt("submitted_at", submitted_to)
+
+            # The responses without a submission timestamp come last,
+            # so they are only reached after all the timestamped ones.
+            if cursor is not None and cursor["submitted_at"] is None:
+                query = (
+                    query
+                    .is_("submitted_at", "null")
+                    .lt("id", cursor["id"])
+                )
+            elif cursor is not None:
+                query = query.or_(
+                    f'submitted_at.lt."{cursor["submitted_at"]}",'
+                    f'and(submitted_at.eq."{cursor["submitted_at"]}",'
+                    f'id.lt.{cursor["id"]}),'
+                    "submitted_at.is.null"
+                )
+
+            return (
+                query
+                .order("submitted_at", desc=True, nullsfirst=False)
+                .order("id", desc=True)
+                .limit(page_size)
                 .execute()
             )
         except Exception as e:
@@ -65,6 +110,37 @@ class Responses:
         except Exception as e:
             raise RuntimeError(f"Failed to retrieve response: {e}")
 
+    """
+    The get_response_bundle_by_id function gets the response
+    that matches with the response_id parameter together with its
+    questionnaire, the questionnaire's questions ordered by position,
+    its likert scale and the scale's options in a single request (for users)
+    """
+    def get_response_bundle_by_id(self, response_id: str):
+        try:
+            return (
+                self.supabase_client.table("responses")
+                .select(
+                    "profiles(full_name), submitted_at, "
+                    "questionnaires("
+                    "id, title, details, created_at, "
+                    "questions(id, question_text, category, position), "
+                    "likert_scales("
+                    "id, likert_scale_options(id, value, label)))"
+                )
+                .eq("id", response_id)
+                .order("position", foreign_table="questionnaires.questions")
+                .order(
+                    "value",
+                    foreign_table=(
+                        "questionnaires.likert_scales.likert_scale_options"
+                    )
+                )
+                .execute()
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to retrieve response: {e}")
+
     """
     The get_response_by_user_id function gets all the responses
     that their user_id
@@ -105,7 +181,7 @@ class Responses:
                 .eq("questionnaire_id", questionnaire_id)
             )
 
-            if is_submitted is None:
+            if is_submitted is not None:
                 query = query.eq("is_submitted", is_submitted)
 
             return query.execute()
@@ -113,39 +189,37 @@ class Responses:
             raise RuntimeError(f"Failed to retrieve the specified draft: {e}")
 
     '''
-    The get_responses_by_questionnaire_title retrieves all the responses
-    of a questionnaire with a specific title
+    The get_submitted_watermark function retrieves the number of the
+    submitted responses of a questionnaire and the latest submission time,
+    which change whenever a response gets submitted or deleted
     '''
-    def get_responses_by_questionnaire_title(self, questionnaire_title: str):
+    def get_submitted_watermark(self, questionnaire_id: str):
         try:
             return (
-                self.supabase_client.table("responses").
-                select(
-                    "questionnaires!inner(*),"
-                    "profiles(full_name),"
-                    "id, submitted_at,"
-                    "is_submitted")
-                .eq(
-                    "questionnaires.title",
-                    questionnaire_title
-                )
+                self.supabase_client.table("responses")
+                .select("submitted_at", count="exact")
+                .eq("questionnaire_id", questionnaire_id)
                 .eq("is_submitted", True)
-                .order("submitted_at", desc=True)
+                .order("submitted_at", desc=True, nullsfirst=False)
+                .limit(1)
                 .execute()
             )
         except Exception as e:
-            raise RuntimeError(f"Failed to retrieve responses: {e}")
+            raise RuntimeError(
+                f"Failed to retrieve the responses' watermark: {e}"
+            )
 
     '''
     The get_all_responses_category_means retrieves for each response
-    the score means of each individual question category
+    the score means of each individual question category,
+    as a responses x categories matrix
     '''
     def get_all_responses_category_means(self, questionnaire_id: str):
         try:
             return (
                 self.supabase_client.rpc(
                     "get_response_category_means",
-                    {"q_id": questionnaire_id}
+                    {"q_id_param": questionnaire_id}
                     ).execute()
                 )
         except Exception as e:
@@ -155,40 +229,48 @@ class Responses:
             )
 
     """
-    The create_response function inserts a new row
-    in the responses' table (for users)
+    The create_response function inserts a new draft
+    in the responses' table, which only gets submitted
+    with its answers by submit_response (for users)
     """
-    def create_response(
-        self,
-        user_id: str,
-        questionnaire_id: str,
-        is_submitted: bool
-    ):
+    def create_response(self, user_id: str, questionnaire_id: str):
         try:
             return (
                 self.supabase_client.table("responses").insert({
                     "user_id": user_id,
-                    "questionnaire_id": questionnaire_id,
-                    "is_submitted": is_submitted
+                    "questionnaire_id": questionnaire_id
                 }).execute()
             )
         except Exception as e:
             raise RuntimeError(f"Failed to create response: {e}")
 
     """
-    The update_response_on_submitted function updates the response
-    of response_id on its is_submitted field.
-    This function is used for users so they can submit their drafts.
+    The submit_response function writes a response and all its answers
+    in a single transaction, creating the response with the response_id
+    if it does not exist yet. With is_submitted set to True, the response
+    gets submitted, otherwise it is stored as a draft (for users)
     """
-    def update_response_on_submitted(self, user_id: str, is_submitted: bool):
+    def submit_response(
+        self,
+        response_id: str,
+        questionnaire_id: str,
+        answers: list[dict],
+        is_submitted: bool
+    ):
         try:
             return (
-                self.supabase_client.table("responses")
-                .update({"is_submitted": is_submitted})
-                .eq("user_id", user_id).execute()
+                self.supabase_client.rpc(
+                    "submit_response",
+                    {
+                        "response_id_param": response_id,
+                        "questionnaire_id_param": questionnaire_id,
+                        "answers_param": answers,
+                        "is_submitted_param": is_submitted
+                    }
+                ).execute()
             )
         except Exception as e:
-            raise RuntimeError(f"Failed to update response: {e}")
+            raise RuntimeError(f"Failed to submit response: {e}")
 
     """
     The delete_response_by_id function deletes the response
@@ -1,14 +1,7 @@
 # flake8: noqa: E501
 import streamlit as st
 
-from app import (
-    questionnaires_repo,
-    questions_repo,
-    likert_scales_repo,
-    likert_scale_options_repo,
-    profiles_repo,
-    client
-)
+from database.repositories import Repositories
 
 from services.questionnaire_services import submit_questionnaire
 
@@ -32,6 +25,11 @@ from utils.redirections import (
     redirect_to_results_page,
     redirect_to_login_page
 )
+from utils.results_snapshots import invalidate_questionnaire_results
+from utils import supabase_client
+
+client = supabase_client.get_client()
+repos = Repositories(client)
 
 current_page = "admin_page"
 
@@ -206,10 +204,10 @@ if __name__ == "__main__":
                         st.session_state["app_name"],
                         st.session_state["q_details"],
                         st.session_state["user_id"],
-                        questionnaires_repo,
-                        questions_repo,
-                        likert_scales_repo,
-                        likert_scale_options_repo,
+                        repos.questionnaires,
+                        repos.questions,
+                        repos.likert_scales,
+                        repos.likert_scale_options,
                         logger,
                         CUSTOM_QUESTIONS
                     )
@@ -226,7 +224,7 @@ if __name__ == "__main__":
     qs = None
     try:
         qs = (
-            questionnaires_repo.get_all_questionnaires_with_admin_response(
+            repos.questionnaires.get_all_questionnaires_with_admin_response(
                 st.session_state["user_id"]
             )
         )
@@ -268,10 +266,11 @@ if __name__ == "__main__":
                         response = None
                         try:
                             response = (
-                                questionnaires_repo.delete_questionnaire_by_id(
+                                repos.questionnaires.delete_questionnaire_by_id(
                                     item['id']
                                 )
                             )
+                            invalidate_questionnaire_results(item['id'])
                             st.rerun()
                         except RuntimeError as e:
                             logger.error(f"Database error: {e}")
@@ -295,10 +294,11 @@ if __name__ == "__main__":
                         response = None
                         try:
                             response = (
-                                questionnaires_repo.delete_questionnaire_by_id(
+                                repos.questionnaires.delete_questionnaire_by_id(
                                     item['id']
                                 )
                             )
+                            invalidate_questionnaire_results(item['id'])
                             st.rerun()
                         except RuntimeError as e:
                             logger.error(f"Database error: {e}")
@@ -316,7 +316,7 @@ if __name__ == "__main__":
     profiles = None
 
     try:
-        profiles = profiles_repo.get_all_profiles(st.session_state["user_id"])
+        profiles = repos.profiles.get_all_profiles(st.session_state["user_id"])
     except RuntimeError as e:
         logger.error(f"Database error: {e}")
 
@@ -336,7 +336,7 @@ if __name__ == "__main__":
                     response = None
                     try:
                         response = (
-                            profiles_repo.delete_profile_by_id(
+                            repos.profiles.delete_profile_by_id(
                                 profile['id']
                             )
                         )
@@ -1,9 +1,14 @@
 import streamlit as st
 
-from app import profiles_repo, logger
+from database.repositories import Repositories
 from utils.components import create_profile_form
 
 from utils.redirections import redirect_to_login_page
+from utils import supabase_client
+from utils.logger_config import logger
+
+client = supabase_client.get_client()
+repos = Repositories(client)
 
 redirect_to_login_page()
 
@@ -14,7 +19,7 @@ if st.button("Create"):
     profile_insert = None
     try:
         profile_insert = (
-            profiles_repo.create_profile(
+            repos.profiles.create_profile(
                 st.session_state["user_id"],
                 profile_inputs[0],
                 profile_inputs[1],
@@ -1,6 +1,6 @@
 import streamlit as st
 
-from app import profiles_repo, responses_repo, client
+from database.repositories import Repositories
 
 from utils.menu import menu
 from utils.logger_config import logger
@@ -13,6 +13,10 @@ from utils.redirections import (
     redirect_to_edit_page,
     redirect_to_login_page
 )
+from utils import supabase_client
+
+client = supabase_client.get_client()
+repos = Repositories(client)
 
 current_page = "profile_page"
 
@@ -42,7 +46,7 @@ if __name__ == "__main__":
     user_profile = None
     try:
         user_profile = (
-            profiles_repo.get_profile_by_id(st.session_state["user_id"])
+            repos.profiles.get_profile_by_id(st.session_state["user_id"])
         )
     except RuntimeError as e:
         logger.error(f"Database error: {e}")
@@ -91,7 +95,7 @@ if __name__ == "__main__":
             if st.button("Update"):
                 profile_update = None
                 try:
-                    profile_update = profiles_repo.update_profile_by_id(
+                    profile_update = repos.profiles.update_profile_by_id(
                         st.session_state["user_id"],
                         profile_inputs[0],
                         profile_inputs[1],
@@ -121,7 +125,7 @@ if __name__ == "__main__":
                     profile_delete = None
                     try:
                         profile_delete = (
-                            profiles_repo.delete_profile_by_id(
+                            repos.profiles.delete_profile_by_id(
                                 st.session_state["user_id"]
                             )
                         )
@@ -144,8 +148,8 @@ if __name__ == "__main__":
     # on drafts and submitted responses.
     responses = None
     try:
-        responses = (
-            responses_repo.get_response_by_user_id(st.session_state["user_id"])
+        responses = repos.responses.get_response_by_user_id(
+            st.session_state["user_id"]
         )
     except RuntimeError as e:
         logger.error(f"Database error: {e}")
@@ -175,6 +179,7 @@ if __name__ == "__main__":
                 response,
                 "View",
                 redirect_to_view_page,
+                repos.responses,
                 user_profile.data[0]['full_name']
             )
 
@@ -196,5 +201,6 @@ if __name__ == "__main__":
                 draft,
                 "Edit",
                 redirect_to_edit_page,
+                repos.responses,
                 user_profile.data[0]['full_name']
             )
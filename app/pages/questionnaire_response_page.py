@@ -1,14 +1,8 @@
+import uuid
+
 import streamlit as st
 
-from app import (
-    client,
-    questionnaires_repo,
-    questions_repo,
-    responses_repo,
-    likert_scales_repo,
-    likert_scale_options_repo,
-    answers_repo
-)
+from database.repositories import Repositories
 
 from services.response_services import submit_response
 from services.questionnaire_services import (
@@ -20,6 +14,10 @@ from utils.menu import menu
 from utils.logger_config import logger
 from utils.components import format_time, set_response_ui
 from utils.redirections import redirect_to_login_page
+from utils import supabase_client
+
+client = supabase_client.get_client()
+repos = Repositories(client)
 
 
 if __name__ == "__main__":
@@ -39,12 +37,12 @@ if __name__ == "__main__":
     if st.session_state.edit_response_mode is True:
         current_questionnaire = retrieve_questionnaire_by_response(
             st.session_state["current_response_id"],
-            responses_repo,
-            questions_repo,
-            likert_scales_repo,
-            likert_scale_options_repo,
+            repos.responses,
             logger
         )
+        if current_questionnaire[1] is None:
+            st.error("Error during the questionnaire's retrieval")
+            st.stop()
         questionnaire_id = (
             current_questionnaire[0].data[0]["questionnaires"]["id"]
         )
@@ -60,12 +58,12 @@ if __name__ == "__main__":
     else:
         current_questionnaire = retrieve_questionnaire(
             st.session_state["current_questionnaire_id"],
-            questionnaires_repo,
-            questions_repo,
-            likert_scales_repo,
-            likert_scale_options_repo,
+            repos.questionnaires,
             logger
         )
+        if current_questionnaire[1] is None:
+            st.error("Error during the questionnaire's retrieval")
+            st.stop()
         questionnaire_id = (
             current_questionnaire[0].data[0]["id"]
         )
@@ -79,10 +77,6 @@ if __name__ == "__main__":
             current_questionnaire[0].data[0]["created_at"]
         )
 
-    if current_questionnaire[0] is None:
-        st.error("Error during the questionnaire's retrieval")
-        st.stop()
-
     st.title(questionnaire_title)
 
     if questionnaire_details is None:
@@ -98,7 +92,7 @@ if __name__ == "__main__":
     response_draft_info = None
     try:
         response_draft_info = (
-            responses_repo.
+            repos.responses.
             get_responses_by_questionnaire_id(
                 st.session_state["user_id"],
                 questionnaire_id, False
@@ -119,7 +113,7 @@ if __name__ == "__main__":
         draft_answers = None
         try:
             draft_answers = (
-                answers_repo.
+                repos.answers.
                 get_answers_by_response_id(
                     response_draft_info.data[0]["id"]
                 )
@@ -135,31 +129,48 @@ if __name__ == "__main__":
         else:
             set_response_ui(questions, current_questionnaire[3], draft_answers)
 
+    # The response is written under the draft's id if there is a draft,
+    # otherwise under an id generated once per questionnaire, so retrying
+    # a failed submission never creates a second response
+    if len(response_draft_info.data) > 0:
+        response_id = response_draft_info.data[0]["id"]
+    else:
+        response_id = st.session_state.setdefault(
+            f"new_response_id_{questionnaire_id}",
+            str(uuid.uuid4())
+        )
+
     message_box = st.empty()
     col1, col2 = st.columns([1, 1])
 
     with col1:
         if st.button("Submit"):
             submission_state = submit_response(
-                st.session_state["user_id"],
+                response_id,
                 questionnaire_id,
                 True,
                 questions,
-                current_questionnaire[3]
+                current_questionnaire[3],
+                repos.responses
             )
             if submission_state is None:
                 message_box.error("Error during your response's submission")
             else:
+                st.session_state.pop(
+                    f"new_response_id_{questionnaire_id}",
+                    None
+                )
                 message_box.success("Your response has been submitted")
 
     with col2:
         if st.button("Save Draft"):
             submission_state = submit_response(
-                st.session_state["user_id"],
+                response_id,
                 questionnaire_id,
                 False,
                 questions,
-                current_questionnaire[3]
+                current_questionnaire[3],
+                repos.responses
             )
             if submission_state is None:
                 message_box.error("Error during your draft's submission")
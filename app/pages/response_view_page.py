@@ -1,6 +1,6 @@
 import streamlit as st
 
-from app import client, answers_repo, responses_repo
+from database.repositories import Repositories
 
 from services.response_services import retrieve_response_info
 
@@ -8,6 +8,10 @@ from utils.menu import menu
 from utils.logger_config import logger
 from utils.components import format_time, set_answer_layout
 from utils.redirections import redirect_to_login_page
+from utils import supabase_client
+
+client = supabase_client.get_client()
+repos = Repositories(client)
 
 if __name__ == "__main__":
 
@@ -16,8 +20,8 @@ if __name__ == "__main__":
     menu(client)
     response_info = retrieve_response_info(
         st.session_state["current_response_id"],
-        responses_repo,
-        answers_repo,
+        repos.responses,
+        repos.answers,
         logger
     )
 
@@ -1,4 +1,5 @@
 import streamlit as st
+from postgrest import APIResponse
 
 from utils.generate_questionnaires import (
     generate_tam_questions,
@@ -6,164 +7,108 @@ from utils.generate_questionnaires import (
 )
 
 
+'''
+The split_questionnaire_bundle function splits a questionnaire bundle
+(a questionnaire with its embedded questions and likert scale)
+into the questionnaire's info, its questions, its likert scale
+and the likert scale's options, each one wrapped like a repository's result.
+'''
+
+
+def split_questionnaire_bundle(questionnaire: dict):
+    likert_scales = questionnaire.get("likert_scales") or []
+
+    questionnaire_info = APIResponse(data=[{
+        key: value
+        for key, value in questionnaire.items()
+        if key not in ("questions", "likert_scales")
+    }])
+    questions_info = APIResponse(data=questionnaire.get("questions") or [])
+    likert_scale_info = APIResponse(data=[
+        {"id": likert_scale["id"]}
+        for likert_scale in likert_scales
+    ])
+    likert_scale_options = APIResponse(
+        data=(
+            likert_scales[0]["likert_scale_options"]
+            if likert_scales
+            else []
+        )
+    )
+
+    return [
+        questionnaire_info,
+        questions_info,
+        likert_scale_info,
+        likert_scale_options
+    ]
+
+
+"""
+The retrieve_questionnaire function gets the questionnaire by its id
+together with its questions, likert scale and likert scale options
+in a single round trip.
+"""
+
+
 def retrieve_questionnaire(
     questionnaire_id: str,
     questionnaires_repo,
-    questions_repo,
-    likert_scales_repo,
-    likert_scale_options_repo,
     logger
 ):
-    questionnaire_info = None
-    questions_info = None
-    likert_scale_info = None
-    likert_scale_options = None
-
-    questionnaire_info = None
+    questionnaire_bundle = None
     try:
-        questionnaire_info = (
-            questionnaires_repo.get_questionnaire_by_id(
+        questionnaire_bundle = (
+            questionnaires_repo.get_questionnaire_bundle_by_id(
                 questionnaire_id
             )
         )
     except RuntimeError as e:
         logger.error(f"Database error: {e}")
-        return [
-            questionnaire_info,
-            questions_info,
-            likert_scale_info,
-            likert_scale_options
-        ]
+        return [None, None, None, None]
 
-    try:
-        questions_info = (
-            questions_repo.get_questions_by_questionnaire_id(
-                questionnaire_id
-            )
-        )
-    except RuntimeError as e:
-        logger.error(f"Database error: {e}")
-        return [
-            questionnaire_info,
-            questions_info,
-            likert_scale_info,
-            likert_scale_options
-        ]
+    if len(questionnaire_bundle.data) == 0:
+        return [questionnaire_bundle, None, None, None]
 
-    try:
-        likert_scale_info = (
-            likert_scales_repo.get_likert_scale_by_questionnaire_id(
-                questionnaire_id
-            )
-        )
-    except RuntimeError as e:
-        logger.error(f"Database error: {e}")
-        return [
-            questionnaire_info,
-            questions_info,
-            likert_scale_info,
-            likert_scale_options
-        ]
-
-    try:
-        likert_scale_options = (
-            likert_scale_options_repo.get_options_by_likert_scale_id(
-                likert_scale_info.data[0]["id"]
-            )
-        )
-    except RuntimeError as e:
-        logger.error(f"Database error: {e}")
-        return [
-            questionnaire_info,
-            questions_info,
-            likert_scale_info,
-            likert_scale_options
-        ]
-
-    return [
-        questionnaire_info,
-        questions_info,
-        likert_scale_info,
-        likert_scale_options
-    ]
+    return split_questionnaire_bundle(questionnaire_bundle.data[0])
 
 
 """
 The retrieve_questionnaire_by_response functions gets the response by its id,
-retrieving its corresponding questionnaire.
-By response's corresponding questionnaire id, the function retrieves the
-questionnaire's questions and likert scale
+together with its corresponding questionnaire, the questionnaire's questions
+and likert scale in a single round trip.
 """
 
 
 def retrieve_questionnaire_by_response(
     response_id: str,
     responses_repo,
-    questions_repo,
-    likert_scales_repo,
-    likert_scale_options_repo,
     logger
 ):
-    response_info = None
-    questions_info = None
-    likert_scale_info = None
-    likert_scale_options = None
-
-    try:
-        response_info = responses_repo.get_response_by_id(response_id)
-    except RuntimeError as e:
-        logger.error(f"Database error: {e}")
-        return [
-            response_info,
-            questions_info,
-            likert_scale_info,
-            likert_scale_options
-        ]
-
+    response_bundle = None
     try:
-        questions_info = (
-            questions_repo.get_questions_by_questionnaire_id(
-                response_info.data[0]["questionnaires"]["id"]
-            )
+        response_bundle = responses_repo.get_response_bundle_by_id(
+            response_id
         )
     except RuntimeError as e:
         logger.error(f"Database error: {e}")
-        return [
-            response_info,
-            questions_info,
-            likert_scale_info,
-            likert_scale_options
-        ]
+        return [None, None, None, None]
 
-    try:
-        likert_scale_info = (
-            likert_scales_repo.get_likert_scale_by_questionnaire_id(
-                response_info.data[0]["questionnaires"]["id"]
-            )
-        )
-    except RuntimeError as e:
-        logger.error(f"Database error: {e}")
-        return [
-            response_info,
-            questions_info,
-            likert_scale_info,
-            likert_scale_options
-        ]
+    if len(response_bundle.data) == 0:
+        return [response_bundle, None, None, None]
 
-    try:
-        likert_scale_options = (
-            likert_scale_options_repo.get_options_by_likert_scale_id(
-                likert_scale_info.data[0]["id"]
-            )
-        )
-    except RuntimeError as e:
-        logger.error(f"Database error: {e}")
-        return [
-            response_info,
-            questions_info,
-            likert_scale_info,
-            likert_scale_options
-        ]
+    response = response_bundle.data[0]
+    (
+        questionnaire_info,
+        questions_info,
+        likert_scale_info,
+        likert_scale_options
+    ) = split_questionnaire_bundle(response["questionnaires"])
+
+    response_info = APIResponse(data=[{
+        **response,
+        "questionnaires": questionnaire_info.data[0]
+    }])
 
     return [
         response_info,
@@ -1,14 +1,7 @@
 import streamlit as st
 
-from database.responses import Responses
-from database.answers import Answers
-
-from utils import supabase_client
 from utils.logger_config import logger
-
-client = supabase_client.get_client()
-responses_repo = Responses(client)
-answers_repo = Answers(client)
+from utils.results_snapshots import results_snapshots
 
 
 '''
@@ -40,28 +33,108 @@ def retrieve_response_info(
     return [response, answers]
 
 
+'''
+The retrieve_submitted_responses_page function retrieves a page of
+the submitted responses that come after the cursor, applying the filters.
+It returns the page's responses and the cursor of the next page,
+which is None when there are no more responses.
+'''
+
+
+def retrieve_submitted_responses_page(
+    page_size: int,
+    cursor: dict | None,
+    responses_repo,
+    logger,
+    questionnaire_id: str | None = None,
+    user_id: str | None = None,
+    submitted_from: str | None = None,
+    submitted_to: str | None = None
+):
+
+    responses_page = None
+    try:
+        # One more response than the page size gets retrieved,
+        # so the existence of a next page is known.
+        responses_page = responses_repo.get_submitted_responses_page(
+            page_size + 1,
+            cursor,
+            questionnaire_id,
+            user_id,
+            submitted_from,
+            submitted_to
+        )
+    except RuntimeError as e:
+        logger.error(f"Database error: {e}")
+        return [None, None]
+
+    responses = responses_page.data[:page_size]
+
+    next_cursor = None
+    if len(responses_page.data) > page_size:
+        next_cursor = {
+            "submitted_at": responses[-1]["submitted_at"],
+            "id": responses[-1]["id"]
+        }
+
+    return [responses, next_cursor]
+
+
+'''
+The retrieve_results_watermark function retrieves the data-version
+watermark of a questionnaire's results, which is the number of its
+submitted responses and the latest submission time.
+It returns None if the retrieval fails.
+'''
+
+
+def retrieve_results_watermark(
+    questionnaire_id: str,
+    responses_repo,
+    logger
+):
+
+    watermark = None
+    try:
+        watermark = responses_repo.get_submitted_watermark(questionnaire_id)
+    except RuntimeError as e:
+        logger.error(f"Database error: {e}")
+        return None
+
+    latest_submitted_at = (
+        watermark.data[0]["submitted_at"]
+        if watermark.data
+        else None
+    )
+
+    return (watermark.count, latest_submitted_at)
+
+
 '''
 The submit_response function submits a user's response.
 
 First, if get_submitted is True, the function will check if
 all the questions are answered.
-Then, it will try to retrieve a user's draft for the response
-if it exists.
 
-If there is no draft, a new row in the response table will be added
-and all the answers will be stored in the answers table.
+Then, the response and all of its answers get written in a single
+transaction by the database, keyed by the response_id.
+The response_id is the one of the user's draft if it exists, or
+a newly generated one, so retrying a failed submission never creates
+a second response.
 
-If there is a draft, the functions updates the answers of the draft
-and changes the is_submitted field of the response row if necessary.
+Once a response has been submitted, the stored results snapshot of
+the questionnaire gets dropped, so the results page recomputes them
+on its next view instead of showing the outdated ones.
 '''
 
 
 def submit_response(
-    user_id: str,
+    response_id: str,
     questionnaire_id: str,
     get_submitted: bool,
     questions,
-    likert_scale_options: list
+    likert_scale_options: list,
+    responses_repo
 ):
 
     # checking if all the questions have been answered
@@ -75,128 +148,39 @@ def submit_response(
         st.error("Please answer all of the questions before submitting")
         return
 
-    response_info = None
+    option_ids = {
+        option["label"]: option["id"]
+        for option in likert_scale_options.data
+    }
+
+    answers_list = [
+        {
+            "question_id": question["id"],
+            "selected_option": option_ids.get(
+                st.session_state.get(f"q{index+1}_answer")
+            )
+        }
+        for index, question in enumerate(questions.data)
+    ]
+
+    submission = None
     try:
-        response_info = responses_repo.get_responses_by_questionnaire_id(
-            user_id,
+        submission = responses_repo.submit_response(
+            response_id,
             questionnaire_id,
-            False
+            answers_list,
+            get_submitted
         )
     except RuntimeError as e:
         logger.error(f"Database error: {e}")
 
-    if response_info is None:
+    if submission is None:
         st.error(
-            "Error while checking for user's draft. Please, try again later."
+            "Error during response's submission. Please, try again later."
         )
         return
 
-    if len(response_info.data) == 0:
+    if get_submitted:
+        results_snapshots.invalidate(questionnaire_id)
 
-        # If there is not any draft response for the questionnaire by the user
-        # insert a new response row
-        response_insert = None
-        try:
-            response_insert = responses_repo.create_response(
-                st.session_state["user_id"],
-                questionnaire_id,
-                get_submitted
-            )
-        except RuntimeError as e:
-            logger.error(f"Database error: {e}")
-
-        if response_insert is None:
-            st.error(
-                "Error during response's submission. Please, try again later."
-            )
-            return
-
-        answer_list = []
-        for index, question in enumerate(questions.data):
-
-            key = f"q{index+1}_answer"
-            matching_option = next(
-                (
-                    opt["id"]
-                    for opt in likert_scale_options.data
-                    if opt["label"] == st.session_state[key]
-                ),
-                None
-            )
-
-            answer_list.append({
-                "response_id": response_insert.data[0]["id"],
-                "question_id": question["id"],
-                "selected_option": matching_option
-            })
-
-        # insert the answer list items in the answer's table
-        answer_insert = None
-        try:
-            answer_insert = answers_repo.create_answers(answer_list)
-        except RuntimeError as e:
-            logger.error(f"Database error: {e}")
-
-        if answer_insert is None:
-            st.error(
-                "Error during answers' submission. Please, try again later."
-            )
-            return
-
-        return [response_insert, answer_insert]
-
-    else:
-
-        answers_list = []
-
-        for index, question in enumerate(questions.data):
-
-            key = f"q{index+1}_answer"
-            matching_option = next(
-                (
-                    opt["id"]
-                    for opt in likert_scale_options.data
-                    if opt["label"] == st.session_state[key]
-                ),
-                None
-            )
-
-            answers_list.append({
-                "response_id": response_info.data[0]["id"],
-                "question_id": question["id"],
-                "selected_option": matching_option
-            })
-
-        answers_update = None
-        try:
-            answers_update = answers_repo.update_answers(answers_list)
-        except RuntimeError as e:
-            logger.error(f"Database error: {e}")
-
-        if answers_update is None:
-            st.error(
-                "Error during the update of the answers."
-                "Please, try again later."
-            )
-            return
-
-        if get_submitted is True:
-            update_response = None
-            try:
-                update_response = responses_repo.update_response_on_submitted(
-                    st.session_state["user_id"],
-                    get_submitted
-                )
-            except RuntimeError as e:
-                logger.error(f"Database error: {e}")
-
-            if update_response is None:
-                st.error(
-                    "Error during response's submission."
-                    "Please, try again later."
-                )
-                return
-
-            return [update_response, answers_update]
-
-        return [response_info, answers_update]
+    return submission
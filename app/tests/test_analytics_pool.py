@@ -0,0 +1,70 @@
+import operator
+import sys
+import time
+import pytest
+from utils.analytics_pool import AnalyticsPool
+
+
+@pytest.fixture
+def pool():
+    pool = AnalyticsPool(workers=1, queue_limit=1, timeout=30)
+    yield pool
+    pool.shutdown()
+
+
+def test_run_in_worker_process(pool):
+    assert pool.run(operator.add, 2, 3) == 5
+    # the worker is reused by the next job
+    worker_pid = next(iter(pool._running)).process.pid
+    assert pool.run(operator.mul, 2, 3) == 6
+    assert next(iter(pool._running)).process.pid == worker_pid
+
+
+def test_worker_does_not_run_the_main_module(pool, monkeypatch):
+    page = type(sys)("__main__")
+    page.__file__ = "/nonexistent/page_script.py"
+    monkeypatch.setitem(sys.modules, "__main__", page)
+
+    assert pool.run(operator.add, 1, 1) == 2
+
+
+def test_function_exception_is_raised_as_it_is(pool):
+    with pytest.raises(ValueError):
+        pool.run(int, "not a number")
+
+    assert pool.run(operator.add, 1, 1) == 2
+
+
+def test_unpicklable_job_is_not_submitted(pool):
+    with pytest.raises(RuntimeError, match="Failed to submit"):
+        pool.run(lambda: None)
+
+    assert pool.run(operator.add, 1, 1) == 2
+
+
+def test_timed_out_job_gets_stopped(pool):
+    pool.timeout = 0.5
+
+    start = time.monotonic()
+    with pytest.raises(RuntimeError, match="did not finish"):
+        pool.run(time.sleep, 30)
+
+    assert time.monotonic() - start < 10
+    assert pool._running == set()
+
+    pool.timeout = 30
+    assert pool.run(operator.add, 1, 1) == 2
+
+
+def test_full_pool_rejects_the_job():
+    pool = AnalyticsPool(workers=1, queue_limit=0, timeout=30)
+    pool._slots.acquire()
+
+    with pytest.raises(RuntimeError, match="full"):
+        pool.run(operator.add, 1, 1)
+
+
+def test_run_without_workers_runs_in_the_calling_thread():
+    pool = AnalyticsPool(workers=0)
+
+    assert pool.run(operator.add, 2, 3) == 5
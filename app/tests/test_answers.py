@@ -51,6 +51,7 @@ def test_get_submitted_answers_by_questionnaire_id(supabase_client):
     expected_data = [
         {
             "response_id": "res_123",
+            "question_id": "qst_123",
             "responses": {"is_submitted": True},
             "questions": {
                 "questionnaire_id": "q_123",
@@ -76,6 +77,117 @@ def test_get_submitted_answers_by_questionnaire_id(supabase_client):
     assert result.data == expected_data
 
 
+def test_get_submitted_answer_label_counts(supabase_client):
+    expected_data = [
+        {
+            "category": "Perceived Usefulness",
+            "question_id": "q_1",
+            "question_text": "The app is useful",
+            "is_custom": False,
+            "label": "Agree",
+            "value": 4,
+            "answer_count": 12,
+        }
+    ]
+
+    supabase_client.rpc.return_value \
+        .execute.return_value = MockSupabaseResponse(data=expected_data)
+
+    answers = Answers(supabase_client)
+
+    result = answers.get_submitted_answer_label_counts("q_123")
+
+    supabase_client.rpc.assert_called_once_with(
+        "get_submitted_answer_label_counts",
+        {"q_id_param": "q_123"}
+    )
+    assert result.data == expected_data
+
+
+def test_get_submitted_answer_values(supabase_client):
+    expected_data = {
+        "questions": [
+            {
+                "id": "q_1",
+                "category": "Perceived Usefulness",
+                "question_text": "The app is useful",
+                "is_custom": False,
+                "is_negative": False,
+            }
+        ],
+        "options": [{"id": "opt_4", "value": 4, "label": "Agree"}],
+        "response_ids": ["res_123"],
+        "answers": {"responses": [0], "questions": [0], "values": [4]},
+    }
+
+    supabase_client.rpc.return_value \
+        .execute.return_value = MockSupabaseResponse(data=expected_data)
+
+    answers = Answers(supabase_client)
+
+    result = answers.get_submitted_answer_values("q_123")
+
+    supabase_client.rpc.assert_called_once_with(
+        "get_submitted_answer_values",
+        {"q_id_param": "q_123"}
+    )
+    assert result.data == expected_data
+
+
+def test_get_submitted_answer_values_since(supabase_client):
+    expected_data = {
+        "synced_at": "2026-01-02T10:00:00+00:00",
+        "deleted_response_ids": ["res_122"],
+        "questions": [],
+        "options": [],
+        "response_ids": [],
+        "answers": {"responses": [], "questions": [], "values": []},
+    }
+
+    supabase_client.rpc.return_value \
+        .execute.return_value = MockSupabaseResponse(data=expected_data)
+
+    answers = Answers(supabase_client)
+
+    result = answers.get_submitted_answer_values(
+        "q_123",
+        "2026-01-01T10:00:00+00:00"
+    )
+
+    supabase_client.rpc.assert_called_once_with(
+        "get_submitted_answer_values",
+        {
+            "q_id_param": "q_123",
+            "since_param": "2026-01-01T10:00:00+00:00"
+        }
+    )
+    assert result.data == expected_data
+
+
+def test_get_submitted_category_scores(supabase_client):
+    expected_data = [
+        {
+            "category": "Perceived Usefulness",
+            "total_score": 48,
+            "count_answers": 12,
+            "count_responses": 3,
+        }
+    ]
+
+    supabase_client.rpc.return_value \
+        .execute.return_value = MockSupabaseResponse(data=expected_data)
+
+    answers = Answers(supabase_client)
+
+    result = answers.get_submitted_category_scores("q_123")
+
+    supabase_client.rpc.assert_called_once_with(
+        "get_submitted_category_scores",
+        {"q_id_param": "q_123"}
+    )
+    assert result.data == expected_data
+
+
 def test_create_answers(supabase_client):
     input_answers = [
         {
@@ -162,6 +274,44 @@ def test_get_submitted_answers_by_questionnaire_id_raises_runtime_error(
     assert "Failed to retrieve answers" in str(exc.value)
 
 
+def test_get_submitted_answer_label_counts_raises_runtime_error(
+    supabase_client
+):
+    supabase_client.rpc.return_value \
+        .execute.side_effect = Exception("DB is down")
+
+    answers = Answers(supabase_client)
+
+    with pytest.raises(RuntimeError) as exc:
+        answers.get_submitted_answer_label_counts("q_123")
+
+    assert "Failed to retrieve the answer counts" in str(exc.value)
+
+
+def test_get_submitted_answer_values_raises_runtime_error(supabase_client):
+    supabase_client.rpc.return_value \
+        .execute.side_effect = Exception("DB is down")
+
+    answers = Answers(supabase_client)
+
+    with pytest.raises(RuntimeError) as exc:
+        answers.get_submitted_answer_values("q_123")
+
+    assert "Failed to retrieve answers" in str(exc.value)
+
+
+def test_get_submitted_category_scores_raises_runtime_error(supabase_client):
+    supabase_client.rpc.return_value \
+        .execute.side_effect = Exception("DB is down")
+
+    answers = Answers(supabase_client)
+
+    with pytest.raises(RuntimeError) as exc:
+        answers.get_submitted_category_scores("q_123")
+
+    assert "Failed to retrieve the category scores" in str(exc.value)
+
+
 def test_create_answers_raises_runtime_error(supabase_client):
     supabase_client.table.return_value \
         .insert.return_value \
@@ -0,0 +1,132 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from database.questionnaires import AsyncQuestionnaires
+from database.answers import AsyncAnswers
+from database.likert_scales import AsyncLikert_scales
+from database.repositories import AsyncRepositories
+from utils.questionnaire_cache import questionnaire_content_cache
+
+
+class MockSupabaseResponse:
+    def __init__(self, data=None, error=None):
+        self.data = data
+        self.error = error
+
+
+@pytest.fixture
+def supabase_client():
+    questionnaire_content_cache.clear()
+
+    client = MagicMock()
+
+    query = MagicMock()
+    query.eq.return_value = query
+    query.order.return_value = query
+    query.limit.return_value = query
+    query.execute = AsyncMock()
+
+    client.table.return_value.select.return_value = query
+    client.table.return_value.delete.return_value = query
+    client.rpc.return_value = query
+
+    return client
+
+
+def test_get_questionnaire_by_id_cached(supabase_client):
+    expected_data = [{"id": "q_123", "title": "Test Questionnaire"}]
+
+    supabase_client.table.return_value \
+        .select.return_value \
+        .execute.return_value = MockSupabaseResponse(data=expected_data)
+
+    questionnaires = AsyncQuestionnaires(supabase_client)
+
+    first = asyncio.run(questionnaires.get_questionnaire_by_id("q_123"))
+    second = asyncio.run(questionnaires.get_questionnaire_by_id("q_123"))
+
+    assert second.data == first.data
+    supabase_client.table.return_value \
+        .select.return_value \
+        .execute.assert_awaited_once()
+
+
+def test_get_submitted_category_scores(supabase_client):
+    expected_data = [{"category": "Attitude", "total_score": 12}]
+
+    supabase_client.rpc.return_value \
+        .execute.return_value = MockSupabaseResponse(data=expected_data)
+
+    answers = AsyncAnswers(supabase_client)
+
+    result = asyncio.run(answers.get_submitted_category_scores("q_123"))
+
+    supabase_client.rpc.assert_called_once_with(
+        "get_submitted_category_scores",
+        {"q_id_param": "q_123"}
+    )
+    assert result.data == expected_data
+
+
+def test_get_likert_scale_by_questionnaire_id(supabase_client):
+    expected_data = [{"id": "l_s_123"}]
+
+    supabase_client.table.return_value \
+        .select.return_value \
+        .execute.return_value = MockSupabaseResponse(data=expected_data)
+
+    likert_scales = AsyncLikert_scales(supabase_client)
+
+    result = asyncio.run(
+        likert_scales.get_likert_scale_by_questionnaire_id("q_123")
+    )
+
+    assert result.data == expected_data
+    supabase_client.table.assert_called_once_with("likert_scales")
+
+
+def test_get_submitted_answer_values_since(supabase_client):
+    answers = AsyncAnswers(supabase_client)
+
+    asyncio.run(answers.get_submitted_answer_values(
+        "q_123",
+        "2025-12-15 10:00:00+00"
+    ))
+
+    supabase_client.rpc.assert_called_once_with(
+        "get_submitted_answer_values",
+        {"q_id_param": "q_123", "since_param": "2025-12-15 10:00:00+00"}
+    )
+
+
+def test_repositories_share_the_client(supabase_client):
+    repos = AsyncRepositories(supabase_client)
+
+    assert repos.questionnaires.supabase_client is supabase_client
+    assert repos.likert_scales.supabase_client is supabase_client
+    assert repos.answers.supabase_client is supabase_client
+
+
+def test_get_questionnaire_by_id_raise_runtime_error(supabase_client):
+    supabase_client.table.return_value \
+        .select.return_value \
+        .execute.side_effect = Exception("DB down")
+
+    questionnaires = AsyncQuestionnaires(supabase_client)
+
+    with pytest.raises(RuntimeError) as exc:
+        asyncio.run(questionnaires.get_questionnaire_by_id("q_123"))
+
+    assert "Failed to retrieve questionnaire" in str(exc.value)
+
+
+def test_get_submitted_category_scores_raise_runtime_error(supabase_client):
+    supabase_client.rpc.return_value \
+        .execute.side_effect = Exception("DB down")
+
+    answers = AsyncAnswers(supabase_client)
+
+    with pytest.raises(RuntimeError) as exc:
+        asyncio.run(answers.get_submitted_category_scores("q_123"))
+
+    assert "Failed to retrieve the category scores" in str(exc.value)
@@ -0,0 +1,64 @@
+import matplotlib.pyplot as plt
+from utils.chart_cache import ChartImageCache, chart_key
+from utils.questionnaire_charts import (
+    draw_total_score_bar_chart,
+    rasterize_chart
+)
+
+
+def test_get_and_set_image():
+    cache = ChartImageCache(max_bytes=100)
+    cache.set("key", b"image")
+
+    assert cache.get("key") == b"image"
+    assert cache.get("other key") is None
+
+
+def test_least_recently_used_images_over_the_budget_get_dropped():
+    cache = ChartImageCache(max_bytes=10)
+    cache.set("key_1", b"12345")
+    cache.set("key_2", b"12345")
+    cache.get("key_1")
+    cache.set("key_3", b"12345")
+
+    assert cache.get("key_1") == b"12345"
+    assert cache.get("key_2") is None
+    assert cache.get("key_3") == b"12345"
+
+
+def test_image_larger_than_the_budget_is_kept_alone():
+    cache = ChartImageCache(max_bytes=4)
+    cache.set("key_1", b"12")
+    cache.set("key_2", b"12345")
+
+    assert cache.get("key_1") is None
+    assert cache.get("key_2") == b"12345"
+
+
+def test_replacing_an_image_updates_the_budget():
+    cache = ChartImageCache(max_bytes=10)
+    cache.set("key_1", b"1234567890")
+    cache.set("key_1", b"12345")
+    cache.set("key_2", b"12345")
+
+    assert cache.get("key_1") == b"12345"
+    assert cache.get("key_2") == b"12345"
+
+
+def test_chart_key_depends_on_every_part():
+    key = chart_key("draw", (6, 4), (("PU", "A"), (10, 20), 30))
+
+    assert key == chart_key("draw", (6, 4), (("PU", "A"), (10, 20), 30))
+    assert key != chart_key("draw", (6, 4), (("PU", "A"), (10, 21), 30))
+    assert key != chart_key("draw", (8, 4), (("PU", "A"), (10, 20), 30))
+
+
+def test_rasterize_chart_does_not_register_the_figure():
+    image = rasterize_chart(
+        draw_total_score_bar_chart,
+        (6, 4),
+        (("PU", "A"), (10, 20), 30)
+    )
+
+    assert image.startswith(b"\x89PNG")
+    assert plt.get_fignums() == []
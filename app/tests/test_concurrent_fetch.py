@@ -0,0 +1,80 @@
+import asyncio
+import threading
+import pytest
+from unittest.mock import MagicMock
+from utils import concurrent_fetch
+
+
+@pytest.fixture
+def event_loop_thread(monkeypatch):
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    monkeypatch.setattr(
+        concurrent_fetch.supabase_client,
+        "get_event_loop",
+        lambda: loop
+    )
+    monkeypatch.setattr(
+        concurrent_fetch.supabase_client,
+        "init_async_client",
+        lambda auth_header: MagicMock()
+    )
+
+    yield loop
+
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+def test_gather_fetches_returns_results_in_order(event_loop_thread):
+    async def fetch(value, delay):
+        await asyncio.sleep(delay)
+        return value
+
+    results = concurrent_fetch.gather_fetches(
+        lambda repos: fetch("first", 0.02),
+        lambda repos: fetch("second", 0),
+        auth_header="Bearer token"
+    )
+
+    assert results == ["first", "second"]
+
+
+def test_gather_fetches_failed_fetch_is_none(event_loop_thread):
+    async def fail():
+        raise RuntimeError("DB down")
+
+    async def succeed():
+        return "data"
+
+    results = concurrent_fetch.gather_fetches(
+        lambda repos: fail(),
+        lambda repos: succeed(),
+        auth_header="Bearer token"
+    )
+
+    assert results == [None, "data"]
+
+
+def test_gather_fetches_times_out(event_loop_thread, monkeypatch):
+    monkeypatch.setattr(concurrent_fetch, "CONCURRENT_FETCH_TIMEOUT", 0.05)
+    cancelled = threading.Event()
+
+    async def stall():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(RuntimeError) as exc:
+        concurrent_fetch.gather_fetches(
+            lambda repos: stall(),
+            auth_header="Bearer token"
+        )
+
+    assert "did not finish" in str(exc.value)
+    assert cancelled.wait(1)
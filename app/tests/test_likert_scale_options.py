@@ -1,6 +1,7 @@
 import pytest
 from unittest.mock import MagicMock
 from database.likert_scale_options import Likert_scale_options
+from utils.questionnaire_cache import questionnaire_content_cache
 
 
 class MockSupabaseResponse:
@@ -11,6 +12,8 @@ class MockSupabaseResponse:
 
 @pytest.fixture
 def supabase_client():
+    questionnaire_content_cache.clear()
+
     client = MagicMock()
 
     query = MagicMock()
@@ -94,3 +97,66 @@ def test_create_likert_scale_options_fail(supabase_client):
         likert_scale_options.create_likert_scale_options([{"id": "l_s_o_1"}])
 
     assert "Failed to insert the likert scale's options" in str(exc.value)
+
+
+def test_get_options_by_likert_scale_id_is_cached(supabase_client):
+    expected_data = [{"id": "l_s_o_1", "value": 1, "label": "disagree"}]
+
+    supabase_client.table.return_value \
+        .select.return_value \
+        .eq.return_value \
+        .order.return_value \
+        .execute.return_value = MockSupabaseResponse(data=expected_data)
+
+    questionnaire_content_cache.alias("l_s_123", "q_123")
+    likert_scales_options = Likert_scale_options(supabase_client)
+
+    first_result = (
+        likert_scales_options.get_options_by_likert_scale_id("l_s_123")
+    )
+    second_result = (
+        likert_scales_options.get_options_by_likert_scale_id("l_s_123")
+    )
+
+    supabase_client.table.assert_called_once_with("likert_scale_options")
+    assert second_result.data == first_result.data
+
+
+def test_get_options_of_unaliased_likert_scale_are_not_cached(
+    supabase_client
+):
+    expected_data = [{"id": "l_s_o_1", "value": 1, "label": "disagree"}]
+
+    supabase_client.table.return_value \
+        .select.return_value \
+        .eq.return_value \
+        .order.return_value \
+        .execute.return_value = MockSupabaseResponse(data=expected_data)
+
+    likert_scales_options = Likert_scale_options(supabase_client)
+
+    likert_scales_options.get_options_by_likert_scale_id("l_s_123")
+    likert_scales_options.get_options_by_likert_scale_id("l_s_123")
+
+    assert supabase_client.table.call_count == 2
+
+
+def test_get_options_by_likert_scale_id_invalidated_with_questionnaire(
+    supabase_client
+):
+    expected_data = [{"id": "l_s_o_1", "value": 1, "label": "disagree"}]
+
+    supabase_client.table.return_value \
+        .select.return_value \
+        .eq.return_value \
+        .order.return_value \
+        .execute.return_value = MockSupabaseResponse(data=expected_data)
+
+    questionnaire_content_cache.alias("l_s_123", "q_123")
+    likert_scales_options = Likert_scale_options(supabase_client)
+
+    likert_scales_options.get_options_by_likert_scale_id("l_s_123")
+    questionnaire_content_cache.invalidate("q_123")
+    likert_scales_options.get_options_by_likert_scale_id("l_s_123")
+
+    assert supabase_client.table.call_count == 2
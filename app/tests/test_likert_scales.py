@@ -1,6 +1,7 @@
 import pytest
 from unittest.mock import MagicMock
 from database.likert_scales import Likert_scales
+from utils.questionnaire_cache import questionnaire_content_cache
 
 
 class MockSupabaseResponse:
@@ -11,6 +12,8 @@ class MockSupabaseResponse:
 
 @pytest.fixture
 def supabase_client():
+    questionnaire_content_cache.clear()
+
     client = MagicMock()
 
     query = MagicMock()
@@ -95,3 +98,40 @@ def test_create_likert_scale_raises_runtime_error(supabase_client):
         "Failed to create the questionnaire's likert scale"
         in str(exc.value)
     )
+
+
+def test_likert_scale_options_are_invalidated_with_questionnaire(
+    supabase_client
+):
+    supabase_client.table.return_value \
+        .select.return_value \
+        .eq.return_value \
+        .execute.return_value = MockSupabaseResponse(data=[{"id": "l_s_123"}])
+
+    likert_scales = Likert_scales(supabase_client)
+
+    likert_scales.get_likert_scale_by_questionnaire_id("q_123")
+    questionnaire_content_cache.set(
+        "l_s_123",
+        "likert_scale_options_l_s_123",
+        "cached_options"
+    )
+
+    assert (
+        questionnaire_content_cache.get(
+            "l_s_123",
+            "likert_scale_options_l_s_123"
+        ) == "cached_options"
+    )
+
+    questionnaire_content_cache.invalidate("q_123")
+
+    assert (
+        questionnaire_content_cache.get(
+            "l_s_123",
+            "likert_scale_options_l_s_123"
+        ) is None
+    )
+    assert (
+        questionnaire_content_cache.get("q_123", "likert_scale") is None
+    )
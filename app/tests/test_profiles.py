@@ -16,7 +16,9 @@ def supabase_client():
     query = MagicMock()
     query.eq.return_value = query
     query.neq.return_value = query
+    query.ilike.return_value = query
     query.order.return_value = query
+    query.limit.return_value = query
 
     client.table.return_value.select.return_value = query
     client.table.return_value.insert.return_value = query
@@ -51,6 +53,21 @@ def test_get_all_profiles(supabase_client):
     assert result.data == expected_data
 
 
+def test_search_profiles_by_name(supabase_client):
+    expected_data = [{"id": "user_1", "full_name": "alex"}]
+
+    query = supabase_client.table.return_value.select.return_value
+    query.execute.return_value = MockSupabaseResponse(data=expected_data)
+
+    profiles = Profiles(supabase_client)
+
+    result = profiles.search_profiles_by_name("ale", 20)
+
+    assert result.data == expected_data
+    query.ilike.assert_called_once_with("full_name", "%ale%")
+    query.limit.assert_called_once_with(20)
+
+
 def test_get_profile_by_id(supabase_client):
     expected_data = [
         {
@@ -214,6 +231,19 @@ def test_get_all_profiles_raises_runtime_error(supabase_client):
     assert "Failed to retrieve profiles" in str(exc.value)
 
 
+def test_search_profiles_by_name_raises_runtime_error(supabase_client):
+    supabase_client.table.return_value \
+        .select.return_value \
+        .execute.side_effect = Exception("DB down")
+
+    profiles = Profiles(supabase_client)
+
+    with pytest.raises(RuntimeError) as exc:
+        profiles.search_profiles_by_name("ale", 20)
+
+    assert "Failed to retrieve profiles" in str(exc.value)
+
+
 def test_get_profile_by_id_raises_runtime_error(supabase_client):
     supabase_client.table.return_value \
         .select.return_value \
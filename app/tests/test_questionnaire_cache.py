@@ -0,0 +1,70 @@
+from postgrest import APIResponse
+from utils.questionnaire_cache import QuestionnaireContentCache
+
+
+def test_get_and_set_by_key():
+    cache = QuestionnaireContentCache()
+    cache.set("q_123", "questionnaire", "questionnaire data")
+
+    assert cache.get("q_123", "questionnaire") == "questionnaire data"
+    assert cache.get("q_123", "bundle") is None
+    assert cache.get("q_456", "questionnaire") is None
+
+
+def test_changing_a_result_does_not_change_the_cached_one():
+    cache = QuestionnaireContentCache()
+    questionnaire = APIResponse(
+        data=[{"id": "q_123", "questions": [{"id": "qst_1"}]}],
+        count=None
+    )
+    cache.set("q_123", "bundle", questionnaire)
+    # the result that has been cached and the ones that get read
+    # from the cache get changed by their callers
+    questionnaire.data[0]["title"] = "Changed"
+    cache.get("q_123", "bundle").data[0]["questions"].clear()
+    cache.get("q_123", "bundle").data.append({"id": "q_456"})
+
+    assert cache.get("q_123", "bundle").data == [
+        {"id": "q_123", "questions": [{"id": "qst_1"}]}
+    ]
+
+
+def test_alias_files_results_under_the_questionnaire():
+    cache = QuestionnaireContentCache()
+    cache.alias("l_s_123", "q_123")
+    cache.set("l_s_123", "likert_scale_options_l_s_123", "options")
+
+    assert cache.owner("l_s_123") == "q_123"
+    assert cache.owner("l_s_456") is None
+    assert cache.get("q_123", "likert_scale_options_l_s_123") == "options"
+
+    cache.invalidate("q_123")
+
+    assert cache.get("l_s_123", "likert_scale_options_l_s_123") is None
+    assert cache.owner("l_s_123") is None
+
+
+def test_least_recently_used_questionnaire_gets_evicted():
+    cache = QuestionnaireContentCache(max_questionnaires=2)
+    cache.alias("l_s_2", "q_2")
+    cache.set("q_1", "questionnaire", "questionnaire 1")
+    cache.set("q_2", "questionnaire", "questionnaire 2")
+    cache.get("q_1", "questionnaire")
+    cache.set("q_3", "questionnaire", "questionnaire 3")
+
+    assert cache.get("q_1", "questionnaire") == "questionnaire 1"
+    assert cache.get("q_2", "questionnaire") is None
+    assert cache.get("q_3", "questionnaire") == "questionnaire 3"
+    # the aliases of an evicted questionnaire get dropped with it
+    assert cache.owner("l_s_2") is None
+
+
+def test_clear():
+    cache = QuestionnaireContentCache()
+    cache.alias("l_s_123", "q_123")
+    cache.set("q_123", "questionnaire", "questionnaire data")
+
+    cache.clear()
+
+    assert cache.get("q_123", "questionnaire") is None
+    assert cache.owner("l_s_123") is None
@@ -0,0 +1,115 @@
+import pytest
+from unittest.mock import MagicMock
+from streamlit.testing.v1 import AppTest
+from utils import questionnaire_charts
+from utils.chart_cache import chart_image_cache
+
+
+@pytest.fixture
+def streamlit(monkeypatch):
+    chart_image_cache.clear()
+    streamlit = MagicMock()
+    monkeypatch.setattr(questionnaire_charts, "st", streamlit)
+    monkeypatch.setattr(questionnaire_charts, "CHART_BACKEND", "matplotlib")
+    yield streamlit
+    chart_image_cache.clear()
+
+
+def test_render_chart_rasterizes_in_the_pool(streamlit, monkeypatch):
+    pool = MagicMock()
+    pool.run.return_value = b"image"
+    monkeypatch.setattr(questionnaire_charts, "analytics_pool", pool)
+
+    for _ in range(2):
+        questionnaire_charts.render_chart(
+            questionnaire_charts.draw_total_score_bar_chart,
+            None,
+            (6, 4),
+            ("PU", "A"),
+            (10, 20),
+            30
+        )
+
+    # the second chart is served from the chart image cache
+    pool.run.assert_called_once()
+    assert streamlit.image.call_count == 2
+
+
+def test_render_chart_shows_an_error_if_the_pool_fails(
+    streamlit,
+    monkeypatch
+):
+    pool = MagicMock()
+    pool.run.side_effect = RuntimeError("The analytics pool is full")
+    monkeypatch.setattr(questionnaire_charts, "analytics_pool", pool)
+    rasterize_chart = MagicMock()
+    monkeypatch.setattr(
+        questionnaire_charts,
+        "rasterize_chart",
+        rasterize_chart
+    )
+
+    questionnaire_charts.render_chart(
+        questionnaire_charts.draw_total_score_bar_chart,
+        None,
+        (6, 4),
+        ("PU", "A"),
+        (10, 20),
+        30
+    )
+
+    # the chart does not get rasterized by the session's thread
+    rasterize_chart.assert_not_called()
+    streamlit.error.assert_called_once()
+    streamlit.image.assert_not_called()
+
+
+def results_sections_app():
+    from unittest.mock import MagicMock
+    from utils import questionnaire_charts
+
+    questionnaire_charts.render_results_sections(MagicMock(
+        secondary_histograms=["secondary histogram"],
+        reliability=["reliability"]
+    ))
+
+
+def test_render_results_sections_renders_only_the_selected_section(
+    monkeypatch
+):
+    sections = {
+        name: MagicMock()
+        for name in [
+            "render_category_totals",
+            "render_constructs_section",
+            "render_reliability",
+            "render_spearman_section"
+        ]
+    }
+    for name, render_section in sections.items():
+        monkeypatch.setattr(questionnaire_charts, name, render_section)
+
+    app = AppTest.from_function(results_sections_app).run()
+
+    assert app.radio[0].options == [
+        "TAM score",
+        "Basic constructs",
+        "Secondary constructs",
+        "Reliability analysis",
+        "Spearman analysis"
+    ]
+    sections["render_category_totals"].assert_called_once()
+    sections["render_constructs_section"].assert_not_called()
+    sections["render_reliability"].assert_not_called()
+    sections["render_spearman_section"].assert_not_called()
+
+    app.radio[0].set_value("Secondary constructs").run()
+
+    assert sections["render_category_totals"].call_count == 1
+    sections["render_constructs_section"].assert_called_once_with(
+        ["secondary histogram"],
+        "Secondary construct"
+    )
+    sections["render_reliability"].assert_not_called()
+    sections["render_spearman_section"].assert_not_called()
+    assert not app.exception
@@ -0,0 +1,408 @@
+import numpy as np
+import pandas as pd
+import pytest
+from utils.questionnaire_scoring import (
+    BASIC_CONSTRUCTS,
+    CategoryTotals,
+    LabelHistogram,
+    compute_questionnaire_results,
+    construct_histograms,
+    construct_reliability,
+    construct_scores,
+    construct_spearman_matrix,
+    index_label_counts,
+    matrix_label_count_rows,
+    tam_category_totals
+)
+from utils.scoring_engine import (
+    ResponseMatrix,
+    bootstrap_chunk_size,
+    bootstrap_spearman_intervals,
+    cronbach_reliability,
+    response_matrix_from_answers
+)
+
+
+def likert_scale_options():
+    return [
+        {"id": f"lso_{value}", "value": value, "label": str(value)}
+        for value in range(1, 6)
+    ]
+
+
+def test_tam_category_totals():
+    category_scores = [
+        {
+            "category": "Perceived Usefulness",
+            "total_score": 8,
+            "count_answers": 2
+        },
+        {
+            "category": "Attitude",
+            "total_score": 4,
+            "count_answers": 2
+        },
+        {
+            "category": "Trust",
+            "total_score": 5,
+            "count_answers": 1
+        }
+    ]
+
+    totals = tam_category_totals(
+        ["Perceived Usefulness", "Attitude", "Trust"],
+        category_scores,
+        likert_scale_options(),
+        BASIC_CONSTRUCTS
+    )
+
+    assert totals.scores_by_category == {
+        "Perceived Usefulness": 8,
+        "Attitude": 4,
+        "Trust": 0
+    }
+    assert totals.count_answers == 4
+    assert totals.tam_score == pytest.approx(12 / (4 * 5))
+
+
+def test_tam_category_totals_without_basic_answers():
+    category_scores = [
+        {
+            "category": "Trust",
+            "total_score": 5,
+            "count_answers": 1
+        }
+    ]
+
+    totals = tam_category_totals(
+        ["Trust"],
+        category_scores,
+        likert_scale_options(),
+        BASIC_CONSTRUCTS
+    )
+
+    assert totals.count_answers == 0
+    assert totals.tam_score is None
+
+
+def construct_means(n_responses):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        np.round(rng.uniform(1, 5, (n_responses, 3)) * 4) / 4,
+        columns=["PU", "PEOU", "BI"]
+    )
+
+
+def test_construct_spearman_matrix_caps_the_resamples():
+    matrix = construct_spearman_matrix(
+        construct_means(50),
+        n_resamples=400,
+        max_draws=50 * 100,
+        min_resamples=20
+    )
+
+    assert matrix.n_resamples == 100
+    assert matrix.r_low is not None
+    assert np.all(matrix.r_low[0, 1:] <= matrix.r[0, 1:])
+    assert np.all(matrix.r[0, 1:] <= matrix.r_high[0, 1:])
+
+
+def test_construct_spearman_matrix_without_enough_resamples():
+    matrix = construct_spearman_matrix(
+        construct_means(50),
+        n_resamples=400,
+        max_draws=50 * 10,
+        min_resamples=20
+    )
+
+    assert matrix.n_resamples == 0
+    assert matrix.r_low is None
+    assert matrix.r_high is None
+
+
+def test_bootstrap_chunk_size_fits_the_memory_budget():
+    assert bootstrap_chunk_size(1000, 15, 144_000 * 10) == 10
+    assert bootstrap_chunk_size(100_000, 15, 1) == 1
+
+
+def test_bootstrap_intervals_do_not_depend_on_the_batches():
+    values = construct_means(40).to_numpy()
+
+    low, high = bootstrap_spearman_intervals(values, 50, seed=1)
+    batched_low, batched_high = bootstrap_spearman_intervals(
+        values,
+        50,
+        seed=1,
+        memory_bytes=1
+    )
+
+    np.testing.assert_allclose(low, batched_low)
+    np.testing.assert_allclose(high, batched_high)
+
+
+def test_construct_reliability_reverses_the_negative_questions():
+    values = np.array([
+        [5, 1, 4, 2],
+        [4, 2, 4, 3],
+        [2, 4, 1, 5],
+        [1, 5, 2, 1]
+    ], dtype=np.int8)
+    matrix = ResponseMatrix(
+        ["res_1", "res_2", "res_3", "res_4"],
+        ["qst_1", "qst_2", "qst_3", "qst_4"],
+        ["Perceived Usefulness", "Attitude"],
+        values,
+        np.array([0, 0, 0, 1], dtype=np.int32),
+        np.array([False, True, False, False]),
+        np.array([False, False, False, False]),
+        ["Question 1", "Question 2", "Question 3", "Question 4"]
+    )
+
+    reliability = construct_reliability(
+        matrix,
+        likert_scale_options(),
+        ["Perceived Usefulness", "Attitude"]
+    )
+
+    # Attitude has a single question, so it has no reliability
+    assert len(reliability) == 1
+    assert reliability[0].construct == "Perceived Usefulness"
+    assert reliability[0].n == 4
+    assert reliability[0].alpha == pytest.approx(
+        cronbach_reliability(
+            np.column_stack([values[:, 0], 6 - values[:, 1], values[:, 2]])
+        )[0]
+    )
+    assert list(reliability[0].items["Question"]) == [
+        "Question 1",
+        "Question 2",
+        "Question 3"
+    ]
+
+
+def mock_answers():
+    rows = [
+        ("res_1", "qst_1", "Perceived Usefulness", False, 5),
+        ("res_1", "qst_2", "Perceived Usefulness", True, 1),
+        ("res_1", "qst_3", "Attitude", False, 4),
+        ("res_1", "qst_4", "Trust", False, 2),
+        ("res_2", "qst_1", "Perceived Usefulness", False, 3),
+        ("res_2", "qst_2", "Perceived Usefulness", True, 2),
+        ("res_2", "qst_3", "Attitude", False, 2)
+    ]
+    return [
+        {
+            "response_id": response_id,
+            "question_id": question_id,
+            "questions": {"category": category, "is_negative": is_negative},
+            "likert_scale_options": {"value": value, "label": str(value)}
+        }
+        for response_id, question_id, category, is_negative, value in rows
+    ]
+
+
+def test_construct_scores_of_answers_and_of_their_matrix():
+    categories = ["Perceived Usefulness", "Attitude", "Behavioral Intention"]
+    expected = {
+        "Perceived Usefulness": {"total_score": 17, "count_answers": 4},
+        "Attitude": {"total_score": 6, "count_answers": 2},
+        "Behavioral Intention": {"total_score": 0, "count_answers": 0}
+    }
+
+    assert construct_scores(
+        mock_answers(),
+        likert_scale_options(),
+        categories
+    ) == expected
+    assert construct_scores(
+        response_matrix_from_answers(mock_answers()),
+        likert_scale_options(),
+        categories
+    ) == expected
+
+
+def test_construct_scores_of_aggregated_rows():
+    category_scores = [
+        {
+            "category": "Perceived Usefulness",
+            "total_score": 16,
+            "count_answers": 4
+        }
+    ]
+
+    assert construct_scores(
+        category_scores,
+        likert_scale_options(),
+        ["Perceived Usefulness", "Attitude"]
+    ) == {
+        "Perceived Usefulness": {"total_score": 16, "count_answers": 4},
+        "Attitude": {"total_score": 0, "count_answers": 0}
+    }
+
+
+def test_construct_scores_without_answers():
+    assert construct_scores([], likert_scale_options(), ["Attitude"]) == {
+        "Attitude": {"total_score": 0, "count_answers": 0}
+    }
+
+
+def mock_label_counts():
+    return [
+        {
+            "category": category,
+            "question_id": question_id,
+            "is_custom": is_custom,
+            "question_text": question_text,
+            "label": str(value),
+            "answer_count": count
+        }
+        for category, question_id, is_custom, question_text, counts in (
+            ("Perceived Usefulness", "qst_1", False, "Q1", [0, 0, 1, 0, 1]),
+            ("Perceived Usefulness", "qst_2", True, "Q2", [1, 0, 0, 1, 0]),
+            ("Trust", "qst_3", False, "Q3", [0, 2, 0, 0, 0])
+        )
+        for value, count in zip(range(1, 6), counts)
+    ]
+
+
+def mock_category_scores():
+    return [
+        {
+            "category": "Perceived Usefulness",
+            "total_score": 13,
+            "count_answers": 4,
+            "count_responses": 2
+        },
+        {
+            "category": "Trust",
+            "total_score": 4,
+            "count_answers": 2,
+            "count_responses": 2
+        }
+    ]
+
+
+def test_compute_questionnaire_results():
+    results = compute_questionnaire_results(
+        "Test Questionnaire",
+        mock_label_counts(),
+        mock_category_scores(),
+        likert_scale_options()
+    )
+
+    assert results.title == "Test Questionnaire"
+    assert results.constructs == ("Perceived Usefulness", "Trust")
+    assert results.secondary_constructs == ("Trust",)
+    assert results.count_of_responses == 2
+    assert results.count_of_answers == 6
+    assert results.category_totals == CategoryTotals(
+        {"Perceived Usefulness": 13, "Trust": 0},
+        4,
+        13 / (4 * 5)
+    )
+
+    usefulness = results.basic_histograms[0]
+    assert usefulness.construct == "Perceived Usefulness"
+    assert usefulness.automated.counts == (0, 0, 1, 0, 1)
+    assert usefulness.custom[0] == LabelHistogram(
+        "Score contribution for 'Q2' question",
+        ("1", "2", "3", "4", "5"),
+        (1, 0, 0, 1, 0)
+    )
+    assert results.secondary_histograms[0].automated.counts == (
+        0, 2, 0, 0, 0
+    )
+
+    # fewer responses than a Spearman analysis needs,
+    # and no answers for the reliability
+    assert results.spearman_matrix is None
+    assert results.correlation_tables == ()
+    assert results.reliability == ()
+
+
+def test_compute_questionnaire_results_without_responses():
+    results = compute_questionnaire_results(
+        "Test Questionnaire",
+        [],
+        [],
+        likert_scale_options()
+    )
+
+    assert results.count_of_responses == 0
+    assert results.basic_histograms == ()
+    assert results.category_totals is None
+
+
+def custom_label_counts():
+    return [
+        {
+            "category": "Trust",
+            "question_id": question_id,
+            "is_custom": is_custom,
+            "question_text": question_text,
+            "label": str(value),
+            "answer_count": count
+        }
+        for question_id, is_custom, question_text, counts in (
+            ("qst_1", False, "Automated", [0, 0, 0, 0, 3]),
+            ("qst_2", True, "Custom A", [3, 0, 0, 0, 0]),
+            ("qst_3", True, "Custom B", [0, 0, 3, 0, 0]),
+            # another custom question with the same text
+            ("qst_4", True, "Custom A", [0, 3, 0, 0, 0])
+        )
+        for value, count in zip(range(1, 6), counts)
+    ]
+
+
+def test_index_label_counts_partitions_the_rows():
+    index = index_label_counts(custom_label_counts(), likert_scale_options())
+
+    assert list(index) == [("Trust", False), ("Trust", True)]
+    assert list(index[("Trust", True)]) == ["qst_2", "qst_3", "qst_4"]
+    assert all(
+        row["question_id"] == "qst_3"
+        for row in index[("Trust", True)]["qst_3"]
+    )
+
+
+def test_custom_histograms_count_only_their_own_question():
+    histograms = construct_histograms(
+        custom_label_counts(),
+        "Trust",
+        likert_scale_options(),
+        "Answers for Trust automated questions",
+        "Answers for '{question_text}' question"
+    )
+
+    assert histograms.automated.counts == (0, 0, 0, 0, 3)
+    assert [
+        (histogram.title, histogram.counts)
+        for histogram in histograms.custom
+    ] == [
+        ("Answers for 'Custom A' question", (3, 0, 0, 0, 0)),
+        ("Answers for 'Custom B' question", (0, 0, 3, 0, 0)),
+        ("Answers for 'Custom A' question", (0, 3, 0, 0, 0))
+    ]
+
+
+def test_index_label_counts_of_a_response_matrix():
+    matrix = ResponseMatrix(
+        ["res_1", "res_2"],
+        ["qst_1", "qst_2"],
+        ["Trust"],
+        np.array([[5, 1], [4, 1]], dtype=np.int8),
+        np.array([0, 0], dtype=np.int32),
+        np.array([False, False]),
+        np.array([False, True]),
+        ["Automated", "Custom A"]
+    )
+
+    index = index_label_counts(matrix, likert_scale_options())
+
+    assert index == index_label_counts(
+        matrix_label_count_rows(matrix, likert_scale_options()),
+        likert_scale_options()
+    )
+    assert [
+        row["answer_count"] for row in index[("Trust", True)]["qst_2"]
+    ] == [2, 0, 0, 0, 0]
@@ -3,171 +3,117 @@ from unittest.mock import MagicMock, patch
 import services.questionnaire_services as q_services
 
 
-def test_retrieve_questionnaire():
-    questionnaires_repo = MagicMock()
-    questions_repo = MagicMock()
-    likert_scales_repo = MagicMock()
-    likert_scale_options_repo = MagicMock()
-    logger = MagicMock()
-
-    questionnaire_data = {
+def mock_questionnaire_bundle():
+    return {
         "id": "q_123",
         "title": "Test Questionnaire",
         "details": "description",
-        "created_by": "user_123",
         "created_at": "2025-12-15 14:03:34.15619+00",
-    }
-    questions_data = {
-        "data": [
+        "questions": [
             {
                 "id": "1",
-                "questionnnaire_id": "q_123",
                 "question_text": "Question 1",
+                "category": "Perceived Usefulness",
                 "position": 1,
             }
-        ]
-    }
-    likert_scale_data = MagicMock()
-    likert_scale_data.data = [{"id": "l_s_123"}]
-    likert_scale_options_data = {
-        "data": [
+        ],
+        "likert_scales": [
             {
-                "id": "lso_1",
-                "likert_scale_id": "l_s_123",
-                "value": 1,
-                "label": "Strongly Disagree",
+                "id": "l_s_123",
+                "likert_scale_options": [
+                    {
+                        "id": "lso_1",
+                        "value": 1,
+                        "label": "Strongly Disagree",
+                    }
+                ]
             }
         ]
     }
 
-    questionnaires_repo.get_questionnaire_by_id.return_value = (
-        questionnaire_data
-    )
-    questions_repo.get_questions_by_questionnaire_id.return_value = (
-        questions_data
-    )
-    likert_scales_repo.get_likert_scale_by_questionnaire_id.return_value = (
-        likert_scale_data
-    )
-    likert_scale_options_repo.get_options_by_likert_scale_id.return_value = (
-        likert_scale_options_data
+
+def test_retrieve_questionnaire():
+    questionnaires_repo = MagicMock()
+    logger = MagicMock()
+
+    questionnaires_repo.get_questionnaire_bundle_by_id.return_value = (
+        MagicMock(data=[mock_questionnaire_bundle()])
     )
 
     result = q_services.retrieve_questionnaire(
         "q_123",
         questionnaires_repo,
-        questions_repo,
-        likert_scales_repo,
-        likert_scale_options_repo,
         logger,
     )
 
     (
         questionnaires_repo.
-        get_questionnaire_by_id.
-        assert_called_once_with("q_123")
-    )
-    (
-        questions_repo.
-        get_questions_by_questionnaire_id.
-        assert_called_once_with("q_123")
-    )
-    (
-        likert_scales_repo.
-        get_likert_scale_by_questionnaire_id.
+        get_questionnaire_bundle_by_id.
         assert_called_once_with("q_123")
     )
-    (
-        likert_scale_options_repo.
-        get_options_by_likert_scale_id.
-        assert_called_once_with("l_s_123")
-    )
     logger.error.assert_not_called()
 
-    assert result == [
-        questionnaire_data,
-        questions_data,
-        likert_scale_data,
-        likert_scale_options_data
+    assert result[0].data == [
+        {
+            "id": "q_123",
+            "title": "Test Questionnaire",
+            "details": "description",
+            "created_at": "2025-12-15 14:03:34.15619+00",
+        }
+    ]
+    assert result[1].data == mock_questionnaire_bundle()["questions"]
+    assert result[2].data == [{"id": "l_s_123"}]
+    assert result[3].data == [
+        {
+            "id": "lso_1",
+            "value": 1,
+            "label": "Strongly Disagree",
+        }
     ]
 
 
 def test_retrieve_questionnaire_by_response():
     responses_repo = MagicMock()
-    questions_repo = MagicMock()
-    likert_scales_repo = MagicMock()
-    likert_scale_options_repo = MagicMock()
     logger = MagicMock()
 
-    response_data = MagicMock()
-    response_data.data = [{"questionnaires": {"id": "q_123"}}]
-    questions_data = {
-        "data": [
+    responses_repo.get_response_bundle_by_id.return_value = MagicMock(
+        data=[
             {
-                "id": "1",
-                "questionnaire_id": "q_123",
-                "question_text": "Question 1",
-                "Category": "Perceived Usefulness",
-            }
-        ]
-    }
-    likert_scale_data = MagicMock()
-    likert_scale_data.data = [{"id": "l_s_123"}]
-    likert_scale_options_data = {
-        "data": [
-            {
-                "id": "lso_1",
-                "likert_scale_id": "l_s_123",
-                "value": 1,
-                "label": "Strongly Disagree",
+                "profiles": {"full_name": "John Doe"},
+                "submitted_at": None,
+                "questionnaires": mock_questionnaire_bundle(),
             }
         ]
-    }
-
-    responses_repo.get_response_by_id.return_value = response_data
-    questions_repo.get_questions_by_questionnaire_id.return_value = (
-        questions_data
-    )
-    likert_scales_repo.get_likert_scale_by_questionnaire_id.return_value = (
-        likert_scale_data
-    )
-    likert_scale_options_repo.get_options_by_likert_scale_id.return_value = (
-        likert_scale_options_data
     )
 
     result = q_services.retrieve_questionnaire_by_response(
         "res_123",
         responses_repo,
-        questions_repo,
-        likert_scales_repo,
-        likert_scale_options_repo,
         logger,
     )
 
-    responses_repo.get_response_by_id.assert_called_once_with("res_123")
-    (
-        questions_repo.
-        get_questions_by_questionnaire_id.
-        assert_called_once_with("q_123")
-    )
-    (
-        likert_scales_repo.
-        get_likert_scale_by_questionnaire_id.
-        assert_called_once_with("q_123")
-    )
     (
-        likert_scale_options_repo.
-        get_options_by_likert_scale_id.
-        assert_called_once_with("l_s_123")
+        responses_repo.
+        get_response_bundle_by_id.
+        assert_called_once_with("res_123")
     )
     logger.error.assert_not_called()
 
-    assert result == [
-        response_data,
-        questions_data,
-        likert_scale_data,
-        likert_scale_options_data
+    assert result[0].data == [
+        {
+            "profiles": {"full_name": "John Doe"},
+            "submitted_at": None,
+            "questionnaires": {
+                "id": "q_123",
+                "title": "Test Questionnaire",
+                "details": "description",
+                "created_at": "2025-12-15 14:03:34.15619+00",
+            },
+        }
     ]
+    assert result[1].data == mock_questionnaire_bundle()["questions"]
+    assert result[2].data == [{"id": "l_s_123"}]
+    assert result[3].data[0]["id"] == "lso_1"
 
 
 def test_submit_questionnaire_likert_scale():
@@ -298,383 +244,68 @@ def test_submit_questionnaire():
 
 def test_retrieve_questionnaire_repo_fail():
     questionnaires_repo = MagicMock()
-    questions_repo = MagicMock()
-    likert_scales_repo = MagicMock()
-    likert_scale_options_repo = MagicMock()
     logger = MagicMock()
 
-    questionnaires_repo.get_questionnaire_by_id.side_effect = (
+    questionnaires_repo.get_questionnaire_bundle_by_id.side_effect = (
         RuntimeError("DB error")
     )
 
     result = q_services.retrieve_questionnaire(
         "q_123",
         questionnaires_repo,
-        questions_repo,
-        likert_scales_repo,
-        likert_scale_options_repo,
         logger,
     )
 
     (
         questionnaires_repo.
-        get_questionnaire_by_id.
-        assert_called_once_with("q_123")
-    )
-    logger.error.assert_called_once()
-
-    questions_repo.get_questions_by_questionnaire_id.assert_not_called()
-
-    assert result[0] is None
-    assert result[1] is None
-    assert result[2] is None
-    assert result[3] is None
-
-
-def test_retrieve_questionnaire_questions_repo_fail():
-    questionnaires_repo = MagicMock()
-    questions_repo = MagicMock()
-    likert_scales_repo = MagicMock()
-    likert_scale_options_repo = MagicMock()
-    logger = MagicMock()
-
-    mock_questionnaire = MagicMock()
-    questionnaires_repo.get_questionnaire_by_id.return_value = (
-        mock_questionnaire
-    )
-
-    questions_repo.get_questions_by_questionnaire_id.side_effect = (
-        RuntimeError("DB error")
-    )
-
-    result = q_services.retrieve_questionnaire(
-        "q_123",
-        questionnaires_repo,
-        questions_repo,
-        likert_scales_repo,
-        likert_scale_options_repo,
-        logger
-    )
-
-    (
-        questionnaires_repo.
-        get_questionnaire_by_id.
-        assert_called_once_with("q_123")
-    )
-    (
-        questions_repo.
-        get_questions_by_questionnaire_id.
+        get_questionnaire_bundle_by_id.
         assert_called_once_with("q_123")
     )
-
     logger.error.assert_called_once_with("Database error: DB error")
 
-    assert result[0] is mock_questionnaire
-    assert result[1] is None
-    assert result[2] is None
-    assert result[3] is None
+    assert result == [None, None, None, None]
 
 
-def test_retrieve_questionnaire_likert_scales_repo_fail():
+def test_retrieve_questionnaire_not_found():
     questionnaires_repo = MagicMock()
-    questions_repo = MagicMock()
-    likert_scales_repo = MagicMock()
-    likert_scale_options_repo = MagicMock()
-    logger = MagicMock()
-
-    mock_questionnaire = MagicMock()
-    mock_questions = MagicMock()
-    questionnaires_repo.get_questionnaire_by_id.return_value = (
-        mock_questionnaire
-    )
-    questions_repo.get_questions_by_questionnaire_id.return_value = (
-        mock_questions
-    )
-
-    likert_scales_repo.get_likert_scale_by_questionnaire_id.side_effect = (
-        RuntimeError("DB error")
-    )
-    result = q_services.retrieve_questionnaire(
-        "q_123",
-        questionnaires_repo,
-        questions_repo,
-        likert_scales_repo,
-        likert_scale_options_repo,
-        logger
-    )
-
-    (
-        questionnaires_repo.
-        get_questionnaire_by_id.
-        assert_called_once_with("q_123")
-    )
-    (
-        questions_repo.
-        get_questions_by_questionnaire_id.
-        assert_called_once_with("q_123")
-    )
-    (
-        likert_scales_repo.
-        get_likert_scale_by_questionnaire_id.
-        assert_called_once_with("q_123")
-    )
-
-    logger.error.assert_called_once_with("Database error: DB error")
-
-    assert result[0] is mock_questionnaire
-    assert result[1] is mock_questions
-    assert result[2] is None
-    assert result[3] is None
-
-
-def test_retrieve_questionnaire_likert_scale_options_repo_fail():
-    questionnaires_repo = MagicMock()
-    questions_repo = MagicMock()
-    likert_scales_repo = MagicMock()
-    likert_scale_options_repo = MagicMock()
     logger = MagicMock()
 
-    mock_questionnaire = MagicMock()
-    mock_questions = MagicMock()
-    mock_likert_scale = MagicMock()
-    mock_likert_scale.data = [{"id": "l_s_123"}]
-    questionnaires_repo.get_questionnaire_by_id.return_value = (
-        mock_questionnaire
-    )
-    questions_repo.get_questions_by_questionnaire_id.return_value = (
-        mock_questions
-    )
-    likert_scales_repo.get_likert_scale_by_questionnaire_id.return_value = (
-        mock_likert_scale
-    )
-
-    likert_scale_options_repo.get_options_by_likert_scale_id.side_effect = (
-        RuntimeError("DB error")
+    mock_bundle = MagicMock(data=[])
+    questionnaires_repo.get_questionnaire_bundle_by_id.return_value = (
+        mock_bundle
     )
 
     result = q_services.retrieve_questionnaire(
         "q_123",
         questionnaires_repo,
-        questions_repo,
-        likert_scales_repo,
-        likert_scale_options_repo,
-        logger
-    )
-
-    (
-        questionnaires_repo.
-        get_questionnaire_by_id.
-        assert_called_once_with("q_123")
-    )
-    (
-        questions_repo.
-        get_questions_by_questionnaire_id.
-        assert_called_once_with("q_123")
-    )
-    (
-        likert_scales_repo.
-        get_likert_scale_by_questionnaire_id.
-        assert_called_once_with("q_123")
-    )
-    (
-        likert_scale_options_repo.
-        get_options_by_likert_scale_id.
-        assert_called_once_with("l_s_123")
+        logger,
     )
 
-    logger.error.assert_called_once_with("Database error: DB error")
+    logger.error.assert_not_called()
 
-    assert result[0] is mock_questionnaire
-    assert result[1] is mock_questions
-    assert result[2] is mock_likert_scale
-    assert result[3] is None
+    assert result == [mock_bundle, None, None, None]
 
 
 def test_retrieve_questionnaire_by_response_repo_fail():
     responses_repo = MagicMock()
-    questions_repo = MagicMock()
-    likert_scales_repo = MagicMock()
-    likert_scales_options_repo = MagicMock()
     logger = MagicMock()
 
-    responses_repo.get_response_by_id.side_effect = RuntimeError("DB error")
-
-    result = q_services.retrieve_questionnaire_by_response(
-        "res_123",
-        responses_repo,
-        questions_repo,
-        likert_scales_repo,
-        likert_scales_options_repo,
-        logger
-    )
-
-    responses_repo.get_response_by_id.assert_called_once_with("res_123")
-    logger.error.assert_called_once()
-
-    questions_repo.get_questions_by_questionnaire_id.assert_not_called()
-
-    assert result[0] is None
-    assert result[1] is None
-    assert result[2] is None
-    assert result[3] is None
-
-
-def test_retrieve_questionnaire_by_response_questions_repo_fail():
-    responses_repo = MagicMock()
-    questions_repo = MagicMock()
-    likert_scales_repo = MagicMock()
-    likert_scales_options_repo = MagicMock()
-    logger = MagicMock()
-
-    mock_response = MagicMock()
-    mock_response.data = [
-        {"questionnaires": {"id": "q_123"}}
-    ]
-    responses_repo.get_response_by_id.return_value = mock_response
-
-    questions_repo.get_questions_by_questionnaire_id.side_effect = (
+    responses_repo.get_response_bundle_by_id.side_effect = (
         RuntimeError("DB error")
     )
 
     result = q_services.retrieve_questionnaire_by_response(
         "res_123",
         responses_repo,
-        questions_repo,
-        likert_scales_repo,
-        likert_scales_options_repo,
         logger
     )
 
-    responses_repo.get_response_by_id.assert_called_once_with(
+    responses_repo.get_response_bundle_by_id.assert_called_once_with(
         "res_123"
     )
-    questions_repo.get_questions_by_questionnaire_id.assert_called_once_with(
-        "q_123"
-    )
-    logger.error.assert_called_once_with("Database error: DB error")
-
-    assert result[0] is mock_response
-    assert result[1] is None
-    assert result[2] is None
-    assert result[3] is None
-
-
-def test_retrieve_questionnaire_by_response_likert_scales_repo_fail():
-    responses_repo = MagicMock()
-    questions_repo = MagicMock()
-    likert_scales_repo = MagicMock()
-    likert_scale_options_repo = MagicMock()
-    logger = MagicMock()
-
-    mock_response = MagicMock()
-    mock_response.data = [
-        {"questionnaires": {"id": "q_123"}}
-    ]
-    mock_questions = MagicMock()
-    responses_repo.get_response_by_id.return_value = mock_response
-    questions_repo.get_questions_by_questionnaire_id.return_value = (
-        mock_questions
-    )
-
-    likert_scales_repo.get_likert_scale_by_questionnaire_id.side_effect = (
-        RuntimeError("DB error")
-    )
-
-    result = q_services.retrieve_questionnaire_by_response(
-        "res_123",
-        responses_repo,
-        questions_repo,
-        likert_scales_repo,
-        likert_scale_options_repo,
-        logger
-    )
-
-    (
-        responses_repo.
-        get_response_by_id.
-        assert_called_once_with("res_123")
-    )
-    (
-        questions_repo.
-        get_questions_by_questionnaire_id.
-        assert_called_once_with("q_123")
-    )
-    (
-        likert_scales_repo.
-        get_likert_scale_by_questionnaire_id.
-        assert_called_once_with("q_123")
-    )
-    logger.error.assert_called_once_with("Database error: DB error")
-
-    assert result[0] is mock_response
-    assert result[1] is mock_questions
-    assert result[2] is None
-    assert result[3] is None
-
-
-def test_retrieve_questionnaire_by_response_likert_scale_options_repo_fail():
-    responses_repo = MagicMock()
-    questions_repo = MagicMock()
-    likert_scales_repo = MagicMock()
-    likert_scale_options_repo = MagicMock()
-    logger = MagicMock()
-
-    mock_response = MagicMock()
-    mock_response.data = [
-        {"questionnaires": {"id": "q_123"}}
-    ]
-    mock_questions = MagicMock()
-    mock_likert_scale = MagicMock()
-    mock_likert_scale.data = [
-        {"id": "l_s_123"}
-    ]
-    responses_repo.get_response_by_id.return_value = mock_response
-    questions_repo.get_questions_by_questionnaire_id.return_value = (
-        mock_questions
-    )
-    likert_scales_repo.get_likert_scale_by_questionnaire_id.return_value = (
-        mock_likert_scale
-    )
-
-    likert_scale_options_repo.get_options_by_likert_scale_id.side_effect = (
-        RuntimeError("DB error")
-    )
-
-    result = q_services.retrieve_questionnaire_by_response(
-        "res_123",
-        responses_repo,
-        questions_repo,
-        likert_scales_repo,
-        likert_scale_options_repo,
-        logger
-    )
-
-    (
-        responses_repo.
-        get_response_by_id.
-        assert_called_once_with("res_123"))
-    (
-        questions_repo.
-        get_questions_by_questionnaire_id.
-        assert_called_once_with("q_123")
-    )
-    (
-        likert_scales_repo.
-        get_likert_scale_by_questionnaire_id.
-        assert_called_once_with("q_123")
-    )
-    (
-        likert_scale_options_repo.
-        get_options_by_likert_scale_id.
-        assert_called_once_with("l_s_123")
-    )
-
-    logger.error.assert_called_once_with("Database error: DB error")
+    logger.error.assert_called_once()
 
-    assert result[0] is mock_response
-    assert result[1] is mock_questions
-    assert result[2] is mock_likert_scale
-    assert result[3] is None
+    assert result == [None, None, None, None]
 
 
 def test_submit_questionnaire_likert_scale_repo_fail():
@@ -1,6 +1,7 @@
 import pytest
 from unittest.mock import MagicMock
 from database.questionnaires import Questionnaires
+from utils.questionnaire_cache import questionnaire_content_cache
 
 
 class MockSupabaseResponse:
@@ -11,6 +12,8 @@ class MockSupabaseResponse:
 
 @pytest.fixture
 def supabase_client():
+    questionnaire_content_cache.clear()
+
     client = MagicMock()
 
     query = MagicMock()
@@ -102,6 +105,46 @@ def test_get_questionnaire_by_id(supabase_client):
     assert result.data == expected_data
 
 
+def test_get_questionnaire_bundle_by_id(supabase_client):
+    expected_data = [
+        {
+            "id": "q_123",
+            "title": "q_title",
+            "details": "q_desc",
+            "created_at": "2026-01-05 23:23:34.773619+00",
+            "questions": [
+                {
+                    "id": "qst_1",
+                    "question_text": "q_text",
+                    "category": "Perceived Usefulness",
+                    "position": 1
+                }
+            ],
+            "likert_scales": [
+                {
+                    "id": "l_s_1",
+                    "likert_scale_options": [
+                        {"id": "lso_1", "value": 1, "label": "Disagree"}
+                    ]
+                }
+            ]
+        }
+    ]
+
+    supabase_client.table.return_value.select.return_value \
+        .eq.return_value \
+        .order.return_value \
+        .order.return_value \
+        .execute.return_value = MockSupabaseResponse(data=expected_data)
+
+    questionnaires = Questionnaires(supabase_client)
+
+    result = questionnaires.get_questionnaire_bundle_by_id("q_123")
+
+    supabase_client.table.assert_called_once_with("questionnaires")
+    assert result.data == expected_data
+
+
 def test_get_questionnaires_without_user_response(supabase_client):
     expected_data = [
         {
@@ -216,6 +259,23 @@ def test_get_questionnaire_by_id_raises_runtime_error(supabase_client):
     assert "Failed to retrieve questionnaire" in str(exc.value)
 
 
+def test_get_questionnaire_bundle_by_id_raises_runtime_error(
+    supabase_client
+):
+    supabase_client.table.return_value.select.return_value \
+        .eq.return_value \
+        .order.return_value \
+        .order.return_value \
+        .execute.side_effect = Exception("DB down")
+
+    questionnaires = Questionnaires(supabase_client)
+
+    with pytest.raises(RuntimeError) as exc:
+        questionnaires.get_questionnaire_bundle_by_id("q-123")
+
+    assert "Failed to retrieve questionnaire" in str(exc.value)
+
+
 def test_get_questionnaires_without_user_response_raises_runtime_error(
     supabase_client
 ):
@@ -253,3 +313,35 @@ def test_delete_questionnaire_raises_runtime_error(supabase_client):
         questionnaires.delete_questionnaire_by_id("q-123")
 
     assert "Failed to delete questionnaire" in str(exc.value)
+
+
+def test_get_questionnaire_by_id_is_cached(supabase_client):
+    expected_data = [{"id": "q_123", "title": "q_title"}]
+
+    supabase_client.table.return_value.select.return_value \
+        .eq.return_value \
+        .execute.return_value = MockSupabaseResponse(data=expected_data)
+
+    questionnaires = Questionnaires(supabase_client)
+
+    first_result = questionnaires.get_questionnaire_by_id("q_123")
+    second_result = questionnaires.get_questionnaire_by_id("q_123")
+
+    supabase_client.table.assert_called_once_with("questionnaires")
+    assert second_result.data == first_result.data
+
+
+def test_delete_questionnaire_by_id_invalidates_cache(supabase_client):
+    supabase_client.table.return_value.select.return_value \
+        .eq.return_value \
+        .execute.return_value = MockSupabaseResponse(data=[{"id": "q_123"}])
+    supabase_client.table.return_value.delete.return_value \
+        .eq.return_value \
+        .execute.return_value = MockSupabaseResponse(data=[])
+
+    questionnaires = Questionnaires(supabase_client)
+
+    questionnaires.get_questionnaire_by_id("q_123")
+    questionnaires.delete_questionnaire_by_id("q_123")
+
+    assert questionnaire_content_cache.get("q_123", "questionnaire") is None
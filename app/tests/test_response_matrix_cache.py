@@ -0,0 +1,228 @@
+import os
+import stat
+import numpy as np
+import pytest
+from utils.app_storage import private_directory
+from utils.response_matrix_cache import (
+    CachedResponseMatrix,
+    ResponseMatrixDiskCache,
+    refresh_response_matrix
+)
+from utils.scoring_engine import (
+    ResponseMatrix,
+    merge_response_matrices,
+    response_matrix_from_values
+)
+
+
+def mock_response_matrix():
+    return ResponseMatrix(
+        ["res_1", "res_2"],
+        ["qst_1", "qst_2"],
+        ["Perceived Usefulness"],
+        np.array([[5, 1], [4, 2]], dtype=np.int8),
+        np.array([0, 0], dtype=np.int32),
+        np.array([False, True]),
+        np.array([False, False]),
+        ["Question 1", "Question 2"]
+    )
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseMatrixDiskCache(str(tmp_path / "response_matrices"))
+
+
+def test_private_directory_is_created_for_the_user_only(tmp_path):
+    path = private_directory(str(tmp_path / "storage"))
+
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o700
+
+
+def test_private_directory_rejects_a_shared_directory(tmp_path):
+    path = tmp_path / "storage"
+    path.mkdir()
+    path.chmod(0o755)
+
+    with pytest.raises(OSError):
+        private_directory(str(path))
+
+
+def test_private_directory_rejects_a_symlink(tmp_path):
+    target = tmp_path / "target"
+    target.mkdir(mode=0o700)
+    (tmp_path / "storage").symlink_to(target)
+
+    with pytest.raises(OSError):
+        private_directory(str(tmp_path / "storage"))
+
+
+def test_set_and_get_response_matrix(cache):
+    cache.set("q_123", (2, "2025-12-15"), mock_response_matrix(), "synced")
+
+    matrix = cache.get("q_123", (2, "2025-12-15"))
+    latest = cache.get_latest("q_123")
+
+    assert stat.S_IMODE(os.stat(cache.directory).st_mode) == 0o700
+    assert matrix.response_ids == ["res_1", "res_2"]
+    np.testing.assert_array_equal(matrix.values, [[5, 1], [4, 2]])
+    assert latest.watermark == (2, "2025-12-15")
+    assert latest.synced_at == "synced"
+    assert cache.get("q_123", (3, "2025-12-16")) is None
+
+
+def test_shared_directory_is_not_used(cache):
+    cache.set("q_123", (2, "2025-12-15"), mock_response_matrix())
+    os.chmod(cache.directory, 0o755)
+
+    assert cache.get("q_123", (2, "2025-12-15")) is None
+    assert cache.get_latest("q_123") is None
+
+
+def test_set_deletes_the_older_watermarks(cache):
+    cache.set("q_123", (2, "2025-12-15"), mock_response_matrix())
+    cache.set("q_123", (3, "2025-12-16"), mock_response_matrix())
+
+    assert cache.get("q_123", (2, "2025-12-15")) is None
+    assert cache.get("q_123", (3, "2025-12-16")) is not None
+
+
+def test_least_recently_used_matrices_get_evicted(cache):
+    cache.set("q_1", (2, "2025-12-15"), mock_response_matrix())
+    cache.set("q_2", (2, "2025-12-15"), mock_response_matrix())
+    entry_bytes = sum(
+        file.stat().st_size
+        for file in os.scandir(
+            cache._entry_path("q_1", (2, "2025-12-15"))
+        )
+    )
+    # q_1 has been used last
+    os.utime(
+        os.path.join(
+            cache._entry_path("q_2", (2, "2025-12-15")),
+            "metadata.json"
+        ),
+        (0, 0)
+    )
+    cache.get("q_1", (2, "2025-12-15"))
+
+    cache.max_bytes = entry_bytes * 2
+    cache.set("q_3", (2, "2025-12-15"), mock_response_matrix())
+
+    assert cache.get("q_1", (2, "2025-12-15")) is not None
+    assert cache.get("q_2", (2, "2025-12-15")) is None
+    assert cache.get("q_3", (2, "2025-12-15")) is not None
+
+
+def test_invalidate_response_matrices(cache):
+    cache.set("q_1", (2, "2025-12-15"), mock_response_matrix())
+    cache.set("q_2", (2, "2025-12-15"), mock_response_matrix())
+
+    cache.invalidate("q_1")
+
+    assert cache.get_latest("q_1") is None
+    assert cache.get_latest("q_2") is not None
+
+
+def mock_answer_values(response_ids, values, deleted_response_ids=()):
+    return {
+        "questions": [
+            {
+                "id": "qst_1",
+                "category": "Perceived Usefulness",
+                "is_negative": False,
+                "question_text": "Question 1"
+            },
+            {
+                "id": "qst_2",
+                "category": "Perceived Usefulness",
+                "is_negative": True,
+                "question_text": "Question 2"
+            }
+        ],
+        "response_ids": list(response_ids),
+        "answers": {
+            "responses": [i for i in range(len(values)) for _ in range(2)],
+            "questions": [0, 1] * len(values),
+            "values": [value for row in values for value in row]
+        },
+        "synced_at": "2025-12-16 10:00:00+00",
+        "deleted_response_ids": list(deleted_response_ids)
+    }
+
+
+def cached_response_matrix():
+    return CachedResponseMatrix(
+        (2, "2025-12-15"),
+        "2025-12-15 10:00:00+00",
+        mock_response_matrix()
+    )
+
+
+def test_merge_response_matrices():
+    update = response_matrix_from_values(
+        mock_answer_values(["res_2", "res_3"], [[3, 3], [2, 4]])
+    )
+
+    merged = merge_response_matrices(mock_response_matrix(), update, [])
+
+    # res_2 is already in the matrix, so its update gets skipped
+    assert merged.response_ids == ["res_1", "res_2", "res_3"]
+    np.testing.assert_array_equal(merged.values, [[5, 1], [4, 2], [2, 4]])
+
+
+def test_merge_response_matrices_with_deleted_responses():
+    update = response_matrix_from_values(
+        mock_answer_values(["res_3"], [[2, 4]])
+    )
+
+    merged = merge_response_matrices(
+        mock_response_matrix(),
+        update,
+        ["res_1"]
+    )
+
+    assert merged.response_ids == ["res_2", "res_3"]
+    np.testing.assert_array_equal(merged.values, [[4, 2], [2, 4]])
+
+
+def test_merge_response_matrices_of_other_questions():
+    update = response_matrix_from_values(
+        mock_answer_values(["res_3"], [[2, 4]])
+    )
+    update.question_ids = ["qst_1", "qst_3"]
+
+    assert merge_response_matrices(
+        mock_response_matrix(),
+        update,
+        []
+    ) is None
+
+
+def test_refresh_response_matrix_merges_into_the_cached_one():
+    matrix = refresh_response_matrix(
+        mock_answer_values(["res_3"], [[2, 4]], ["res_1"]),
+        (2, "2025-12-16"),
+        cached_response_matrix()
+    )
+
+    assert matrix.response_ids == ["res_2", "res_3"]
+
+
+def test_refresh_response_matrix_count_mismatch():
+    # a response has been deleted without being reported,
+    # so the merged responses do not add up to the watermark's count
+    assert refresh_response_matrix(
+        mock_answer_values(["res_3"], [[2, 4]]),
+        (2, "2025-12-16"),
+        cached_response_matrix()
+    ) is None
+
+
+def test_refresh_response_matrix_without_cached_one():
+    matrix = refresh_response_matrix(
+        mock_answer_values(["res_3"], [[2, 4]]),
+        (1, "2025-12-16")
+    )
+
+    assert matrix.response_ids == ["res_3"]
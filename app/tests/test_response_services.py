@@ -72,48 +72,81 @@ def test_retrieve_response_info():
     assert result == [response_data, answers_data]
 
 
-def test_submit_response():
+def test_retrieve_submitted_responses_page():
+    responses_repo = MagicMock()
+    logger = MagicMock()
 
-    with (
-        patch(
-            "services.response_services.st"
-        ) as mock_st,
-        patch(
-            "services.response_services.responses_repo"
-        ) as mock_responses_repo,
-        patch(
-            "services.response_services.answers_repo"
-        ) as mock_answers_repo
-    ):
+    responses_repo.get_submitted_responses_page.return_value = MagicMock(
+        data=[
+            {"id": "res_3", "submitted_at": "2026-01-03 10:00:00+00"},
+            {"id": "res_2", "submitted_at": "2026-01-02 10:00:00+00"},
+            {"id": "res_1", "submitted_at": "2026-01-01 10:00:00+00"},
+        ]
+    )
 
-        mock_st.session_state = {
-            "user_id": "u1",
-            "q1_answer": "Agree",
-            "q2_answer": "Disagree"
-        }
-        mock_st.error = MagicMock()
+    result = r_services.retrieve_submitted_responses_page(
+        2,
+        None,
+        responses_repo,
+        logger,
+        questionnaire_id="q_123"
+    )
 
-        mock_responses_repo.get_responses_by_questionnaire_id.return_value = (
-            MagicMock(
-                data=[{"id": "r1"}]
-            )
-        )
+    responses_repo.get_submitted_responses_page.assert_called_once_with(
+        3,
+        None,
+        "q_123",
+        None,
+        None,
+        None
+    )
+    logger.error.assert_not_called()
 
-        mock_answers_repo.update_answers.return_value = "answers_updated"
-        mock_responses_repo.update_response_on_submitted.return_value = (
-            "response_submitted"
-        )
+    assert [response["id"] for response in result[0]] == ["res_3", "res_2"]
+    assert result[1] == {
+        "submitted_at": "2026-01-02 10:00:00+00",
+        "id": "res_2"
+    }
 
-        result = r_services.submit_response(
-            "u1",
-            "q123",
-            get_submitted=True,
-            questions=mock_questions(),
-            likert_scale_options=mock_likert_scale_options()
-        )
 
-        mock_responses_repo.update_response_on_submitted.assert_called_once()
-        assert result == ["response_submitted", "answers_updated"]
+def test_retrieve_submitted_responses_last_page():
+    responses_repo = MagicMock()
+    logger = MagicMock()
+
+    responses_repo.get_submitted_responses_page.return_value = MagicMock(
+        data=[{"id": "res_1", "submitted_at": "2026-01-01 10:00:00+00"}]
+    )
+
+    result = r_services.retrieve_submitted_responses_page(
+        2,
+        {"submitted_at": "2026-01-02 10:00:00+00", "id": "res_2"},
+        responses_repo,
+        logger
+    )
+
+    assert result == [
+        [{"id": "res_1", "submitted_at": "2026-01-01 10:00:00+00"}],
+        None
+    ]
+
+
+def test_retrieve_submitted_responses_page_repo_fail():
+    responses_repo = MagicMock()
+    logger = MagicMock()
+
+    responses_repo.get_submitted_responses_page.side_effect = (
+        RuntimeError("DB error")
+    )
+
+    result = r_services.retrieve_submitted_responses_page(
+        2,
+        None,
+        responses_repo,
+        logger
+    )
+
+    logger.error.assert_called_once()
+    assert result == [None, None]
 
 
 def test_retrieve_response_info_response_repo_fail():
@@ -167,6 +200,8 @@ def test_retrieve_response_info_answers_repo_fail():
 
 def test_submit_response_not_all_answered():
 
+    mock_responses_repo = MagicMock()
+
     with patch("services.response_services.st") as mock_st:
         mock_st.session_state = {
             "q1_answer": "Agree",
@@ -176,42 +211,31 @@ def test_submit_response_not_all_answered():
         mock_st.error = MagicMock()
 
         result = r_services.submit_response(
-            user_id="u1",
+            response_id="r1",
             questionnaire_id="q123",
             get_submitted=True,
             questions=mock_questions(),
-            likert_scale_options=mock_likert_scale_options()
+            likert_scale_options=mock_likert_scale_options(),
+            responses_repo=mock_responses_repo
         )
 
         mock_st.error.assert_called_once_with(
             "Please answer all of the questions before submitting"
         )
+        mock_responses_repo.submit_response.assert_not_called()
 
         assert result is None
 
 
-def test_submit_response_create_new_response():
-    mock_questions = MagicMock()
-    mock_questions.data = [
-        {"id": "q1"},
-        {"id": "q2"}
-    ]
-    mock_likert_scale_options = MagicMock()
-    mock_likert_scale_options.data = [
-        {"id": "opt1", "label": "Agree"},
-        {"id": "opt2", "label": "Disagree"}
-    ]
+def test_submit_response():
+
+    mock_responses_repo = MagicMock()
 
     with (
+        patch("services.response_services.st") as mock_st,
         patch(
-            "services.response_services.st"
-        ) as mock_st,
-        patch(
-            "services.response_services.responses_repo"
-        ) as mock_responses_repo,
-        patch(
-            "services.response_services.answers_repo"
-        ) as mock_answers_repo
+            "services.response_services.results_snapshots"
+        ) as mock_snapshots
     ):
 
         mock_st.session_state = {
@@ -221,42 +245,86 @@ def test_submit_response_create_new_response():
         }
         mock_st.error = MagicMock()
 
-        mock_responses_repo.get_responses_by_questionnaire_id.return_value = (
-            MagicMock(data=[])
+        submission = MagicMock(data=[{"id": "r1", "is_submitted": True}])
+        mock_responses_repo.submit_response.return_value = submission
+
+        result = r_services.submit_response(
+            "r1",
+            "q123",
+            get_submitted=True,
+            questions=mock_questions(),
+            likert_scale_options=mock_likert_scale_options(),
+            responses_repo=mock_responses_repo
+        )
+
+        mock_responses_repo.submit_response.assert_called_once_with(
+            "r1",
+            "q123",
+            [
+                {"question_id": "q1", "selected_option": "opt1"},
+                {"question_id": "q2", "selected_option": "opt2"}
+            ],
+            True
         )
+        mock_st.error.assert_not_called()
+        mock_snapshots.invalidate.assert_called_once_with("q123")
+        assert result is submission
 
-        response_insert = MagicMock()
-        response_insert.data = [{"id": "r1"}]
-        mock_responses_repo.create_response.return_value = response_insert
 
-        mock_answers_repo.create_answers.return_value = "answers_inserted"
+def test_submit_response_save_partial_draft():
+
+    mock_responses_repo = MagicMock()
+
+    with (
+        patch("services.response_services.st") as mock_st,
+        patch(
+            "services.response_services.results_snapshots"
+        ) as mock_snapshots
+    ):
+
+        mock_st.session_state = {
+            "user_id": "u1",
+            "q1_answer": "Agree",
+            "q2_answer": None
+        }
+        mock_st.error = MagicMock()
+
+        submission = MagicMock(data=[{"id": "r1", "is_submitted": False}])
+        mock_responses_repo.submit_response.return_value = submission
 
         result = r_services.submit_response(
-            "u1",
+            "r1",
             "q123",
             get_submitted=False,
             questions=mock_questions(),
-            likert_scale_options=mock_likert_scale_options()
+            likert_scale_options=mock_likert_scale_options(),
+            responses_repo=mock_responses_repo
         )
 
-        mock_responses_repo.create_response.assert_called_once()
-        mock_answers_repo.create_answers.assert_called_once()
+        mock_responses_repo.submit_response.assert_called_once_with(
+            "r1",
+            "q123",
+            [
+                {"question_id": "q1", "selected_option": "opt1"},
+                {"question_id": "q2", "selected_option": None}
+            ],
+            False
+        )
+        mock_snapshots.invalidate.assert_not_called()
+        assert result is submission
 
-        assert result == [response_insert, "answers_inserted"]
 
+def test_submit_response_repo_fail():
 
-def test_submit_response_update_draft():
+    mock_responses_repo = MagicMock()
 
     with (
         patch(
             "services.response_services.st"
         ) as mock_st,
         patch(
-            "services.response_services.responses_repo"
-        ) as mock_responses_repo,
-        patch(
-            "services.response_services.answers_repo"
-        ) as mock_answers_repo
+            "services.response_services.logger"
+        ) as mock_logger
     ):
 
         mock_st.session_state = {
@@ -266,22 +334,76 @@ def test_submit_response_update_draft():
         }
         mock_st.error = MagicMock()
 
-        # Existing draft
-        mock_responses_repo.get_responses_by_questionnaire_id.return_value = (
-            MagicMock(
-                data=[{"id": "r1"}]
-            )
+        mock_responses_repo.submit_response.side_effect = (
+            RuntimeError("DB failure")
         )
 
-        mock_answers_repo.update_answers.return_value = "answers_updated"
-
         result = r_services.submit_response(
-            "u1",
+            "r1",
             "q123",
-            get_submitted=False,
+            get_submitted=True,
             questions=mock_questions(),
-            likert_scale_options=mock_likert_scale_options()
+            likert_scale_options=mock_likert_scale_options(),
+            responses_repo=mock_responses_repo
+        )
+
+        mock_logger.error.assert_called_once()
+        mock_st.error.assert_called_once_with(
+            "Error during response's submission. Please, try again later."
         )
+        assert result is None
+
 
-        mock_answers_repo.update_answers.assert_called_once()
-        assert result[1] == "answers_updated"
+def test_retrieve_results_watermark():
+    responses_repo = MagicMock()
+    logger = MagicMock()
+
+    responses_repo.get_submitted_watermark.return_value = MagicMock(
+        data=[{"submitted_at": "2025-05-01T10:00:00+00:00"}],
+        count=12
+    )
+
+    result = r_services.retrieve_results_watermark(
+        "q_123",
+        responses_repo,
+        logger
+    )
+
+    responses_repo.get_submitted_watermark.assert_called_once_with("q_123")
+    assert result == (12, "2025-05-01T10:00:00+00:00")
+
+
+def test_retrieve_results_watermark_without_responses():
+    responses_repo = MagicMock()
+    logger = MagicMock()
+
+    responses_repo.get_submitted_watermark.return_value = MagicMock(
+        data=[],
+        count=0
+    )
+
+    result = r_services.retrieve_results_watermark(
+        "q_123",
+        responses_repo,
+        logger
+    )
+
+    assert result == (0, None)
+
+
+def test_retrieve_results_watermark_repo_fail():
+    responses_repo = MagicMock()
+    logger = MagicMock()
+
+    responses_repo.get_submitted_watermark.side_effect = (
+        RuntimeError("DB failure")
+    )
+
+    result = r_services.retrieve_results_watermark(
+        "q_123",
+        responses_repo,
+        logger
+    )
+
+    logger.error.assert_called_once()
+    assert result is None
@@ -26,38 +26,65 @@ def supabase_client():
     return client
 
 
-def test_get_all_responses(supabase_client):
+def test_get_submitted_responses_page(supabase_client):
     expected_data = [
         {
             "questionnaires": {
                 "id": "q_123",
                 "title": "q_title",
-                "details": "q_details",
                 "created_at": "2026-01-16 12:06:11.061732+00",
-                "created_by": "admin_123"
-            },
-            "profiles": {
-                "full_name": "user_name"
             },
+            "profiles": {"full_name": "user_name"},
             "id": "res_123",
             "submitted_at": "2026-01-07 18:24:39.412808+00",
             "is_submitted": True
         }
     ]
 
-    supabase_client.table.return_value \
-        .select.return_value \
-        .eq.return_value \
-        .order.return_value \
-        .execute.return_value = MockSupabaseResponse(data=expected_data)
+    query = supabase_client.table.return_value.select.return_value
+    query.gte.return_value = query
+    query.lt.return_value = query
+    query.or_.return_value = query
+    query.limit.return_value.execute.return_value = (
+        MockSupabaseResponse(data=expected_data)
+    )
 
     responses = Responses(supabase_client)
 
-    result = responses.get_all_responses()
+    result = responses.get_submitted_responses_page(
+        21,
+        {"submitted_at": "2026-01-08 10:00:00+00", "id": "res_456"},
+        questionnaire_id="q_123",
+        user_id="user_123",
+        submitted_from="2026-01-01",
+        submitted_to="2026-02-01"
+    )
 
+    query.eq.assert_any_call("is_submitted", True)
+    query.eq.assert_any_call("questionnaire_id", "q_123")
+    query.eq.assert_any_call("user_id", "user_123")
+    query.gte.assert_called_once_with("submitted_at", "2026-01-01")
+    query.lt.assert_called_once_with("submitted_at", "2026-02-01")
+    query.or_.assert_called_once()
+    query.limit.assert_called_once_with(21)
     assert result.data == expected_data
 
 
+def test_get_submitted_responses_page_without_cursor(supabase_client):
+    query = supabase_client.table.return_value.select.return_value
+    query.limit.return_value.execute.return_value = (
+        MockSupabaseResponse(data=[])
+    )
+
+    responses = Responses(supabase_client)
+
+    result = responses.get_submitted_responses_page(21)
+
+    query.eq.assert_called_once_with("is_submitted", True)
+    query.or_.assert_not_called()
+    assert result.data == []
+
+
 def test_get_all_responses_by_questionnaire_id(supabase_client):
     expected_data = [
         {
@@ -118,6 +145,38 @@ def test_get_response_by_id(supabase_client):
     assert result.data == expected_data
 
 
+def test_get_response_bundle_by_id(supabase_client):
+    expected_data = [
+        {
+            "profiles": {
+                "full_name": "user_name"
+            },
+            "submitted_at": "2026-01-07 18:24:39.412808+00",
+            "questionnaires": {
+                "id": "q_123",
+                "title": "q_title",
+                "details": "q_details",
+                "created_at": "2026-01-16 12:06:11.061732+00",
+                "questions": [],
+                "likert_scales": []
+            },
+        }
+    ]
+
+    supabase_client.table.return_value \
+        .select.return_value \
+        .eq.return_value \
+        .order.return_value \
+        .order.return_value \
+        .execute.return_value = MockSupabaseResponse(data=expected_data)
+
+    responses = Responses(supabase_client)
+
+    result = responses.get_response_bundle_by_id("res_123")
+
+    assert result.data == expected_data
+
+
 def test_get_response_by_user_id(supabase_client):
 
     expected_data = [
@@ -158,7 +217,6 @@ def test_get_responses_by_questionnaire_id_with_is_submitted_none(
         .select.return_value \
         .eq.return_value \
         .eq.return_value \
-        .eq.return_value \
         .execute.return_value = MockSupabaseResponse(data=expected_data)
 
     responses = Responses(supabase_client)
@@ -180,6 +238,7 @@ def test_get_responses_by_questionnaire_id_with_is_submitted(supabase_client):
         .select.return_value \
         .eq.return_value \
         .eq.return_value \
+        .eq.return_value \
         .execute.return_value = MockSupabaseResponse(data=expected_data)
 
     responses = Responses(supabase_client)
@@ -193,35 +252,33 @@ def test_get_responses_by_questionnaire_id_with_is_submitted(supabase_client):
     assert result.data == expected_data
 
 
-def test_get_response_by_questionnaire_title(supabase_client):
-    expected_data = [{"id": "res_123"}]
+def test_get_submitted_watermark(supabase_client):
+    expected_data = [{"submitted_at": "2025-05-01T10:00:00+00:00"}]
 
     supabase_client.table.return_value \
         .select.return_value \
         .eq.return_value \
+        .eq.return_value \
         .order.return_value \
+        .limit.return_value \
         .execute.return_value = MockSupabaseResponse(data=expected_data)
 
     responses = Responses(supabase_client)
 
-    result = responses.get_responses_by_questionnaire_title("q_title")
+    result = responses.get_submitted_watermark("q_123")
 
+    supabase_client.table.return_value \
+        .select.assert_called_once_with("submitted_at", count="exact")
     assert result.data == expected_data
 
 
 def test_get_all_responses_category_means(supabase_client):
 
-    expected_data = [
-        {
-            "answers": {
-                "response_id": "res_123"
-            },
-            "questions": {
-                "category": "Perceived Usedfulness"
-            },
-            "mean_score": 4.5
-        }
-    ]
+    expected_data = {
+        "categories": ["Attitude", "Perceived Usefulness"],
+        "response_ids": ["res_123", "res_456"],
+        "means": [[4.5, 3.0], [2.0, None]]
+    }
 
     supabase_client.rpc.return_value.execute.return_value = (
         MockSupabaseResponse(data=expected_data)
@@ -230,6 +287,10 @@ def test_get_all_responses_category_means(supabase_client):
 
     result = responses.get_all_responses_category_means("q_123")
 
+    supabase_client.rpc.assert_called_once_with(
+        "get_response_category_means",
+        {"q_id_param": "q_123"}
+    )
     assert result.data == expected_data
 
 
@@ -238,7 +299,7 @@ def test_create_response(supabase_client):
         {
             "user_id": "user_123",
             "questionnaire_id": "q_123",
-            "is_submitted": True
+            "is_submitted": False
         }
     ]
 
@@ -248,23 +309,36 @@ def test_create_response(supabase_client):
 
     responses = Responses(supabase_client)
 
-    result = responses.create_response("user_123", "q_123", True)
+    result = responses.create_response("user_123", "q_123")
 
+    supabase_client.table.return_value.insert.assert_called_once_with({
+        "user_id": "user_123",
+        "questionnaire_id": "q_123"
+    })
     assert result.data == inserted_data
 
 
-def test_update_response_on_submitted(supabase_client):
-    updated_data = [{"is_submitted": True}]
+def test_submit_response(supabase_client):
+    submitted_data = [{"id": "res_123", "is_submitted": True}]
+    answers = [{"question_id": "q_1", "selected_option": "l_s_o_1"}]
 
-    supabase_client.table.return_value \
-        .update.return_value \
-        .execute.return_value = MockSupabaseResponse(data=updated_data)
+    supabase_client.rpc.return_value \
+        .execute.return_value = MockSupabaseResponse(data=submitted_data)
 
     responses = Responses(supabase_client)
 
-    result = responses.update_response_on_submitted("user_123", True)
+    result = responses.submit_response("res_123", "q_123", answers, True)
 
-    assert result.data == updated_data
+    supabase_client.rpc.assert_called_once_with(
+        "submit_response",
+        {
+            "response_id_param": "res_123",
+            "questionnaire_id_param": "q_123",
+            "answers_param": answers,
+            "is_submitted_param": True
+        }
+    )
+    assert result.data == submitted_data
 
 
 def test_delete_response_by_id(supabase_client):
@@ -281,17 +355,19 @@ def test_delete_response_by_id(supabase_client):
     assert result.data == deleted_data
 
 
-def test_get_all_responses_raise_runtime_error(supabase_client):
+def test_get_submitted_responses_page_raise_runtime_error(supabase_client):
     supabase_client.table.return_value \
         .select.return_value \
         .eq.return_value \
         .order.return_value \
+        .order.return_value \
+        .limit.return_value \
         .execute.side_effect = Exception("DB down")
 
     responses = Responses(supabase_client)
 
     with pytest.raises(RuntimeError) as exc:
-        responses.get_all_responses()
+        responses.get_submitted_responses_page(21)
 
     assert "Failed to retrieve responses" in str(exc.value)
 
@@ -327,6 +403,22 @@ def test_get_response_by_id_raise_runtime_error(supabase_client):
     assert "Failed to retrieve response" in str(exc.value)
 
 
+def test_get_response_bundle_by_id_raise_runtime_error(supabase_client):
+    supabase_client.table.return_value \
+        .select.return_value \
+        .eq.return_value \
+        .order.return_value \
+        .order.return_value \
+        .execute.side_effect = Exception("DB down")
+
+    responses = Responses(supabase_client)
+
+    with pytest.raises(RuntimeError) as exc:
+        responses.get_response_bundle_by_id("res_123")
+
+    assert "Failed to retrieve response" in str(exc.value)
+
+
 def test_get_response_by_user_id_raise_runtime_error(supabase_client):
     supabase_client.table.return_value \
         .select.return_value \
@@ -361,23 +453,21 @@ def test_get_responses_by_questionnaire_id_raise_runtime_error(
     assert "Failed to retrieve the specified draft" in str(exc.value)
 
 
-def test_get_response_by_questionnaire_title_raise_runtime_error(
-    supabase_client
-):
-
+def test_get_submitted_watermark_raise_runtime_error(supabase_client):
     supabase_client.table.return_value \
         .select.return_value \
         .eq.return_value \
         .eq.return_value \
         .order.return_value \
+        .limit.return_value \
         .execute.side_effect = Exception("DB down")
 
     responses = Responses(supabase_client)
 
     with pytest.raises(RuntimeError) as exc:
-        responses.get_responses_by_questionnaire_title("q_title")
+        responses.get_submitted_watermark("q_123")
 
-    assert "Failed to retrieve responses" in str(exc.value)
+    assert "Failed to retrieve the responses' watermark" in str(exc.value)
 
 
 def test_get_all_responses_category_means_raise_runtime_error(supabase_client):
@@ -402,22 +492,21 @@ def test_create_response_raise_runtime_error(supabase_client):
     responses = Responses(supabase_client)
 
     with pytest.raises(RuntimeError) as exc:
-        responses.create_response("user_123", "q_123", True)
+        responses.create_response("user_123", "q_123")
 
     assert "Failed to create response" in str(exc.value)
 
 
-def test_update_response_on_submitted_raise_runtime_error(supabase_client):
-    supabase_client.table.return_value \
-        .update.return_value \
+def test_submit_response_raise_runtime_error(supabase_client):
+    supabase_client.rpc.return_value \
         .execute.side_effect = Exception("DB down")
 
     responses = Responses(supabase_client)
 
     with pytest.raises(RuntimeError) as exc:
-        responses.update_response_on_submitted("user_123", True)
+        responses.submit_response("res_123", "q_123", [], True)
 
-    assert "Failed to update response" in str(exc.value)
+    assert "Failed to submit response" in str(exc.value)
 
 
 def test_delete_response_by_id_raise_runtime_error(supabase_client):
@@ -0,0 +1,44 @@
+from utils.results_cache import QuestionnaireResultsCache
+
+
+def test_get_results_of_the_same_watermark():
+    cache = QuestionnaireResultsCache(max_questionnaires=2)
+    cache.set("q_123", (3, "2025-12-15"), "results")
+
+    assert cache.get("q_123", (3, "2025-12-15")) == "results"
+    assert cache.get("q_123", (4, "2025-12-16")) is None
+    assert cache.get("q_456", (3, "2025-12-15")) is None
+
+
+def test_set_replaces_the_results_of_an_older_watermark():
+    cache = QuestionnaireResultsCache(max_questionnaires=2)
+    cache.set("q_123", (3, "2025-12-15"), "old results")
+    cache.set("q_123", (4, "2025-12-16"), "new results")
+
+    assert cache.get("q_123", (3, "2025-12-15")) is None
+    assert cache.get("q_123", (4, "2025-12-16")) == "new results"
+
+
+def test_least_recently_used_questionnaire_gets_evicted():
+    cache = QuestionnaireResultsCache(max_questionnaires=2)
+    cache.set("q_1", 1, "results 1")
+    cache.set("q_2", 1, "results 2")
+    cache.get("q_1", 1)
+    cache.set("q_3", 1, "results 3")
+
+    assert cache.get("q_1", 1) == "results 1"
+    assert cache.get("q_2", 1) is None
+    assert cache.get("q_3", 1) == "results 3"
+
+
+def test_invalidate_and_clear():
+    cache = QuestionnaireResultsCache()
+    cache.set("q_1", 1, "results 1")
+    cache.set("q_2", 1, "results 2")
+
+    cache.invalidate("q_1")
+    assert cache.get("q_1", 1) is None
+    assert cache.get("q_2", 1) == "results 2"
+
+    cache.clear()
+    assert cache.get("q_2", 1) is None
@@ -0,0 +1,421 @@
+import dataclasses
+import json
+import os
+import stat
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import MagicMock
+from utils import results_snapshots
+from utils.analytics_pool import AnalyticsPool
+from utils.questionnaire_scoring import (
+    compute_questionnaire_results,
+    construct_scores,
+    matrix_label_count_rows
+)
+from utils.response_matrix_cache import ResponseMatrixDiskCache
+from utils.scoring_engine import ResponseMatrix
+
+
+def likert_scale_options():
+    return [
+        {"id": f"lso_{value}", "value": value, "label": str(value)}
+        for value in range(1, 6)
+    ]
+
+
+def mock_response_matrix(n_responses=3):
+    return ResponseMatrix(
+        ["res_1", "res_2", "res_3"][:n_responses],
+        ["qst_1", "qst_2"],
+        ["Perceived Usefulness"],
+        np.array([[5, 4], [3, 3], [1, 2]], dtype=np.int8)[:n_responses],
+        np.array([0, 0], dtype=np.int32),
+        np.array([False, False]),
+        np.array([False, False]),
+        ["Question 1", "Question 2"]
+    )
+
+
+def mock_category_scores():
+    return [
+        {
+            "category": "Perceived Usefulness",
+            "total_score": 18,
+            "count_answers": 6,
+            "count_responses": 3
+        }
+    ]
+
+
+@pytest.fixture
+def matrix_cache(tmp_path):
+    return ResponseMatrixDiskCache(str(tmp_path / "response_matrices"))
+
+
+def test_compute_snapshot_results_reads_the_stored_matrix(matrix_cache):
+    matrix_cache.set("q_123", (3, "2025-12-15"), mock_response_matrix())
+
+    results, complete = results_snapshots.compute_snapshot_results(
+        "Test Questionnaire",
+        [],
+        mock_category_scores(),
+        likert_scale_options(),
+        None,
+        None,
+        (matrix_cache.directory, "q_123", (3, "2025-12-15"))
+    )
+
+    assert complete
+    assert results.count_of_responses == 3
+    assert results.reliability[0].construct == "Perceived Usefulness"
+    assert results.reliability[0].n == 3
+
+
+def test_compute_snapshot_results_without_the_stored_matrix(matrix_cache):
+    results, complete = results_snapshots.compute_snapshot_results(
+        "Test Questionnaire",
+        [],
+        mock_category_scores(),
+        likert_scale_options(),
+        None,
+        None,
+        (matrix_cache.directory, "q_123", (3, "2025-12-15"))
+    )
+
+    assert not complete
+    assert results.reliability == ()
+
+
+def mock_snapshot():
+    rng = np.random.default_rng(0)
+    categories = [
+        "Perceived Usefulness",
+        "Perceived Ease of Use",
+        "Attitude",
+        "Behavioral Intention"
+    ]
+    matrix = ResponseMatrix(
+        [f"res_{i}" for i in range(12)],
+        [f"qst_{i}" for i in range(8)],
+        categories,
+        rng.integers(1, 6, (12, 8)).astype(np.int8),
+        np.repeat(np.arange(4, dtype=np.int32), 2),
+        np.array([False, True] * 4),
+        np.zeros(8, dtype=bool),
+        [f"Question {i}" for i in range(8)]
+    )
+    scores = construct_scores(matrix, likert_scale_options(), categories)
+    category_scores = [
+        {"category": category, "count_responses": 12, **score}
+        for category, score in scores.items()
+    ]
+
+    results = compute_questionnaire_results(
+        "Test Questionnaire",
+        matrix_label_count_rows(matrix, likert_scale_options()),
+        category_scores,
+        likert_scale_options(),
+        None,
+        matrix
+    )
+    return results_snapshots.ResultsSnapshot(
+        (12, "2025-12-15T14:03:34+00:00"),
+        datetime(2025, 12, 15, 14, 5, tzinfo=timezone.utc),
+        results,
+        True
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    return results_snapshots.ResultsSnapshotStore(
+        str(tmp_path / "results_snapshots")
+    )
+
+
+def test_snapshot_is_stored_as_json(store):
+    snapshot = mock_snapshot()
+    store.set("q_123", snapshot)
+
+    with open(os.path.join(store.directory, "q_123.json")) as stored_file:
+        stored = json.load(stored_file)
+
+    assert stored["version"] == results_snapshots.RESULTS_SNAPSHOT_VERSION
+    assert stored["snapshot"]["type"] == "ResultsSnapshot"
+    assert stat.S_IMODE(os.stat(store.directory).st_mode) == 0o700
+
+
+def test_snapshot_round_trip(store):
+    snapshot = mock_snapshot()
+    store.set("q_123", snapshot)
+    # a new store reads the snapshot off the disk
+    loaded = results_snapshots.ResultsSnapshotStore(
+        store.directory
+    ).get_latest("q_123")
+
+    assert loaded.watermark == snapshot.watermark
+    assert loaded.computed_at == snapshot.computed_at
+    assert loaded.complete
+    assert loaded.results.basic_histograms == (
+        snapshot.results.basic_histograms
+    )
+    assert loaded.results.category_totals == (
+        snapshot.results.category_totals
+    )
+
+    matrix, expected_matrix = (
+        loaded.results.spearman_matrix,
+        snapshot.results.spearman_matrix
+    )
+    assert matrix.constructs == expected_matrix.constructs
+    np.testing.assert_array_equal(matrix.r, expected_matrix.r)
+    np.testing.assert_array_equal(matrix.r_low, expected_matrix.r_low)
+
+    for table, expected_table in zip(
+        loaded.results.correlation_tables,
+        snapshot.results.correlation_tables
+    ):
+        assert table.title == expected_table.title
+        pd.testing.assert_frame_equal(table.rows, expected_table.rows)
+
+    for reliability, expected_reliability in zip(
+        loaded.results.reliability,
+        snapshot.results.reliability
+    ):
+        assert reliability.alpha == pytest.approx(expected_reliability.alpha)
+        pd.testing.assert_frame_equal(
+            reliability.items,
+            expected_reliability.items
+        )
+
+
+def test_older_snapshot_does_not_replace_a_newer_one(store):
+    newer = mock_snapshot()
+    older = dataclasses.replace(
+        newer,
+        watermark=(11, "2025-12-15T14:01:00+00:00"),
+        computed_at=datetime(2025, 12, 15, 14, 1, tzinfo=timezone.utc)
+    )
+    store.set("q_123", newer)
+    store.set("q_123", older)
+
+    # another process' store reads the file that has been kept
+    loaded = results_snapshots.ResultsSnapshotStore(
+        store.directory
+    ).get_latest("q_123")
+
+    assert loaded.watermark == newer.watermark
+    assert store.get_latest("q_123").watermark == newer.watermark
+    assert os.listdir(store.directory) == ["q_123.json"]
+
+
+def test_newer_snapshot_replaces_an_older_one(store):
+    older = mock_snapshot()
+    newer = dataclasses.replace(
+        older,
+        watermark=(13, "2025-12-15T14:06:00+00:00"),
+        computed_at=datetime(2025, 12, 15, 14, 7, tzinfo=timezone.utc)
+    )
+    store.set("q_123", older)
+    store.set("q_123", newer)
+
+    assert results_snapshots.ResultsSnapshotStore(
+        store.directory
+    ).get_latest("q_123").watermark == newer.watermark
+
+
+def test_snapshot_of_unknown_type_is_not_loaded(store):
+    store.set("q_123", mock_snapshot())
+    with open(os.path.join(store.directory, "q_123.json"), "w") as file:
+        json.dump(
+            {
+                "version": results_snapshots.RESULTS_SNAPSHOT_VERSION,
+                "snapshot": {"type": "os.system", "fields": {}}
+            },
+            file
+        )
+
+    assert results_snapshots.ResultsSnapshotStore(
+        store.directory
+    ).get_latest("q_123") is None
+
+
+def test_snapshots_in_a_shared_directory_are_not_loaded(store):
+    store.set("q_123", mock_snapshot())
+    os.chmod(store.directory, 0o777)
+
+    assert results_snapshots.ResultsSnapshotStore(
+        store.directory
+    ).get_latest("q_123") is None
+
+
+def test_least_recently_used_snapshots_get_evicted(store):
+    snapshot = mock_snapshot()
+    store.set("q_1", snapshot)
+    store.set("q_2", snapshot)
+    store.get_latest("q_1")
+    os.utime(
+        os.path.join(store.directory, "q_2.json"),
+        ns=(0, os.stat(os.path.join(store.directory, "q_2.json")).st_mtime_ns)
+    )
+
+    store.max_bytes = os.path.getsize(
+        os.path.join(store.directory, "q_1.json")
+    ) * 2
+    store.set("q_3", snapshot)
+
+    assert store.get_latest("q_1") is not None
+    assert store.get_latest("q_2") is None
+    assert store.get_latest("q_3") is not None
+
+
+def test_invalidate_questionnaire_results(store, matrix_cache, monkeypatch):
+    monkeypatch.setattr(results_snapshots, "results_snapshots", store)
+    monkeypatch.setattr(
+        results_snapshots,
+        "response_matrix_cache",
+        matrix_cache
+    )
+    store.set("q_123", mock_snapshot())
+    matrix_cache.set("q_123", (3, "2025-12-15"), mock_response_matrix())
+
+    results_snapshots.invalidate_questionnaire_results("q_123")
+
+    assert store.get_latest("q_123") is None
+    assert matrix_cache.get_latest("q_123") is None
+
+
+def mock_answer_values(response_ids, values):
+    return {
+        "questions": [
+            {
+                "id": "qst_1",
+                "category": "Perceived Usefulness",
+                "is_negative": False,
+                "question_text": "Question 1"
+            },
+            {
+                "id": "qst_2",
+                "category": "Perceived Usefulness",
+                "is_negative": False,
+                "question_text": "Question 2"
+            }
+        ],
+        "response_ids": list(response_ids),
+        "answers": {
+            "responses": [i for i in range(len(values)) for _ in range(2)],
+            "questions": [0, 1] * len(values),
+            "values": [value for row in values for value in row]
+        },
+        "synced_at": "2025-12-16 10:00:00+00",
+        "deleted_response_ids": []
+    }
+
+
+@pytest.fixture
+def snapshot_build(matrix_cache, monkeypatch):
+    monkeypatch.setattr(
+        results_snapshots,
+        "response_matrix_cache",
+        matrix_cache
+    )
+    monkeypatch.setattr(
+        results_snapshots,
+        "analytics_pool",
+        AnalyticsPool(workers=0)
+    )
+
+    repos = MagicMock()
+    repos.likert_scale_options.get_options_by_likert_scale_id.return_value = (
+        MagicMock(data=likert_scale_options())
+    )
+    return repos
+
+
+def gathered_fetches(answer_values):
+    def gather(*fetches, auth_header=None):
+        results = [
+            MagicMock(data=[{"title": "Test Questionnaire"}]),
+            MagicMock(data=[{"id": "l_s_123"}]),
+            MagicMock(data=[]),
+            MagicMock(data=mock_category_scores())
+        ]
+        if len(fetches) > 4:
+            results.append(MagicMock(data=answer_values))
+        return results
+    return gather
+
+
+def test_build_results_snapshot_merges_the_new_responses(
+    snapshot_build,
+    matrix_cache,
+    monkeypatch
+):
+    matrix_cache.set(
+        "q_123",
+        (2, "2025-12-15"),
+        mock_response_matrix(2),
+        "2025-12-15 10:00:00+00"
+    )
+    monkeypatch.setattr(
+        results_snapshots,
+        "gather_fetches",
+        gathered_fetches(mock_answer_values(["res_3"], [[1, 2]]))
+    )
+
+    snapshot = results_snapshots.build_results_snapshot(
+        "q_123",
+        (3, "2025-12-16"),
+        snapshot_build
+    )
+
+    assert snapshot.complete
+    assert snapshot.results.reliability[0].n == 3
+    snapshot_build.answers.get_submitted_answer_values.assert_not_called()
+    assert matrix_cache.get(
+        "q_123",
+        (3, "2025-12-16")
+    ).response_ids == ["res_1", "res_2", "res_3"]
+
+
+def test_build_results_snapshot_refetches_on_a_count_mismatch(
+    snapshot_build,
+    matrix_cache,
+    monkeypatch
+):
+    matrix_cache.set(
+        "q_123",
+        (2, "2025-12-15"),
+        mock_response_matrix(2),
+        "2025-12-15 10:00:00+00"
+    )
+    # res_2 has been deleted without being reported by the
+    # incremental retrieval, so the merged responses are 3 instead of 2
+    monkeypatch.setattr(
+        results_snapshots,
+        "gather_fetches",
+        gathered_fetches(mock_answer_values(["res_3"], [[1, 2]]))
+    )
+    snapshot_build.answers.get_submitted_answer_values.return_value = (
+        MagicMock(data=mock_answer_values(
+            ["res_1", "res_3"],
+            [[5, 4], [1, 2]]
+        ))
+    )
+
+    snapshot = results_snapshots.build_results_snapshot(
+        "q_123",
+        (2, "2025-12-16"),
+        snapshot_build
+    )
+
+    snapshot_build.answers.get_submitted_answer_values.assert_called_once_with(
+        "q_123"
+    )
+    assert snapshot.complete
+    assert matrix_cache.get(
+        "q_123",
+        (2, "2025-12-16")
+    ).response_ids == ["res_1", "res_3"]
@@ -0,0 +1,294 @@
+import numpy as np
+import pytest
+from scipy.stats import spearmanr
+from utils.scoring_engine import (
+    ResponseMatrix,
+    answers_to_arrays,
+    cronbach_reliability,
+    matrix_category_means,
+    matrix_category_totals,
+    matrix_label_counts,
+    matrix_scores,
+    response_matrix_from_answers,
+    response_matrix_from_values,
+    spearman_matrix
+)
+
+
+def mock_answers():
+    questions = {
+        "qst_1": {"category": "Perceived Usefulness", "is_negative": False},
+        "qst_2": {"category": "Perceived Usefulness", "is_negative": True},
+        "qst_3": {"category": "Attitude", "is_negative": False},
+        "qst_4": {"category": "Trust", "is_negative": False}
+    }
+    values = {
+        "res_1": {"qst_1": 5, "qst_2": 1, "qst_3": 4, "qst_4": 2},
+        "res_2": {"qst_1": 3, "qst_2": 2, "qst_3": 2},
+        "res_3": {"qst_1": 1, "qst_2": 5, "qst_3": 1, "qst_4": 5}
+    }
+    return [
+        {
+            "response_id": response_id,
+            "question_id": question_id,
+            "questions": dict(questions[question_id]),
+            "likert_scale_options": {"value": value, "label": str(value)}
+        }
+        for response_id, answers in values.items()
+        for question_id, value in answers.items()
+    ]
+
+
+def test_spearman_matrix_matches_scipy():
+    rng = np.random.default_rng(0)
+    values = np.round(rng.uniform(1, 5, (40, 4)) * 2) / 2
+
+    r, p = spearman_matrix(values)
+    expected = spearmanr(values)
+
+    np.testing.assert_allclose(r, expected.statistic)
+    np.testing.assert_allclose(p, expected.pvalue, atol=1e-12)
+
+
+def test_spearman_matrix_column_with_missing_values():
+    rng = np.random.default_rng(1)
+    values = rng.uniform(1, 5, (20, 3))
+    values[4, 2] = np.nan
+
+    r, p = spearman_matrix(values)
+    expected = spearmanr(values[:, 0], values[:, 1])
+
+    assert r[0, 1] == pytest.approx(expected.statistic)
+    assert p[0, 1] == pytest.approx(expected.pvalue)
+    assert np.isnan(r[0, 2]) and np.isnan(r[2, 1])
+    assert np.isnan(p[2, 0])
+
+
+def naive_cronbach_alpha(items):
+    k = items.shape[1]
+    item_variances = sum(
+        np.var(items[:, i], ddof=1)
+        for i in range(k)
+    )
+    total_variance = np.var(items.sum(axis=1), ddof=1)
+    return k / (k - 1) * (1 - item_variances / total_variance)
+
+
+def test_cronbach_reliability_matches_the_naive_formulas():
+    rng = np.random.default_rng(2)
+    trait = rng.normal(size=(30, 1))
+    items = np.clip(np.round(3 + trait + rng.normal(size=(30, 4))), 1, 5)
+
+    alpha, alpha_if_deleted, item_total, n = cronbach_reliability(items)
+
+    assert n == 30
+    assert alpha == pytest.approx(naive_cronbach_alpha(items))
+    for i in range(4):
+        rest = np.delete(items, i, axis=1)
+        assert alpha_if_deleted[i] == pytest.approx(
+            naive_cronbach_alpha(rest)
+        )
+        assert item_total[i] == pytest.approx(
+            np.corrcoef(items[:, i], rest.sum(axis=1))[0, 1]
+        )
+
+
+def test_cronbach_reliability_leaves_out_incomplete_responses():
+    items = np.array([
+        [5, 4, 5],
+        [3, 3, 2],
+        [1, np.nan, 2],
+        [2, 1, 1],
+        [4, 5, 4]
+    ])
+
+    alpha, _, _, n = cronbach_reliability(items)
+
+    assert n == 4
+    assert alpha == pytest.approx(
+        naive_cronbach_alpha(np.delete(items, 2, axis=0))
+    )
+
+
+def test_cronbach_reliability_of_two_items():
+    items = np.array([[5, 4], [3, 3], [1, 2], [4, 5]])
+
+    alpha, alpha_if_deleted, _, n = cronbach_reliability(items)
+
+    assert alpha == pytest.approx(naive_cronbach_alpha(items))
+    assert np.isnan(alpha_if_deleted).all()
+
+
+def test_cronbach_reliability_without_enough_responses():
+    alpha, alpha_if_deleted, item_total, n = cronbach_reliability(
+        np.array([[5, 4, 3]])
+    )
+
+    assert n == 1
+    assert np.isnan(alpha)
+    assert np.isnan(alpha_if_deleted).all()
+    assert np.isnan(item_total).all()
+
+
+def test_response_matrix_from_answers():
+    matrix = response_matrix_from_answers(mock_answers())
+
+    assert matrix.response_ids == ["res_1", "res_2", "res_3"]
+    assert matrix.question_ids == ["qst_1", "qst_2", "qst_3", "qst_4"]
+    assert matrix.categories == [
+        "Perceived Usefulness",
+        "Attitude",
+        "Trust"
+    ]
+    np.testing.assert_array_equal(
+        matrix.values,
+        [[5, 1, 4, 2], [3, 2, 2, ResponseMatrix.MISSING], [1, 5, 1, 5]]
+    )
+    np.testing.assert_array_equal(matrix.question_categories, [0, 0, 1, 2])
+    np.testing.assert_array_equal(
+        matrix.is_negative,
+        [False, True, False, False]
+    )
+
+
+def test_response_matrix_from_answers_of_some_categories():
+    matrix = response_matrix_from_answers(
+        mock_answers(),
+        ["Attitude", "Perceived Usefulness"]
+    )
+
+    assert matrix.categories == ["Attitude", "Perceived Usefulness"]
+    # the question of another category is left out
+    np.testing.assert_array_equal(matrix.question_categories, [1, 1, 0, -1])
+    np.testing.assert_array_equal(
+        matrix.values[:, 3],
+        [ResponseMatrix.MISSING] * 3
+    )
+
+
+def test_answers_to_arrays_of_unordered_answers():
+    answers = mock_answers()
+    # the answers of a question are not next to each other
+    answers = answers[::-1]
+    arrays = answers_to_arrays(answers, ["Perceived Usefulness", "Trust"])
+
+    assert arrays.response_ids == ["res_3", "res_2", "res_1"]
+    assert arrays.question_ids == ["qst_4", "qst_3", "qst_2", "qst_1"]
+    np.testing.assert_array_equal(arrays.question_rows, [0, 1, 2, 3])
+    # the answers of Attitude are left out
+    np.testing.assert_array_equal(
+        arrays.category_codes,
+        [1, 0, 0, 0, 0, 1, 0, 0]
+    )
+    np.testing.assert_array_equal(
+        arrays.question_codes,
+        [0, 2, 3, 2, 3, 0, 2, 3]
+    )
+    np.testing.assert_array_equal(
+        arrays.is_negative,
+        [False, True, False, True, False, False, True, False]
+    )
+    np.testing.assert_array_equal(arrays.values, [5, 5, 1, 2, 3, 2, 1, 5])
+
+
+def test_matrix_scores_reverse_the_negative_questions():
+    scores = matrix_scores(response_matrix_from_answers(mock_answers()), 5)
+
+    np.testing.assert_array_equal(
+        scores,
+        [[5, 5, 4, 2], [3, 4, 2, np.nan], [1, 1, 1, 5]]
+    )
+
+
+def test_matrix_category_totals():
+    total_scores, count_answers = matrix_category_totals(
+        response_matrix_from_answers(mock_answers()),
+        5
+    )
+
+    np.testing.assert_array_equal(total_scores, [19, 7, 7])
+    np.testing.assert_array_equal(count_answers, [6, 3, 2])
+
+
+def test_matrix_category_means():
+    means = matrix_category_means(
+        response_matrix_from_answers(mock_answers()),
+        5
+    )
+
+    np.testing.assert_allclose(
+        means,
+        [[5, 4, 2], [3.5, 2, np.nan], [1, 1, 5]]
+    )
+
+
+def test_matrix_label_counts():
+    counts = matrix_label_counts(
+        response_matrix_from_answers(mock_answers()),
+        5
+    )
+
+    np.testing.assert_array_equal(
+        counts,
+        [
+            [1, 0, 1, 0, 1],
+            [1, 1, 0, 0, 1],
+            [1, 1, 0, 1, 0],
+            [0, 1, 0, 0, 1]
+        ]
+    )
+
+
+def mock_answer_values():
+    return {
+        "questions": [
+            {
+                "id": "qst_1",
+                "category": "Perceived Usefulness",
+                "is_negative": False,
+                "is_custom": False,
+                "question_text": "Question 1"
+            },
+            {
+                "id": "qst_2",
+                "category": "Trust",
+                "is_negative": True,
+                "is_custom": True,
+                "question_text": "Question 2"
+            }
+        ],
+        "response_ids": ["res_1", "res_2"],
+        "answers": {
+            "responses": [0, 0, 1],
+            "questions": [0, 1, 1],
+            "values": [4, 2, 5]
+        },
+        "synced_at": "2025-12-15 14:03:34.15619+00"
+    }
+
+
+def test_response_matrix_from_values():
+    matrix = response_matrix_from_values(mock_answer_values())
+
+    assert matrix.response_ids == ["res_1", "res_2"]
+    assert matrix.question_ids == ["qst_1", "qst_2"]
+    assert matrix.categories == ["Perceived Usefulness", "Trust"]
+    assert matrix.question_texts == ["Question 1", "Question 2"]
+    np.testing.assert_array_equal(
+        matrix.values,
+        [[4, 2], [ResponseMatrix.MISSING, 5]]
+    )
+    np.testing.assert_array_equal(matrix.question_categories, [0, 1])
+    np.testing.assert_array_equal(matrix.is_negative, [False, True])
+    np.testing.assert_array_equal(matrix.is_custom, [False, True])
+
+
+def test_response_matrix_from_values_without_answers():
+    answer_values = mock_answer_values()
+    answer_values["response_ids"] = []
+    answer_values["answers"] = {"responses": [], "questions": [], "values": []}
+
+    matrix = response_matrix_from_values(answer_values)
+
+    assert len(matrix) == 0
+    assert matrix.values.shape == (0, 2)
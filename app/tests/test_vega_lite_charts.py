@@ -0,0 +1,118 @@
+import json
+import math
+from utils.vega_lite_charts import (
+    category_answers_bar_chart_spec,
+    finite,
+    pvalue_rows_spec,
+    spearman_by_response_spec,
+    spearman_heatmap_spec,
+    total_score_bar_chart_spec
+)
+
+
+def test_finite():
+    assert finite(0.5) == 0.5
+    assert finite(math.nan) is None
+
+
+def test_total_score_bar_chart_spec():
+    spec = total_score_bar_chart_spec(("PU", "PEOU"), (30, 25), 60)
+
+    assert spec["data"]["values"] == [
+        {"category": "PU", "score": 30},
+        {"category": "PEOU", "score": 25}
+    ]
+    assert spec["encoding"]["y"]["scale"]["domain"] == [0, 110]
+
+
+def test_category_answers_bar_chart_spec():
+    spec = category_answers_bar_chart_spec(
+        "Question 1",
+        ("Agree", "Disagree"),
+        (7, 3)
+    )
+
+    assert spec["title"] == "Question 1"
+    assert spec["data"]["values"] == [
+        {"label": "Agree", "count": 7},
+        {"label": "Disagree", "count": 3}
+    ]
+    assert spec["encoding"]["y"]["scale"]["domain"] == [0, 12]
+
+
+def test_spearman_by_response_spec_with_intervals():
+    spec = spearman_by_response_spec(
+        ("PU-BI", "PEOU-BI"),
+        (0.7, -0.2),
+        (0.5, -0.4),
+        (0.8, 0.1)
+    )
+
+    assert spec["data"]["values"] == [
+        {"pair": "PU-BI", "r": 0.7, "color": "green", "low": 0.5, "high": 0.8},
+        {
+            "pair": "PEOU-BI",
+            "r": -0.2,
+            "color": "pink",
+            "low": -0.4,
+            "high": 0.1
+        }
+    ]
+    assert any(
+        layer["mark"]["type"] == "errorbar" for layer in spec["layer"]
+    )
+
+
+def test_spearman_by_response_spec_without_intervals():
+    spec = spearman_by_response_spec(
+        ("PU-BI", "PEOU-BI"),
+        (-0.7, math.nan),
+        (math.nan, math.nan),
+        (math.nan, math.nan)
+    )
+
+    assert spec["data"]["values"][0] == {
+        "pair": "PU-BI",
+        "r": -0.7,
+        "color": "red"
+    }
+    assert spec["data"]["values"][1]["r"] is None
+    assert all(
+        layer["mark"]["type"] != "errorbar" for layer in spec["layer"]
+    )
+    # the spec is valid JSON, without NaN
+    json.dumps(spec, allow_nan=False)
+
+
+def test_pvalue_rows_spec():
+    spec = pvalue_rows_spec(("PU-BI", "PEOU-BI"), (0.01, 0.2))
+
+    assert [row["color"] for row in spec["data"]["values"]] == [
+        "green",
+        "red"
+    ]
+    assert spec["encoding"]["y"]["scale"]["domain"] == [0, 0.2 + 0.1]
+
+
+def test_pvalue_rows_spec_of_small_p_values():
+    spec = pvalue_rows_spec(("PU-BI",), (0.0012,))
+
+    assert spec["encoding"]["y"]["scale"]["domain"] == [0, 0.0012 + 0.001]
+
+
+def test_spearman_heatmap_spec():
+    spec = spearman_heatmap_spec(
+        ("PU", "BI"),
+        ((1.0, 0.6), (0.6, math.nan)),
+        25
+    )
+
+    assert spec["title"] == "Spearman correlations between constructs (n=25)"
+    assert spec["data"]["values"] == [
+        {"row": "PU", "column": "PU", "r": 1.0},
+        {"row": "PU", "column": "BI", "r": 0.6},
+        {"row": "BI", "column": "PU", "r": 0.6},
+        {"row": "BI", "column": "BI", "r": None}
+    ]
+    assert spec["encoding"]["x"]["sort"] == ["PU", "BI"]
+    json.dumps(spec, allow_nan=False)
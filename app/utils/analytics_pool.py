@@ -0,0 +1,206 @@
+import os
+import queue
+import socket
+import subprocess
+import sys
+import threading
+import time
+from multiprocessing.connection import Connection
+
+# The process pool of the analytics: the number of worker processes
+# (0 runs the analytics in the calling thread), the number of jobs that
+# can wait for a worker and the seconds that a job's caller waits for it
+ANALYTICS_WORKERS = int(os.getenv("ANALYTICS_WORKERS", 2))
+ANALYTICS_QUEUE_LIMIT = int(os.getenv("ANALYTICS_QUEUE_LIMIT", 8))
+ANALYTICS_TIMEOUT = float(os.getenv("ANALYTICS_TIMEOUT", 300))
+
+# The directory that the app's modules get imported from
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# AnalyticsWorker is a worker process of the analytics pool, which runs
+# the utils.analytics_worker module, and the connection that its jobs
+# get sent and their outcomes received on.
+class AnalyticsWorker:
+
+    def __init__(self, process: subprocess.Popen, connection: Connection):
+        self.process = process
+        self.connection = connection
+
+    def stop(self):
+        self.connection.close()
+        self.process.kill()
+        self.process.wait()
+
+
+# AnalyticsPool is the process-wide pool of worker processes that run the
+# CPU-heavy analytics of the results page, so they do not hold the GIL of
+# the process that runs the scripts of all the Streamlit sessions, and
+# they can use the other cores of the host.
+# The pool is bounded: a job is rejected when all the workers are busy and
+# queue_limit jobs are already waiting. The workers are fresh interpreters
+# that run utils.analytics_worker as their __main__, instead of forks of
+# the app's process, which runs many threads, or spawned processes, which
+# would run the page script that Streamlit has installed as __main__.
+# They get started on the first jobs that need them and then reused.
+class AnalyticsPool:
+
+    def __init__(
+        self,
+        workers: int = ANALYTICS_WORKERS,
+        queue_limit: int = ANALYTICS_QUEUE_LIMIT,
+        timeout: float = ANALYTICS_TIMEOUT
+    ):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(
+            max(workers, 0) + queue_limit
+        )
+        self._lock = threading.Lock()
+        self._reset()
+
+    '''
+    The run function runs function(*args) in a worker process and returns
+    its result, which the calling thread waits for without holding the GIL.
+    The function and its args must be picklable, so the function has to be
+    defined at the top level of a module.
+    It raises a RuntimeError if the pool is full, the job times out or its
+    worker dies. A job that times out gets stopped with its worker.
+    The exceptions of the function itself are raised as they are.
+    '''
+    def run(self, function, *args):
+        if self.workers <= 0:
+            return function(*args)
+
+        if not self._slots.acquire(blocking=False):
+            raise RuntimeError(
+                "The analytics pool is full, "
+                f"{self.workers + self.queue_limit} jobs are already running"
+            )
+
+        try:
+            return self._run(function, args)
+        finally:
+            self._slots.release()
+
+    def shutdown(self):
+        with self._lock:
+            workers = self._running
+            self._reset()
+        for worker in workers:
+            worker.stop()
+
+    # The idle queue holds the idle workers and a None for every worker
+    # that has not been started yet, so a job waits on a single queue
+    # for either of them.
+    def _reset(self):
+        self._idle = queue.LifoQueue()
+        for _ in range(max(self.workers, 0)):
+            self._idle.put(None)
+        self._running = set()
+
+    def _run(self, function, args: tuple):
+        deadline = time.monotonic() + self.timeout
+        idle, worker = self._checkout(deadline)
+
+        try:
+            worker.connection.send((function, args))
+        except (OSError, EOFError) as e:
+            self._discard(idle, worker)
+            raise RuntimeError(f"The analytics worker has died: {e}")
+        except Exception as e:
+            # the job could not be pickled, so it has not been sent
+            self._checkin(idle, worker)
+            raise RuntimeError(f"Failed to submit the analytics job: {e}")
+
+        try:
+            finished = worker.connection.poll(
+                max(deadline - time.monotonic(), 0)
+            )
+            if finished:
+                succeeded, outcome = worker.connection.recv()
+        except (OSError, EOFError) as e:
+            self._discard(idle, worker)
+            raise RuntimeError(f"The analytics worker has died: {e}")
+
+        if not finished:
+            self._discard(idle, worker)
+            raise RuntimeError(
+                f"The analytics job did not finish in {self.timeout}s"
+            )
+
+        self._checkin(idle, worker)
+        if not succeeded:
+            raise outcome
+        return outcome
+
+    def _checkout(self, deadline: float):
+        with self._lock:
+            idle = self._idle
+        try:
+            worker = idle.get(timeout=max(deadline - time.monotonic(), 0))
+        except queue.Empty:
+            raise RuntimeError(
+                f"The analytics job did not finish in {self.timeout}s"
+            )
+
+        if worker is None:
+            try:
+                worker = self._start_worker()
+            except OSError as e:
+                idle.put(None)
+                raise RuntimeError(
+                    f"Failed to start the analytics worker: {e}"
+                )
+            with self._lock:
+                self._running.add(worker)
+
+        return idle, worker
+
+    # A worker goes back to the idle queue that it has been taken from,
+    # unless the pool has been shut down since
+    def _checkin(self, idle: queue.LifoQueue, worker: AnalyticsWorker):
+        with self._lock:
+            current = idle is self._idle
+        if current:
+            idle.put(worker)
+        else:
+            worker.stop()
+
+    # A dead or stuck worker gets stopped and replaced on a next job
+    def _discard(self, idle: queue.LifoQueue, worker: AnalyticsWorker):
+        with self._lock:
+            self._running.discard(worker)
+        worker.stop()
+        idle.put(None)
+
+    def _start_worker(self):
+        parent_socket, child_socket = socket.socketpair()
+        try:
+            process = subprocess.Popen(
+                [
+                    sys.executable,
+                    "-m",
+                    "utils.analytics_worker",
+                    str(child_socket.fileno())
+                ],
+                pass_fds=(child_socket.fileno(),),
+                env={
+                    **os.environ,
+                    "PYTHONPATH": os.pathsep.join(filter(None, (
+                        APP_DIR,
+                        os.environ.get("PYTHONPATH")
+                    )))
+                }
+            )
+        except OSError:
+            parent_socket.close()
+            raise
+        finally:
+            child_socket.close()
+
+        return AnalyticsWorker(process, Connection(parent_socket.detach()))
+
+
+analytics_pool = AnalyticsPool()
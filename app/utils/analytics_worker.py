@@ -0,0 +1,39 @@
+import sys
+from multiprocessing.connection import Connection
+
+'''
+The serve function runs the jobs that the analytics pool sends on the
+connection, one at a time, and sends back whether each of them has
+succeeded with its result or its exception. It returns when the pool
+closes the connection.
+'''
+
+
+def serve(connection: Connection):
+    while True:
+        try:
+            function, args = connection.recv()
+        except EOFError:
+            return
+        except Exception as e:
+            # the job's function could not be imported by the worker
+            connection.send((False, RuntimeError(f"Invalid job: {e}")))
+            continue
+
+        try:
+            reply = (True, function(*args))
+        except Exception as e:
+            reply = (False, e)
+
+        try:
+            connection.send(reply)
+        except Exception as e:
+            connection.send((False, RuntimeError(
+                f"The job's outcome could not be sent: {e}"
+            )))
+
+
+# A worker process of the analytics pool runs this module as its __main__,
+# so it never imports the page script that the app's process is running.
+if __name__ == "__main__":
+    serve(Connection(int(sys.argv[1])))
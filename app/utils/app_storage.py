@@ -0,0 +1,39 @@
+import os
+import stat
+
+# The directory of the files that the app's processes share on the host,
+# such as the cached response matrices and the results' snapshots.
+# It is in the app's user's cache directory instead of the shared
+# temporary directory, so other users can not read or plant its files.
+APP_STORAGE_DIR = os.getenv(
+    "APP_STORAGE_DIR",
+    os.path.join(
+        os.getenv("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+        "tamquest"
+    )
+)
+
+
+'''
+The private_directory function creates the directory, with its parents,
+if it does not exist, and returns its path once it has checked that only
+the app's user can access it: the directory must not be a symlink, it must
+belong to the app's user and other users must have no permissions on it.
+It raises an OSError if the directory is not private, so its files are
+neither read nor written.
+'''
+
+
+def private_directory(path: str):
+
+    os.makedirs(path, mode=0o700, exist_ok=True)
+
+    status = os.lstat(path)
+    if not stat.S_ISDIR(status.st_mode):
+        raise OSError(f"{path} is not a directory")
+    if status.st_uid != os.getuid():
+        raise OSError(f"{path} belongs to another user")
+    if stat.S_IMODE(status.st_mode) & 0o077:
+        raise OSError(f"{path} can be accessed by other users")
+
+    return path
@@ -0,0 +1,67 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+# The memory that the cached images of the charts can take up
+CHART_IMAGE_CACHE_BYTES = int(os.getenv("CHART_IMAGE_CACHE_BYTES", 64 << 20))
+
+
+# ChartImageCache is a process-wide LRU cache of the rendered images of
+# the charts, keyed by the chart_key of what they plot. An unchanged chart
+# is served from the cache instead of being drawn and rasterized again,
+# and the least recently used images get dropped when the cache exceeds
+# its memory budget.
+class ChartImageCache:
+
+    def __init__(self, max_bytes: int = CHART_IMAGE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._images = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    '''
+    The get function returns the image of the key, or None.
+    '''
+    def get(self, key: str):
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+            return image
+
+    '''
+    The set function stores the image of the key and drops
+    the least recently used images over the memory budget.
+    '''
+    def set(self, key: str, image: bytes):
+        with self._lock:
+            previous = self._images.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+
+            self._images[key] = image
+            self._bytes += len(image)
+
+            while self._bytes > self.max_bytes and len(self._images) > 1:
+                _, dropped = self._images.popitem(last=False)
+                self._bytes -= len(dropped)
+
+    def clear(self):
+        with self._lock:
+            self._images.clear()
+            self._bytes = 0
+
+
+'''
+The chart_key function returns a hash of a chart's parts, such as its
+drawing function, its size and the data that it plots. The parts must be
+plain values, tuples or lists, whose repr is the same for the same data.
+'''
+
+
+def chart_key(*parts):
+    return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+
+chart_image_cache = ChartImageCache()
@@ -3,17 +3,11 @@ import html
 import re
 from datetime import date, datetime
 
-from database.responses import Responses
-
 from utils.generate_questionnaires import (
     generate_tam_questions,
     generate_additional_tam_questions
 )
 from utils.logger_config import logger
-from utils import supabase_client
-
-client = supabase_client.get_client()
-responses_repo = Responses(client)
 
 DEFAULT_LIKERT_SCALE = [
     "Strongly disagree",
@@ -324,6 +318,7 @@ def create_responses_management_ui(
     response: dict,
     redirection_button: str,
     callback,
+    responses_repo,
     response_profile_name: str | None = None
 ):
 
@@ -0,0 +1,75 @@
+import asyncio
+import os
+from concurrent.futures import TimeoutError
+
+from database.repositories import AsyncRepositories
+
+from utils import supabase_client
+from utils.logger_config import logger
+
+# The seconds that a script waits for its concurrent fetches
+CONCURRENT_FETCH_TIMEOUT = float(os.getenv("CONCURRENT_FETCH_TIMEOUT", 60))
+
+
+'''
+The gather_fetches function runs independent fetches concurrently
+and returns their results in the order of the fetches, so a page
+waits for its slowest query instead of the sum of all of them.
+
+Each fetch is a function that takes the async repositories
+and returns the coroutine of a query, for example
+lambda repos: repos.answers.get_submitted_category_scores(q_id).
+
+The queries carry the auth of the session's client, or the auth_header
+of a session's client when they run outside of the session's script,
+for example in a background thread.
+If a fetch fails, the error gets logged and its result is None.
+If the fetches do not finish in CONCURRENT_FETCH_TIMEOUT seconds,
+they get cancelled and a RuntimeError gets raised.
+'''
+
+
+def gather_fetches(*fetches, auth_header: str | None = None):
+    if auth_header is None:
+        auth_header = session_auth_header()
+    repos = AsyncRepositories(supabase_client.init_async_client(auth_header))
+
+    async def gather():
+        return await asyncio.gather(
+            *(fetch(repos) for fetch in fetches),
+            return_exceptions=True
+        )
+
+    future = asyncio.run_coroutine_threadsafe(
+        gather(),
+        supabase_client.get_event_loop()
+    )
+    try:
+        results = future.result(timeout=CONCURRENT_FETCH_TIMEOUT)
+    except TimeoutError:
+        future.cancel()
+        raise RuntimeError(
+            f"The fetches did not finish in {CONCURRENT_FETCH_TIMEOUT}s"
+        )
+
+    fetched = []
+    for result in results:
+        if isinstance(result, RuntimeError):
+            logger.error(f"Database error: {result}")
+            fetched.append(None)
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            fetched.append(result)
+
+    return fetched
+
+
+'''
+The session_auth_header function returns the auth header
+of the session's supabase client.
+'''
+
+
+def session_auth_header():
+    return supabase_client.get_client().options.headers["Authorization"]
@@ -0,0 +1,100 @@
+import copy
+import os
+import threading
+from collections import OrderedDict
+
+# The maximum number of questionnaires whose content is kept in memory
+QUESTIONNAIRE_CACHE_SIZE = int(os.getenv("QUESTIONNAIRE_CACHE_SIZE", 256))
+
+
+# QuestionnaireContentCache is a process-wide LRU cache of the read results
+# of a questionnaire's content (questionnaire, questions, likert scale
+# and options). The content never changes after its creation, so the
+# entries are only dropped on the questionnaire's deletion or on eviction.
+# The results are copied in and out of the cache, so a caller that
+# changes its result never changes the one of the other sessions.
+class QuestionnaireContentCache:
+
+    def __init__(self, max_questionnaires: int = QUESTIONNAIRE_CACHE_SIZE):
+        self.max_questionnaires = max_questionnaires
+        self._entries = OrderedDict()
+        self._aliases = {}
+        self._lock = threading.Lock()
+
+    '''
+    The alias function files the results cached under other_id
+    (e.g. a likert scale's id) under the questionnaire that owns it,
+    so they get dropped together with the questionnaire's content.
+    '''
+    def alias(self, other_id: str, questionnaire_id: str):
+        with self._lock:
+            self._aliases[other_id] = questionnaire_id
+
+    '''
+    The owner function returns the id of the questionnaire that other_id
+    has been filed under, or None if it has not been aliased.
+    '''
+    def owner(self, other_id: str):
+        with self._lock:
+            return self._aliases.get(other_id)
+
+    '''
+    The get function returns a copy of the cached result stored under key
+    for the questionnaire, or None if there is not any.
+    '''
+    def get(self, questionnaire_id: str, key: str):
+        with self._lock:
+            questionnaire_id = self._aliases.get(
+                questionnaire_id,
+                questionnaire_id
+            )
+            entry = self._entries.get(questionnaire_id)
+            if entry is None or key not in entry:
+                return None
+            self._entries.move_to_end(questionnaire_id)
+            cached = entry[key]
+        return copy.deepcopy(cached)
+
+    '''
+    The set function stores a copy of a result under key for the questionnaire
+    and evicts the least recently used questionnaires
+    when the cache exceeds its size.
+    '''
+    def set(self, questionnaire_id: str, key: str, value):
+        value = copy.deepcopy(value)
+        with self._lock:
+            questionnaire_id = self._aliases.get(
+                questionnaire_id,
+                questionnaire_id
+            )
+            entry = self._entries.setdefault(questionnaire_id, {})
+            entry[key] = value
+            self._entries.move_to_end(questionnaire_id)
+
+            while len(self._entries) > self.max_questionnaires:
+                evicted_id, _ = self._entries.popitem(last=False)
+                self._drop_aliases(evicted_id)
+
+    '''
+    The invalidate function drops every cached result of the questionnaire.
+    '''
+    def invalidate(self, questionnaire_id: str):
+        with self._lock:
+            self._entries.pop(questionnaire_id, None)
+            self._drop_aliases(questionnaire_id)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._aliases.clear()
+
+    def _drop_aliases(self, questionnaire_id: str):
+        for other_id in [
+            other_id
+            for other_id, owner_id in self._aliases.items()
+            if owner_id == questionnaire_id
+        ]:
+            del self._aliases[other_id]
+
+
+questionnaire_content_cache = QuestionnaireContentCache()
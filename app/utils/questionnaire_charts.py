@@ -0,0 +1,649 @@
+import io
+import math
+import os
+
+import streamlit as st
+from matplotlib.figure import Figure
+
+from utils.analytics_pool import analytics_pool
+from utils.chart_cache import chart_image_cache, chart_key
+from utils.logger_config import logger
+from utils.vega_lite_charts import (
+    total_score_bar_chart_spec,
+    category_answers_bar_chart_spec,
+    spearman_by_response_spec,
+    pvalue_rows_spec,
+    spearman_heatmap_spec
+)
+from utils.questionnaire_scoring import (
+    mapped_categories,
+    BASIC_CONSTRUCTS,
+    MIN_SPEARMAN_RESPONSES,
+    LabelHistogram,
+    ConstructHistograms,
+    CategoryTotals,
+    CorrelationTable,
+    SpearmanMatrix,
+    ConstructReliability,
+    QuestionnaireResults
+)
+
+# The backend of the charts, "matplotlib" for images that the server
+# rasterizes or "vega-lite" for specs that the browser draws
+CHART_BACKEND = os.getenv("CHART_BACKEND", "matplotlib")
+
+# The resolution of the charts' images, the same as the one of st.pyplot
+CHART_DPI = 200
+
+'''
+The rasterize_chart function returns the PNG image of the chart that
+the draw function draws from the args on a Figure of figsize.
+The Figure is never registered with pyplot, so it gets freed
+as soon as its image has been rasterized.
+'''
+
+
+def rasterize_chart(draw, figsize: tuple, args: tuple):
+
+    fig = Figure(figsize=figsize, dpi=100)
+    try:
+        draw(fig, *args)
+        buffer = io.BytesIO()
+        fig.savefig(
+            buffer,
+            format="png",
+            dpi=CHART_DPI,
+            bbox_inches="tight"
+        )
+    finally:
+        fig.clear()
+    return buffer.getvalue()
+
+
+'''
+The render_chart function renders a chart from the args, the chart's data.
+
+With the vega-lite backend, the chart is the Vega-Lite spec that the spec
+function returns. Otherwise, it is the image that the draw function draws
+on a Figure of figsize. The image is served from the chart image cache
+if the same chart has already been rendered, otherwise it gets rasterized
+by a worker process of the analytics pool. If the pool cannot rasterize it,
+an error takes the chart's place, so the session's thread never
+rasterizes it itself.
+'''
+
+
+def render_chart(draw, spec, figsize: tuple, *args):
+
+    if CHART_BACKEND == "vega-lite":
+        st.vega_lite_chart(spec(*args), theme=None)
+        return
+
+    key = chart_key(draw.__name__, figsize, args)
+    image = chart_image_cache.get(key)
+
+    if image is None:
+        try:
+            image = analytics_pool.run(rasterize_chart, draw, figsize, args)
+        except RuntimeError as e:
+            logger.error(f"Analytics error: {e}")
+            st.error("Error during the chart's rendering")
+            return
+        chart_image_cache.set(key, image)
+
+    st.image(image, width="stretch")
+
+
+'''
+The draw_total_score_bar_chart function draws the chart
+of total_score_bar_chart on a Figure.
+'''
+
+
+def draw_total_score_bar_chart(
+    fig: Figure,
+    abbreviations: tuple,
+    values: tuple,
+    max_score
+):
+
+    ax = fig.subplots()
+
+    bars = ax.bar(abbreviations, values)
+
+    for bar, score in zip(bars, values):
+        height = bar.get_height()
+        ax.text(
+            bar.get_x() + bar.get_width()/2,
+            height,
+            f"{score}",
+            ha="center",
+            va="bottom" if height >= 0 else "top"
+        )
+
+    ax.set_title("TAM Score Contribution by Category")
+    ax.set_ylim(0, max_score + 50)
+    ax.yaxis.get_major_locator().set_params(integer=True)
+
+
+'''
+The total_score_bar_chart function renders a bar chart,
+showcasing the TAM score of each basic TAM construct
+'''
+
+
+def total_score_bar_chart(scores_by_category: dict, basic_categories: list):
+
+    filtered_abbreviations = [
+        abbr
+        for abbr in mapped_categories
+        if mapped_categories.get(abbr) in basic_categories
+    ]
+
+    filtered_values = [
+        scores_by_category[mapped_categories[abbr]]
+        for abbr in filtered_abbreviations
+    ]
+
+    render_chart(
+        draw_total_score_bar_chart,
+        total_score_bar_chart_spec,
+        (10, 4),
+        tuple(filtered_abbreviations),
+        tuple(filtered_values),
+        max(scores_by_category.values())
+    )
+
+
+'''
+The draw_category_answers_bar_chart function draws the chart
+of category_answers_bar_chart on a Figure.
+'''
+
+
+def draw_category_answers_bar_chart(
+    fig: Figure,
+    title: str,
+    x_vals: tuple,
+    y_vals: tuple
+):
+
+    ax = fig.subplots()
+
+    bars = ax.bar(x_vals, y_vals)
+
+    for bar, y in zip(bars, y_vals):
+        height = bar.get_height()
+        ax.text(
+            bar.get_x() + bar.get_width()/2,
+            height + 0.1,
+            f"{int(y)}",
+            ha="center",
+            va="bottom"
+        )
+
+    ax.set_title(title)
+    ax.set_ylim(0, max(y_vals) + 5)
+    ax.yaxis.get_major_locator().set_params(integer=True)
+
+
+'''
+The category_answers_bar_chart function renders a bar chart,
+showcasing for each of basic constructs' questions the number of times
+that a specific answer of the likert scale has been selected.
+'''
+
+
+def category_answers_bar_chart(histogram: LabelHistogram):
+
+    render_chart(
+        draw_category_answers_bar_chart,
+        category_answers_bar_chart_spec,
+        (10, 2),
+        histogram.title,
+        tuple(histogram.labels),
+        tuple(int(count) for count in histogram.counts)
+    )
+
+
+'''
+The render_construct_histograms function renders the bar charts
+of a construct's automated questions and of each of its custom questions.
+'''
+
+
+def render_construct_histograms(histograms: ConstructHistograms):
+
+    st.write(f"## {histograms.construct}")
+    st.write("### Automated questions")
+    category_answers_bar_chart(histograms.automated)
+
+    if len(histograms.custom) > 0:
+        st.write("### Custom questions")
+        for histogram in histograms.custom:
+            category_answers_bar_chart(histogram)
+
+
+'''
+The render_category_totals function renders the categories'
+distribution on the TAM score and the total TAM score,
+which gets skipped when it could not be computed.
+'''
+
+
+def render_category_totals(totals: CategoryTotals, basic_categories: list):
+
+    st.write("## Categories distribution on TAM score")
+    total_score_bar_chart(totals.scores_by_category, basic_categories)
+    if totals.tam_score is None:
+        st.info("There are no answers of the basic constructs yet")
+    else:
+        st.write(f"# Total TAM score:{totals.tam_score}")
+
+
+'''
+The draw_spearman_by_response function draws the chart
+of plot_spearman_by_response on a Figure.
+'''
+
+
+def draw_spearman_by_response(
+    fig: Figure,
+    labels: tuple,
+    r_values: tuple,
+    ci_low: tuple,
+    ci_high: tuple
+):
+
+    colors = []
+    for r in r_values:
+        if r < -0.5:
+            colors.append("red")
+        elif -0.5 <= r < 0:
+            colors.append("pink")
+        elif 0 <= r < 0.5:
+            colors.append("lightgreen")
+        else:
+            colors.append("green")
+
+    ax = fig.subplots()
+    bars = ax.bar(labels, r_values, color=colors)
+
+    # the bootstrap confidence intervals of the r values
+    if not all(math.isnan(low) for low in ci_low):
+        ax.errorbar(
+            labels,
+            r_values,
+            yerr=[
+                [max(r - low, 0) for r, low in zip(r_values, ci_low)],
+                [max(high - r, 0) for r, high in zip(r_values, ci_high)]
+            ],
+            fmt="none",
+            ecolor="black",
+            capsize=4
+        )
+
+    ax.axhline(0, color="black", linewidth=0.8)
+
+    ax.set_ylim(-1.1, 1.1)
+
+    for bar, r in zip(bars, r_values):
+        height = bar.get_height()
+        ax.text(
+            bar.get_x() + bar.get_width()/2,
+            height,
+            f"{r:.2f}",
+            ha="center",
+            va="bottom" if height >= 0 else "top"
+        )
+
+    ax.set_ylabel("Spearman r")
+    ax.set_title("Spearman correlations between predictors and responses")
+
+
+'''
+The correlation_labels function returns the bar labels
+of a correlation table's rows.
+'''
+
+
+def correlation_labels(table: CorrelationTable):
+
+    df = table.rows
+    return tuple(
+        df["Dependent variable"] +
+        " → " +
+        df["Response variable"]
+    )
+
+
+'''
+The plot_spearman_by_response renders a bar chart that
+visualizes the r values between the dependent constructs
+and a specific response construct.
+'''
+
+
+def plot_spearman_by_response(table: CorrelationTable):
+
+    df = table.rows
+    render_chart(
+        draw_spearman_by_response,
+        spearman_by_response_spec,
+        (8, 3),
+        correlation_labels(table),
+        tuple(float(r) for r in df["Spearman r"]),
+        tuple(float(r) for r in df["CI low"]),
+        tuple(float(r) for r in df["CI high"])
+    )
+
+
+'''
+The draw_pvalue_rows function draws the chart
+of plot_pvalue_rows on a Figure.
+'''
+
+
+def draw_pvalue_rows(fig: Figure, labels: tuple, p_values: tuple):
+
+    colors = ["green" if p < 0.05 else "red" for p in p_values]
+
+    ax = fig.subplots()
+    bars = ax.bar(labels, p_values, color=colors)
+
+    ax.axhline(0, color="black", linewidth=0.8)
+
+    max_p_decimal_part = (
+        str(max(p_values)).split(".")[1]
+        if "." in str(max(p_values))
+        else ""
+    )
+
+    if max_p_decimal_part.startswith("00"):
+        padding = 0.001
+    else:
+        padding = 0.1
+
+    ax.set_ylim(0, max(p_values) + padding)
+
+    for bar, p in zip(bars, p_values):
+        height = bar.get_height()
+        ax.text(
+            bar.get_x() + bar.get_width()/2,
+            height,
+            f"{p:.4f}",
+            ha="center",
+            va="bottom"
+            if height >= 0
+            else "top"
+        )
+
+    ax.set_ylabel("p-value")
+    ax.set_title("Spearman p-values for predictors and responses")
+
+
+'''
+The plot_pvalue_rows renders a bar chart that visualizes
+the p values between the dependent constructs
+and a specific response construct.
+'''
+
+
+def plot_pvalue_rows(table: CorrelationTable):
+
+    render_chart(
+        draw_pvalue_rows,
+        pvalue_rows_spec,
+        (8, 3),
+        correlation_labels(table),
+        tuple(float(p) for p in table.rows["p-value"])
+    )
+
+
+'''
+The draw_spearman_heatmap function draws the heatmap
+of spearman_heatmap on a Figure.
+'''
+
+
+def draw_spearman_heatmap(
+    fig: Figure,
+    constructs: tuple,
+    r: tuple,
+    n: int
+):
+
+    ax = fig.subplots()
+
+    image = ax.imshow(r, cmap="RdYlGn", vmin=-1, vmax=1)
+
+    ax.set_xticks(range(len(constructs)))
+    ax.set_xticklabels(constructs, rotation=45, ha="right")
+    ax.set_yticks(range(len(constructs)))
+    ax.set_yticklabels(constructs)
+
+    for i in range(len(constructs)):
+        for j in range(len(constructs)):
+            ax.text(
+                j,
+                i,
+                f"{r[i][j]:.2f}",
+                ha="center",
+                va="center",
+                fontsize=8
+            )
+
+    fig.colorbar(image, ax=ax, label="Spearman r")
+    ax.set_title(f"Spearman correlations between constructs (n={n})")
+
+
+'''
+The spearman_heatmap renders a heatmap of the Spearman r values
+between all the constructs that the questionnaire has examined.
+'''
+
+
+def spearman_heatmap(matrix: SpearmanMatrix):
+
+    size = max(4, len(matrix.constructs) * 0.6)
+    render_chart(
+        draw_spearman_heatmap,
+        spearman_heatmap_spec,
+        (size, size),
+        tuple(matrix.constructs),
+        tuple(tuple(row) for row in matrix.r.tolist()),
+        matrix.n
+    )
+
+
+'''
+The render_reliability function renders the Cronbach's alpha
+of each construct and the item statistics of its questions.
+'''
+
+
+def render_reliability(reliability: tuple[ConstructReliability, ...]):
+
+    st.title("Reliability analysis")
+    st.write(
+        "Cronbach's alpha of each construct's questions. "
+        "Values of at least 0.7 indicate an acceptable internal consistency."
+    )
+
+    for construct in reliability:
+        st.write(f"### {construct.construct}")
+        st.metric(
+            f"Cronbach's alpha (n={construct.n})",
+            f"{construct.alpha:.3f}"
+        )
+        st.dataframe(
+            construct.items.style.format(
+                {
+                    "Corrected item-total r": "{:.3f}",
+                    "Alpha if deleted": "{:.3f}"
+                },
+                na_rep="-"
+            ),
+            hide_index=True
+        )
+
+
+'''
+The render_constructs_section function renders the histograms of one of
+the constructs, which gets selected from all of them, so the charts of
+the other constructs do not get rendered.
+'''
+
+
+def render_constructs_section(
+    histograms: tuple[ConstructHistograms, ...],
+    label: str
+):
+
+    construct = st.selectbox(
+        label,
+        [construct.construct for construct in histograms]
+    )
+
+    for construct_histograms in histograms:
+        if construct_histograms.construct == construct:
+            render_construct_histograms(construct_histograms)
+
+
+'''
+The render_spearman_section function renders the Spearman analysis,
+the r values and the p values between the constructs.
+'''
+
+
+def render_spearman_section(results: QuestionnaireResults):
+
+    # If there are less than MIN_SPEARMAN_RESPONSES responses,
+    # the app does not proceed on a spearman analysis
+    if results.count_of_responses < MIN_SPEARMAN_RESPONSES:
+        st.write(
+            "#### There are not enough responses"
+            " for a valid Spearman analysis."
+        )
+        return
+
+    matrix = results.spearman_matrix
+    for table in results.correlation_tables:
+        st.write(f"### {table.title}")
+        plot_spearman_by_response(table)
+        if matrix is not None and matrix.n_resamples > 0:
+            st.caption(
+                f"The error bars are the {matrix.confidence:.0%} bootstrap "
+                f"confidence intervals over {matrix.n_resamples} resamples."
+            )
+            st.dataframe(
+                table.rows[[
+                    "Dependent variable",
+                    "Response variable",
+                    "Spearman r",
+                    "CI low",
+                    "CI high",
+                    "p-value"
+                ]],
+                hide_index=True
+            )
+        plot_pvalue_rows(table)
+
+    if results.spearman_matrix is not None:
+        st.write("### Spearman correlations between all the constructs")
+        spearman_heatmap(results.spearman_matrix)
+
+
+'''
+The render_results_sections function renders one section of the results,
+which the admin selects, so only the charts of that section get rendered.
+It is a fragment, so selecting another section reruns only the function
+instead of the whole page.
+'''
+
+
+@st.fragment
+def render_results_sections(results: QuestionnaireResults):
+
+    sections = {
+        "TAM score": lambda: render_category_totals(
+            results.category_totals,
+            BASIC_CONSTRUCTS
+        ),
+        "Basic constructs": lambda: render_constructs_section(
+            results.basic_histograms,
+            "Basic construct"
+        )
+    }
+
+    # If there are additional construct, the same statistic analysis
+    # gets applied to them but the results do not contribute
+    # on the final TAM score.
+    if len(results.secondary_histograms) != 0:
+        sections["Secondary constructs"] = (
+            lambda: render_constructs_section(
+                results.secondary_histograms,
+                "Secondary construct"
+            )
+        )
+
+    if len(results.reliability) != 0:
+        sections["Reliability analysis"] = (
+            lambda: render_reliability(results.reliability)
+        )
+
+    sections["Spearman analysis"] = (
+        lambda: render_spearman_section(results)
+    )
+
+    section = st.radio(
+        "Section",
+        list(sections),
+        horizontal=True,
+        label_visibility="collapsed"
+    )
+
+    sections[section]()
+
+
+'''
+The render_questionnaire_results function renders the overview of the
+results of a questionnaire that compute_questionnaire_results has computed,
+and the sections of the results that the admin opens.
+'''
+
+
+def render_questionnaire_results(results: QuestionnaireResults):
+
+    st.write(f"## Results for {results.title}")
+
+    # Showcasing the basic and additional TAM constructs
+    # that the specified questionnaire has examined.
+    st.write(
+        "#### The TAM constructs which have been"
+        " examined are the following:"
+    )
+    construct_cols = st.columns(3)
+    for i, construct in enumerate(results.constructs):
+        construct_cols[i % 3].write(f"##### {construct}")
+    st.write("\n")
+    st.write(
+        f"#### There are {results.count_of_responses} responses "
+        "for this questionnaire."
+    )
+    st.write(
+        f"#### Total of answers submitted are {results.count_of_answers}."
+    )
+
+    st.divider()
+
+    # If there are no responses for the questionnaire,
+    # the app does not proceed to a statistical analysis.
+    if results.count_of_responses == 0:
+        st.write(
+            "The response rate did not meet the minimum threshold"
+            "required for statistical analysis"
+        )
+        return
+
+    render_results_sections(results)
@@ -1,7 +1,20 @@
-import streamlit as st
+import os
+from dataclasses import dataclass
+
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-from scipy.stats import spearmanr
+
+from utils.scoring_engine import (
+    ResponseMatrix,
+    response_matrix_from_answers,
+    matrix_scores,
+    matrix_category_totals,
+    matrix_category_means,
+    matrix_label_counts,
+    cronbach_reliability,
+    spearman_matrix,
+    bootstrap_spearman_intervals
+)
 
 # A ditionary that maps all the TAM constructs with their acronyms
 mapped_categories = {
@@ -22,391 +35,805 @@ mapped_categories = {
     "T": "Trust"
 }
 
-'''
-The total_score_bar_chart function renders a bar chart,
-showcasing the TAM score of each basic TAM construct
-'''
-
+BASIC_CONSTRUCTS = [
+    "Perceived Usefulness",
+    "Perceived Ease of Use",
+    "Attitude",
+    "Behavioral Intention"
+]
+
+# The secondary constructs that are examined as antecedents
+# of Perceived Usefulness and Perceived Ease of Use
+PU_CONSTRUCTS = [
+    "Subjective Norm",
+    "Information Quality",
+    "Compatibility",
+    "Trust",
+    "Risk"
+]
+
+PEOU_CONSTRUCTS = [
+    "Technology Support",
+    "Computer Self-Efficacy",
+    "Computer Anxiety",
+    "User Satisfaction",
+    "System Quality",
+    "Behavioral Control"
+]
+
+# The minimum number of responses for a valid Spearman analysis
+MIN_SPEARMAN_RESPONSES = 10
+
+# The bootstrap of the Spearman confidence intervals: the number of
+# resamples, the seed that makes them reproducible, the confidence level,
+# the number of processes that the resamples get spread over and the
+# memory that a batch of resamples can take in each of them
+BOOTSTRAP_RESAMPLES = int(os.getenv("BOOTSTRAP_RESAMPLES", 2000))
+BOOTSTRAP_SEED = int(os.getenv("BOOTSTRAP_SEED", 0))
+BOOTSTRAP_CONFIDENCE = float(os.getenv("BOOTSTRAP_CONFIDENCE", 0.95))
+BOOTSTRAP_PROCESSES = int(os.getenv("BOOTSTRAP_PROCESSES", 1))
+BOOTSTRAP_MEMORY_BYTES = int(os.getenv("BOOTSTRAP_MEMORY_BYTES", 256 * 2**20))
+
+# The cost cap of the bootstrap: the resamples get reduced so that
+# responses x resamples stays within BOOTSTRAP_MAX_DRAWS, and the
+# intervals get left out when that leaves fewer than
+# BOOTSTRAP_MIN_RESAMPLES of them. With the defaults, the questionnaires
+# of more than 10000 responses get fewer resamples, and the ones of more
+# than 100000 responses get no intervals, which are narrow at that size.
+BOOTSTRAP_MAX_DRAWS = int(os.getenv("BOOTSTRAP_MAX_DRAWS", 20_000_000))
+BOOTSTRAP_MIN_RESAMPLES = int(os.getenv("BOOTSTRAP_MIN_RESAMPLES", 200))
+
+
+# LabelHistogram holds the number of times that each label
+# of the likert scale has been selected, in the scale's order.
+@dataclass(frozen=True)
+class LabelHistogram:
+    title: str
+    labels: tuple
+    counts: tuple
+
+
+# ConstructHistograms holds the label histograms of a construct,
+# one for its automated questions and one for each custom question.
+@dataclass(frozen=True)
+class ConstructHistograms:
+    construct: str
+    automated: LabelHistogram
+    custom: tuple
+
+
+# CategoryTotals holds the TAM score of each category, the number of
+# the basic categories' answers and the total TAM score of the questionnaire,
+# which is None when none of the basic categories has been answered.
+@dataclass(frozen=True)
+class CategoryTotals:
+    scores_by_category: dict
+    count_answers: int
+    tam_score: float | None
+
+
+# CorrelationTable holds the Spearman r and p values of a set of
+# relationships and the bounds of the r values' confidence intervals,
+# one row per (response, dependent) variable pair.
+@dataclass(frozen=True)
+class CorrelationTable:
+    title: str
+    rows: pd.DataFrame
+
+
+# SpearmanMatrix holds the Spearman r and p values between every pair
+# of the constructs (by their acronyms) over n responses, and the bounds
+# of the bootstrap confidence intervals of the r values.
+@dataclass(frozen=True)
+class SpearmanMatrix:
+    constructs: tuple
+    r: np.ndarray
+    p: np.ndarray
+    n: int
+    r_low: np.ndarray | None = None
+    r_high: np.ndarray | None = None
+    confidence: float | None = None
+    n_resamples: int = 0
+
+
+# ConstructReliability holds the internal consistency of a construct's
+# questions over the n responses that have answered all of them:
+# its Cronbach's alpha and, one row per question, the corrected
+# item-total correlation and the alpha if the question gets deleted.
+@dataclass(frozen=True)
+class ConstructReliability:
+    construct: str
+    n: int
+    alpha: float
+    items: pd.DataFrame
+
+
+# QuestionnaireResults holds everything that the results page shows
+# for a questionnaire. It has no reference to Streamlit, so it can be
+# cached and shared between sessions.
+@dataclass(frozen=True)
+class QuestionnaireResults:
+    title: str
+    constructs: tuple
+    secondary_constructs: tuple
+    count_of_responses: int
+    count_of_answers: int
+    basic_histograms: tuple
+    secondary_histograms: tuple
+    category_totals: CategoryTotals | None
+    correlation_tables: tuple
+    spearman_matrix: SpearmanMatrix | None = None
+    reliability: tuple = ()
 
-def total_score_bar_chart(scores_by_category: dict, basic_categories: list):
 
-    fig, ax = plt.subplots(figsize=(10, 4), dpi=100)
+'''
+The label_histogram function counts the number of times that an answer
+corresponding to its likert scale option label has been selected.
 
-    filtered_abbreviations = [
-        abbr
-        for abbr in mapped_categories
-        if mapped_categories.get(abbr) in basic_categories
-    ]
+The answers can either be the submitted answers' rows or the
+label counts' rows that have already been aggregated by the database,
+which carry the number of times each label has been selected
+in their answer_count field.
+'''
 
-    filtered_values = [
-        scores_by_category[mapped_categories[abbr]]
-        for abbr in filtered_abbreviations
-    ]
 
-    bars = ax.bar(filtered_abbreviations, filtered_values)
+def label_histogram(
+    answers: list,
+    title: str,
+    likert_scale_options: list
+) -> LabelHistogram:
 
-    for bar, score in zip(bars, filtered_values):
-        height = bar.get_height()
-        ax.text(
-            bar.get_x() + bar.get_width()/2,
-            height,
-            f"{score}",
-            ha="center",
-            va="bottom" if height >= 0 else "top"
-        )
+    counts = {str(option["label"]): 0 for option in likert_scale_options}
 
-    ax.set_title("TAM Score Contribution by Category")
-    ax.set_ylim(0, max(scores_by_category.values()) + 50)
-    ax.yaxis.get_major_locator().set_params(integer=True)
+    for answer in answers:
+        if "answer_count" in answer:
+            label = str(answer["label"])
+            counts[label] = counts.get(label, 0) + answer["answer_count"]
+        else:
+            label = str(answer["likert_scale_options"]["label"])
+            counts[label] = counts.get(label, 0) + 1
 
-    st.pyplot(fig)
+    return LabelHistogram(
+        title,
+        tuple(counts.keys()),
+        tuple(int(count) for count in counts.values())
+    )
 
 
 '''
-The category_answers_bar_chart function renders a bar chart,
-showcasing for each of basic constructs' questions the number of times
-that a specific answer of the likert scale has been selected.
+The matrix_label_count_rows function turns the label counts of
+a ResponseMatrix into rows of the same shape as the ones that
+get_submitted_answer_label_counts retrieves, one row per question
+and likert scale option.
 '''
 
 
-def category_answers_bar_chart(
-    answer_counts: pd.DataFrame,
-    title: str,
+def matrix_label_count_rows(
+    matrix: ResponseMatrix,
     likert_scale_options: list
 ):
-    likert_labels = [option["label"] for option in likert_scale_options]
 
-    full_answer_counts = {str(label): 0 for label in likert_labels}
-
-    answer_counts_dict = answer_counts.set_index("Label")["count"].to_dict()
-    full_answer_counts.update(answer_counts_dict)
-
-    x_vals = list(full_answer_counts.keys())
-    y_vals = list(full_answer_counts.values())
-
-    fig, ax = plt.subplots(figsize=(10, 2), dpi=100)
-
-    bars = ax.bar(x_vals, y_vals)
-
-    for bar, y in zip(bars, y_vals):
-        height = bar.get_height()
-        ax.text(
-            bar.get_x() + bar.get_width()/2,
-            height + 0.1,
-            f"{int(y)}",
-            ha="center",
-            va="bottom"
-        )
-
-    ax.set_title(title)
-    ax.set_ylim(0, max(y_vals) + 5)
-    ax.yaxis.get_major_locator().set_params(integer=True)
-
-    st.pyplot(fig)
+    counts = matrix_label_counts(matrix, len(likert_scale_options))
+
+    return [
+        {
+            "category": (
+                matrix.categories[matrix.question_categories[question]]
+                if matrix.question_categories[question] >= 0
+                else None
+            ),
+            "question_id": matrix.question_ids[question],
+            "is_custom": bool(matrix.is_custom[question]),
+            "question_text": matrix.question_texts[question],
+            "label": option["label"],
+            "answer_count": int(counts[question, option["value"] - 1])
+        }
+        for question in range(len(matrix.question_ids))
+        for option in likert_scale_options
+    ]
 
 
 '''
-The count_category_answers_by_label function counts
-the number of times that an answer corresponding
-to its likert scale option label has been selected.
+The index_label_counts function partitions the label counts' rows
+in a single pass, by their category and whether their question is custom,
+and then by their question, in the order of the rows. Every construct's
+and every question's rows are then read from the index without scanning
+all the rows again.
 '''
 
 
-def count_category_answers_by_label(
-    answers: list,
-    title: str,
+def index_label_counts(
+    answers: list | ResponseMatrix,
     likert_scale_options: list
-):
+) -> dict:
 
-    df = pd.DataFrame(answers)
+    if isinstance(answers, ResponseMatrix):
+        answers = matrix_label_count_rows(answers, likert_scale_options)
 
-    count_df = (
-        df["likert_scale_options"]
-        .apply(lambda x: x["label"])
-        .value_counts()
-        .reset_index()
-    )
+    index = {}
+    for item in answers:
+        questions = index.setdefault(
+            (item["category"], bool(item["is_custom"])),
+            {}
+        )
+        questions.setdefault(
+            item.get("question_id", item["question_text"]),
+            []
+        ).append(item)
 
-    count_df.columns = ["Label", "count"]
-
-    category_answers_bar_chart(
-        count_df,
-        title,
-        likert_scale_options
-    )
+    return index
 
 
 '''
-The tam_score function creates a list with all the answers of the
-categories' questions that are on basic_categories list.
+The construct_histograms function returns the label histograms of
+a construct's automated questions and of each of its custom questions,
+from the label counts' rows or their index_label_counts index.
+'''
 
-Then, for each category of that list, it calculates their score based on
-the answers' selected likert scale options value
-and the positive/negative wording of the corresponding question.
 
-The categories and their scores are stored on a newly created dataframe.
+def construct_histograms(
+    answers: list | ResponseMatrix | dict,
+    construct: str,
+    likert_scale_options: list,
+    automated_title: str,
+    custom_title: str
+) -> ConstructHistograms:
+
+    if not isinstance(answers, dict):
+        answers = index_label_counts(answers, likert_scale_options)
+
+    automated_questions = answers.get((construct, False), {})
+    custom_questions = answers.get((construct, True), {})
+
+    return ConstructHistograms(
+        construct,
+        label_histogram(
+            [
+                item
+                for question_answers in automated_questions.values()
+                for item in question_answers
+            ],
+            automated_title,
+            likert_scale_options
+        ),
+        tuple(
+            label_histogram(
+                question_answers,
+                custom_title.format(
+                    question_text=question_answers[0]["question_text"]
+                ),
+                likert_scale_options
+            )
+            for question_answers in custom_questions.values()
+        )
+    )
 
-The scores of each category gets inserted on the scores_by_category dictionary,
-which get inserted as an argument for the total_score_bar_chart function.
 
-Lastly, all category scores get summed up and their mean gets presented as
-the total TAM score of the questionnaire.
+'''
+The tam_category_totals function calculates the score of each category
+that is on the basic_categories list, based on the answers' selected
+likert scale options value and the positive/negative wording
+of the corresponding question.
+
+All category scores get summed up and their mean gets returned as
+the total TAM score of the questionnaire, or None if there are no
+answers of the basic categories.
 '''
 
 
-def tam_score(
+def tam_category_totals(
     categories: list,
     answers: list,
     likert_scale_options: list,
     basic_categories: list
-):
-
-    basic_categories_answers = [
-        a for a in answers
-        if a["questions"]["category"] in basic_categories
-    ]
+) -> CategoryTotals:
 
-    df = pd.DataFrame([{
-        "category": answer["questions"]["category"],
-        "score":
-            (len(likert_scale_options) + 1)
-            - answer["likert_scale_options"]["value"]
-            if answer["questions"]["is_negative"]
-            else answer["likert_scale_options"]["value"]
-    } for answer in basic_categories_answers])
+    basic_scores = construct_scores(
+        answers,
+        likert_scale_options,
+        basic_categories
+    )
 
     scores_by_category = {
-        cat: int(df[df["category"] == cat]["score"].sum())
+        cat: (
+            basic_scores[cat]["total_score"]
+            if cat in basic_scores
+            else 0
+        )
         for cat in categories
     }
 
-    len(df)
-
-    st.write("## Categories distribution on TAM score")
-    total_score_bar_chart(scores_by_category, basic_categories)
+    count_answers = sum(
+        score["count_answers"]
+        for score in basic_scores.values()
+    )
 
     total_score = sum(scores_by_category.values())
 
-    total_tam_score = total_score/(len(df)*len(likert_scale_options))
+    # the questionnaire may have responses without basic categories' answers
+    total_tam_score = None
+    if count_answers and likert_scale_options:
+        total_tam_score = (
+            total_score/(count_answers*len(likert_scale_options))
+        )
 
-    return total_tam_score
+    return CategoryTotals(scores_by_category, count_answers, total_tam_score)
 
 
 '''
-The construct_scores function initializes a list with all the answers
-referring to questions of categories that are on the categories list
-and calculate the score of each answer.
-Then, it stores categories and their corresponding scores to a DataFrame
-and initializes a result dictionary that calculates the TAM score
-for each category and the number of answers that have been used for the result.
-It returns the result dictionary.
+The construct_scores function calculates the TAM score of each category
+that is on the categories list and the number of answers that have been
+used for the result, and returns them in a result dictionary.
+
+If the answers are the category scores' rows that have already been
+aggregated by the database, which is what the results page uses,
+their totals are used as they are. Otherwise the answers' rows get
+turned into a ResponseMatrix, and the columns of the matrix get summed up
+by the scoring engine.
 '''
 
 
 def construct_scores(
-    answers: list,
+    answers: list | ResponseMatrix,
     likert_scale_options: list,
     categories: list
 ):
 
-    answers = [
-        a for a in answers
-        if a["questions"]["category"]
-        in categories
-    ]
-
-    answer_df = pd.DataFrame([{
-        "category": answer["questions"]["category"],
-        "score":
-            (len(likert_scale_options) + 1)
-            - answer["likert_scale_options"]["value"]
-            if answer["questions"]["is_negative"]
-            else answer["likert_scale_options"]["value"]
-    } for answer in answers])
-
-    result = {}
-    for category in categories:
-        cat_df = answer_df[answer_df["category"] == category]
-        result[category] = {
-            "total_score": int(cat_df["score"].sum()),
-            "count_answers": len(cat_df)
+    if (
+        not isinstance(answers, ResponseMatrix)
+        and answers
+        and "total_score" in answers[0]
+    ):
+        category_scores = {
+            row["category"]: row
+            for row in answers
         }
+        return {
+            category: {
+                "total_score": int(
+                    category_scores.get(category, {}).get("total_score", 0)
+                ),
+                "count_answers": int(
+                    category_scores.get(category, {}).get("count_answers", 0)
+                )
+            }
+            for category in categories
+        }
+
+    if not isinstance(answers, ResponseMatrix):
+        answers = response_matrix_from_answers(answers, categories)
 
-    return result
+    total_scores, count_answers = matrix_category_totals(
+        answers,
+        len(likert_scale_options)
+    )
+    category_index = {
+        category: i
+        for i, category in enumerate(answers.categories)
+    }
+    return {
+        category: {
+            "total_score": (
+                int(total_scores[category_index[category]])
+                if category in category_index
+                else 0
+            ),
+            "count_answers": (
+                int(count_answers[category_index[category]])
+                if category in category_index
+                else 0
+            )
+        }
+        for category in categories
+    }
 
 
 '''
-The pivot_constructs gets a data dictionary for an argument
-that contains the categories score means for each response.
+The construct_acronym function returns the acronym of a category,
+or the category itself if it does not have one.
+'''
+
+
+def construct_acronym(category: str):
+    return next(
+        (
+            acronym
+            for acronym, name in mapped_categories.items()
+            if name == category
+        ),
+        category
+    )
 
-Then, it creates a DataFrame in which each row is a response,
-each column is a category and the values are the response's question
-categories means.
 
-Next, it renames the column names with the acronym of the
-corresponding category and returns the resulted DataFrame.
+'''
+The category_means_frame function gets the category means that
+get_response_category_means has retrieved, as a responses x categories
+matrix, and returns them as a DataFrame in which each row is a response
+and each column is a category, named with its acronym, with the
+response's mean score on the category's questions.
 '''
 
 
-def pivot_constructs(data: dict):
+def category_means_frame(category_means: dict):
 
-    construct_means_df = pd.DataFrame(data)
+    means = pd.DataFrame(
+        np.array(category_means["means"], dtype=np.float64).reshape(
+            len(category_means["response_ids"]),
+            len(category_means["categories"])
+        ),
+        columns=[
+            construct_acronym(category)
+            for category in category_means["categories"]
+        ]
+    )
+    means.insert(0, "response_id", category_means["response_ids"])
 
-    resulted_df = construct_means_df.pivot(
-        index="response_id",
-        columns="category",
-        values="mean_score"
-    ).reset_index()
+    return means
 
-    rename_map = {
-        v: k
-        for k, v in mapped_categories.items()
-        if v in resulted_df.columns
-    }
 
-    resulted_df = resulted_df.rename(columns=rename_map)
+'''
+The matrix_construct_means function returns the same DataFrame as
+category_means_frame, with the categories score means of each response
+computed from the columns of a ResponseMatrix.
+'''
 
-    return resulted_df
+
+def matrix_construct_means(
+    matrix: ResponseMatrix,
+    likert_scale_options: list
+):
+
+    means = pd.DataFrame(
+        matrix_category_means(matrix, len(likert_scale_options)),
+        columns=[
+            construct_acronym(category)
+            for category in matrix.categories
+        ]
+    )
+    means.insert(0, "response_id", matrix.response_ids)
+
+    return means
 
 
 '''
-The calc_spearman_correlation function performs a spearman analysis
-to find the r and p values between two constructs.
+The construct_spearman_matrix function computes the Spearman matrix
+of all the construct columns of the category_means_frame DataFrame
+in a single pass, and the bootstrap confidence intervals of its r values
+unless n_resamples is 0. The resamples get capped by max_draws, and the
+intervals get left out when fewer than min_resamples are left.
 '''
 
 
-def calc_spearman_correlation(
+def construct_spearman_matrix(
     data: pd.DataFrame,
-    dependent: str,
-    response: str
-):
+    n_resamples: int = BOOTSTRAP_RESAMPLES,
+    seed: int = BOOTSTRAP_SEED,
+    confidence: float = BOOTSTRAP_CONFIDENCE,
+    processes: int = BOOTSTRAP_PROCESSES,
+    memory_bytes: int = BOOTSTRAP_MEMORY_BYTES,
+    max_draws: int = BOOTSTRAP_MAX_DRAWS,
+    min_resamples: int = BOOTSTRAP_MIN_RESAMPLES
+) -> SpearmanMatrix:
+
+    constructs = [
+        column
+        for column in data.columns
+        if column != "response_id"
+    ]
+    values = data[constructs].to_numpy(dtype=np.float64)
 
-    dependent = next(
-        (
-            k for k, v in mapped_categories.items()
-            if v == dependent
-        ),
-        None
+    r, p = spearman_matrix(values)
+
+    n_resamples = min(n_resamples, max_draws // max(len(data), 1))
+    if n_resamples == 0 or n_resamples < min_resamples:
+        return SpearmanMatrix(tuple(constructs), r, p, len(data))
+
+    r_low, r_high = bootstrap_spearman_intervals(
+        values,
+        n_resamples,
+        seed,
+        confidence,
+        processes,
+        memory_bytes
     )
 
-    response = next(
-        (
-            k for k, v in mapped_categories.items()
-            if v == response
-        ),
-        None
+    return SpearmanMatrix(
+        tuple(constructs),
+        r,
+        p,
+        len(data),
+        r_low,
+        r_high,
+        confidence,
+        n_resamples
     )
 
-    x = data[dependent]
-    y = data[response]
 
-    r, p = spearmanr(x, y)
+'''
+The correlation_table function reads the r and p values of each
+(dependent, response) edge off the Spearman matrix, by the constructs'
+names, and gathers them in a CorrelationTable.
+'''
+
 
-    results_df = pd.DataFrame({
-        "Response variable": [response],
-        'Dependent variable': [dependent],
-        'Spearman r': [r],
-        'p-value': [p]
-    })
+def correlation_table(
+    matrix: SpearmanMatrix,
+    edges: list,
+    title: str
+) -> CorrelationTable:
+
+    acronyms = {v: k for k, v in mapped_categories.items()}
+    positions = {
+        construct: i
+        for i, construct in enumerate(matrix.constructs)
+    }
 
-    return results_df
+    rows = []
+    for dependent, response in edges:
+        dependent, response = acronyms[dependent], acronyms[response]
+        i, j = positions[dependent], positions[response]
+        rows.append({
+            "Response variable": response,
+            "Dependent variable": dependent,
+            "Spearman r": float(matrix.r[i, j]),
+            "p-value": float(matrix.p[i, j]),
+            "CI low": (
+                float(matrix.r_low[i, j])
+                if matrix.r_low is not None
+                else np.nan
+            ),
+            "CI high": (
+                float(matrix.r_high[i, j])
+                if matrix.r_high is not None
+                else np.nan
+            )
+        })
+
+    return CorrelationTable(title, pd.DataFrame(rows))
 
 
 '''
-The plot_spearman_by_response renders a bar chart that
-visualizes the r values between the dependent constructs
-and a specific response construct.
+The spearman_tables function returns the correlation tables of the
+TAM's basic paths and, for the constructs that the questionnaire
+has examined, the ones between PU/PEOU and their antecedents.
 '''
 
 
-def plot_spearman_by_response(df: pd.DataFrame):
+def spearman_tables(matrix: SpearmanMatrix, constructs: list):
 
-    df["label"] = (
-        df["Dependent variable"] +
-        " → " +
-        df["Response variable"]
-    )
+    tables = [
+        correlation_table(
+            matrix,
+            [
+                ("Attitude", "Behavioral Intention"),
+                ("Perceived Usefulness", "Attitude"),
+                ("Perceived Ease of Use", "Attitude")
+            ],
+            "Spearman statistic analysis for TAM's basic constructs"
+        )
+    ]
 
-    colors = []
-    for r in df["Spearman r"]:
-        if r < -0.5:
-            colors.append("red")
-        elif -0.5 <= r < 0:
-            colors.append("pink")
-        elif 0 <= r < 0.5:
-            colors.append("lightgreen")
-        else:
-            colors.append("green")
+    available_pu_constructs = [
+        construct
+        for construct in constructs
+        if construct in PU_CONSTRUCTS
+    ]
 
-    fig, ax = plt.subplots(figsize=(8, 3))
-    bars = ax.bar(df["label"], df["Spearman r"], color=colors)
+    available_peou_constructs = [
+        construct
+        for construct in constructs
+        if construct in PEOU_CONSTRUCTS
+    ]
 
-    ax.axhline(0, color="black", linewidth=0.8)
+    if len(available_pu_constructs) != 0:
+        tables.append(
+            correlation_table(
+                matrix,
+                [
+                    (construct, "Perceived Usefulness")
+                    for construct in available_pu_constructs
+                ],
+                "Spearman statistic analysis between"
+                " PU and secondary constructs"
+            )
+        )
 
-    ax.set_ylim(-1.1, 1.1)
+    if len(available_peou_constructs) != 0:
+        tables.append(
+            correlation_table(
+                matrix,
+                [
+                    (construct, "Perceived Ease of Use")
+                    for construct in available_peou_constructs
+                ],
+                "Spearman statistic analysis between"
+                " PEOU and secondary constructs"
+            )
+        )
 
-    for bar, r in zip(bars, df["Spearman r"]):
-        height = bar.get_height()
-        ax.text(
-            bar.get_x() + bar.get_width()/2,
-            height,
-            f"{r:.2f}",
-            ha="center",
-            va="bottom" if height >= 0 else "top"
+    return tuple(tables)
+
+
+'''
+The construct_reliability function computes the reliability of every
+construct that has at least two questions, from the submitted answers'
+rows or their ResponseMatrix. The matrix gets turned into a responses x
+questions matrix of scores once, with the negatively worded questions
+reversed the same way as on the TAM score, and each construct is a slice
+of its columns.
+'''
+
+
+def construct_reliability(
+    answers: list | ResponseMatrix,
+    likert_scale_options: list,
+    constructs: list
+):
+
+    matrix = (
+        answers
+        if isinstance(answers, ResponseMatrix)
+        else response_matrix_from_answers(answers, constructs)
+    )
+    scores = matrix_scores(matrix, len(likert_scale_options))
+
+    reliability = []
+    for code, construct in enumerate(matrix.categories):
+        if construct not in constructs:
+            continue
+
+        columns = np.flatnonzero(matrix.question_categories == code)
+        if len(columns) < 2:
+            continue
+
+        alpha, alpha_if_deleted, item_total, n = cronbach_reliability(
+            scores[:, columns]
         )
 
-    plt.ylabel("Spearman r")
-    plt.title("Spearman correlations between predictors and responses")
-    st.pyplot(fig)
+        reliability.append(ConstructReliability(
+            construct,
+            n,
+            alpha,
+            pd.DataFrame({
+                "Question": [
+                    matrix.question_texts[column]
+                    for column in columns
+                ],
+                "Corrected item-total r": item_total,
+                "Alpha if deleted": alpha_if_deleted
+            })
+        ))
+
+    return tuple(reliability)
 
 
 '''
-The plot_pvalue_rows renders a bar chart that visualizes
-the p values between the dependent constructs
-and a specific response construct.
+The compute_questionnaire_results function computes all the results
+of a questionnaire from its fetched data, without rendering anything.
+
+The category_means are only needed when there are enough responses
+for a Spearman analysis, otherwise they can be None.
+The submitted answers, as their rows or their ResponseMatrix, are only
+needed for the reliability analysis, which gets left out when they are
+None. When they are given, the Spearman analysis can also use them
+instead of the category_means.
 '''
 
 
-def plot_pvalue_rows(df, title="Spearman p-value for each relationship"):
+def compute_questionnaire_results(
+    title: str,
+    answer_label_counts: list,
+    category_scores: list,
+    likert_scale_options: list,
+    category_means: dict | None = None,
+    answers: list | ResponseMatrix | None = None
+) -> QuestionnaireResults:
+
+    if answers is not None and not isinstance(answers, ResponseMatrix):
+        answers = response_matrix_from_answers(answers)
+
+    constructs = list(
+        dict.fromkeys(item["category"] for item in category_scores)
+    )
+
+    secondary_constructs = [
+        construct
+        for construct in constructs
+        if construct not in BASIC_CONSTRUCTS
+    ]
 
-    df["label"] = (
-        df["Dependent variable"] +
-        " → " +
-        df["Response variable"]
+    # Every submitted response has answered all the questions,
+    # so the number of responses is the one of any of its categories.
+    count_of_responses = max(
+        (item["count_responses"] for item in category_scores),
+        default=0
+    )
+    count_of_answers = sum(
+        item["count_answers"] for item in category_scores
     )
 
-    colors = ["green" if p < 0.05 else "red" for p in df["p-value"]]
+    if count_of_responses == 0:
+        return QuestionnaireResults(
+            title,
+            tuple(constructs),
+            tuple(secondary_constructs),
+            0,
+            count_of_answers,
+            (),
+            (),
+            None,
+            ()
+        )
+
+    # The label counts get partitioned once for all the constructs
+    label_counts_index = index_label_counts(
+        answer_label_counts,
+        likert_scale_options
+    )
 
-    fig, ax = plt.subplots(figsize=(8, 3))
-    bars = ax.bar(df["label"], df["p-value"], color=colors)
+    basic_histograms = tuple(
+        construct_histograms(
+            label_counts_index,
+            category,
+            likert_scale_options,
+            f"Questions score contribution for {category}"
+            "automated questions",
+            "Score contribution for '{question_text}' question"
+        )
+        for category in BASIC_CONSTRUCTS
+    )
 
-    ax.axhline(0, color="black", linewidth=0.8)
+    secondary_histograms = tuple(
+        construct_histograms(
+            label_counts_index,
+            construct,
+            likert_scale_options,
+            f"Answers for {construct} automated questions",
+            "Answers for '{question_text}' question"
+        )
+        for construct in secondary_constructs
+    )
 
-    max_p_decimal_part = (
-        str(max(df["p-value"])).split(".")[1]
-        if "." in str(max(df["p-value"]))
-        else ""
+    totals = tam_category_totals(
+        constructs,
+        category_scores,
+        likert_scale_options,
+        BASIC_CONSTRUCTS
     )
 
-    if max_p_decimal_part.startswith("00"):
-        padding = 0.001
-    else:
-        padding = 0.1
-
-    ax.set_ylim(0, max(df["p-value"]) + padding)
-
-    for bar, p in zip(bars, df["p-value"]):
-        height = bar.get_height()
-        ax.text(
-            bar.get_x() + bar.get_width()/2,
-            height,
-            f"{p:.4f}",
-            ha="center",
-            va="bottom"
-            if height >= 0
-            else "top"
+    reliability = ()
+    if answers is not None:
+        reliability = construct_reliability(
+            answers,
+            likert_scale_options,
+            constructs
         )
 
-    plt.ylabel("p-value")
-    plt.title("Spearman p-values for predictors and responses")
-    st.pyplot(fig)
+    correlation_tables, matrix = (), None
+    if count_of_responses >= MIN_SPEARMAN_RESPONSES:
+        construct_means = None
+        if category_means is not None:
+            construct_means = category_means_frame(category_means)
+        elif answers is not None:
+            construct_means = matrix_construct_means(
+                answers,
+                likert_scale_options
+            )
+
+        if construct_means is not None:
+            matrix = construct_spearman_matrix(construct_means)
+            correlation_tables = spearman_tables(matrix, constructs)
+
+    return QuestionnaireResults(
+        title,
+        tuple(constructs),
+        tuple(secondary_constructs),
+        count_of_responses,
+        count_of_answers,
+        basic_histograms,
+        secondary_histograms,
+        totals,
+        correlation_tables,
+        matrix,
+        reliability
+    )
@@ -0,0 +1,281 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from utils.app_storage import APP_STORAGE_DIR, private_directory
+from utils.scoring_engine import (
+    ResponseMatrix,
+    merge_response_matrices,
+    response_matrix_from_values
+)
+
+# The directory of the response matrices' cache, shared by every process
+# of the host, and the disk space that its entries can take up
+RESPONSE_MATRIX_CACHE_DIR = os.getenv(
+    "RESPONSE_MATRIX_CACHE_DIR",
+    os.path.join(APP_STORAGE_DIR, "response_matrices")
+)
+RESPONSE_MATRIX_CACHE_BYTES = int(
+    os.getenv("RESPONSE_MATRIX_CACHE_BYTES", 1 << 30)
+)
+
+# The age after which the files that an interrupted write has left behind
+# get removed
+STALE_WRITE_SECONDS = 3600
+
+_ARRAYS = ("values", "question_categories", "is_negative", "is_custom")
+_METADATA = "metadata.json"
+
+
+# CachedResponseMatrix is a stored ResponseMatrix with the watermark that
+# it has been stored for and the database's synced_at of its answers,
+# from which an incremental retrieval can bring it up to date.
+@dataclass(frozen=True)
+class CachedResponseMatrix:
+    watermark: tuple
+    synced_at: str | None
+    matrix: ResponseMatrix
+
+
+# ResponseMatrixDiskCache is a host-wide cache of the questionnaires'
+# ResponseMatrix, stored on disk as one directory per questionnaire and
+# data-version watermark, with the matrix's arrays as .npy files and
+# the rest of it as JSON. The arrays get memory-mapped on reading, so
+# every session and worker process opens the same pages of the files
+# without copying or parsing them.
+# An entry gets written to a temporary directory and renamed into place,
+# so the readers never see a partial entry, and the least recently used
+# entries get deleted when the cache exceeds its disk budget.
+# The directory gets used only while it is private to the app's user.
+class ResponseMatrixDiskCache:
+
+    def __init__(
+        self,
+        directory: str = RESPONSE_MATRIX_CACHE_DIR,
+        max_bytes: int = RESPONSE_MATRIX_CACHE_BYTES
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    '''
+    The get function returns the memory-mapped ResponseMatrix of
+    the questionnaire if it has been stored for the watermark, or None.
+    '''
+    def get(self, questionnaire_id: str, watermark):
+        cached = self._load(self._entry_path(questionnaire_id, watermark))
+        return cached.matrix if cached is not None else None
+
+    '''
+    The get_latest function returns the CachedResponseMatrix that has
+    been stored last for the questionnaire, whatever its watermark,
+    or None if there is not any.
+    '''
+    def get_latest(self, questionnaire_id: str):
+        latest = None
+        for entry in self._entries():
+            if not entry.startswith(f"{questionnaire_id}."):
+                continue
+            cached = self._load(os.path.join(self.directory, entry))
+            if cached is not None and (
+                latest is None
+                or (cached.synced_at or "") > (latest.synced_at or "")
+            ):
+                latest = cached
+        return latest
+
+    '''
+    The set function stores the ResponseMatrix of the questionnaire
+    for the watermark, with the synced_at of its answers, deletes the ones
+    of its older watermarks and evicts the least recently used entries
+    over the disk budget.
+    '''
+    def set(
+        self,
+        questionnaire_id: str,
+        watermark,
+        matrix: ResponseMatrix,
+        synced_at: str | None = None
+    ):
+        path = self._entry_path(questionnaire_id, watermark)
+
+        try:
+            private_directory(self.directory)
+            temporary_path = tempfile.mkdtemp(prefix=".", dir=self.directory)
+        except OSError:
+            # the matrix just does not get cached
+            return
+
+        try:
+            for name in _ARRAYS:
+                np.save(
+                    os.path.join(temporary_path, f"{name}.npy"),
+                    getattr(matrix, name)
+                )
+            with open(
+                os.path.join(temporary_path, _METADATA),
+                "w"
+            ) as metadata_file:
+                json.dump(
+                    {
+                        "watermark": list(watermark),
+                        "synced_at": synced_at,
+                        "response_ids": list(matrix.response_ids),
+                        "question_ids": list(matrix.question_ids),
+                        "categories": list(matrix.categories),
+                        "question_texts": list(matrix.question_texts)
+                    },
+                    metadata_file
+                )
+            os.rename(temporary_path, path)
+        except OSError:
+            # another process has stored the same entry first,
+            # or the disk is full
+            shutil.rmtree(temporary_path, ignore_errors=True)
+
+        for entry in self._entries():
+            if (
+                entry.startswith(f"{questionnaire_id}.")
+                and os.path.join(self.directory, entry) != path
+            ):
+                self._delete(entry)
+
+        self._evict()
+
+    '''
+    The invalidate function deletes every stored matrix of the questionnaire.
+    '''
+    def invalidate(self, questionnaire_id: str):
+        for entry in self._entries():
+            if entry.startswith(f"{questionnaire_id}."):
+                self._delete(entry)
+
+    def clear(self):
+        for entry in self._entries():
+            self._delete(entry)
+
+    def _load(self, path: str):
+        try:
+            private_directory(self.directory)
+            with open(os.path.join(path, _METADATA)) as metadata_file:
+                metadata = json.load(metadata_file)
+            arrays = {
+                name: np.load(
+                    os.path.join(path, f"{name}.npy"),
+                    mmap_mode="r"
+                )
+                for name in _ARRAYS
+            }
+            # the modification time of the metadata is the entry's last use
+            os.utime(os.path.join(path, _METADATA))
+        except (OSError, ValueError, KeyError):
+            # the entry does not exist, it has just been evicted,
+            # it has been stored by an older version
+            # or the directory is not private
+            return None
+
+        return CachedResponseMatrix(
+            tuple(metadata["watermark"]),
+            metadata["synced_at"],
+            ResponseMatrix(
+                metadata["response_ids"],
+                metadata["question_ids"],
+                metadata["categories"],
+                arrays["values"],
+                arrays["question_categories"],
+                arrays["is_negative"],
+                arrays["is_custom"],
+                metadata["question_texts"]
+            )
+        )
+
+    def _entry_path(self, questionnaire_id: str, watermark):
+        digest = hashlib.sha256(repr(watermark).encode()).hexdigest()[:16]
+        return os.path.join(self.directory, f"{questionnaire_id}.{digest}")
+
+    def _entries(self):
+        try:
+            private_directory(self.directory)
+            return [
+                entry
+                for entry in os.listdir(self.directory)
+                if not entry.startswith(".")
+            ]
+        except OSError:
+            return []
+
+    def _delete(self, entry: str):
+        shutil.rmtree(os.path.join(self.directory, entry), ignore_errors=True)
+
+    def _evict(self):
+        entries = []
+        for entry in self._entries():
+            path = os.path.join(self.directory, entry)
+            try:
+                size = sum(
+                    file.stat().st_size
+                    for file in os.scandir(path)
+                )
+                last_use = os.stat(os.path.join(path, _METADATA)).st_mtime
+            except OSError:
+                continue
+            entries.append((last_use, size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._delete(entry)
+            total -= size
+
+        now = time.time()
+        for entry in os.listdir(self.directory):
+            path = os.path.join(self.directory, entry)
+            try:
+                stale = (
+                    entry.startswith(".")
+                    and now - os.stat(path).st_mtime > STALE_WRITE_SECONDS
+                )
+            except OSError:
+                continue
+            if stale:
+                shutil.rmtree(path, ignore_errors=True)
+
+
+'''
+The refresh_response_matrix function builds the ResponseMatrix of the
+answers that get_submitted_answer_values has retrieved. If they have been
+retrieved since the synced_at of a cached matrix, they get merged into it,
+and None gets returned when the merged responses do not add up to the
+watermark's count of submitted responses, in which case the answers
+have to be retrieved whole.
+'''
+
+
+def refresh_response_matrix(
+    answer_values: dict,
+    watermark,
+    cached: CachedResponseMatrix | None = None
+):
+
+    matrix = response_matrix_from_values(answer_values)
+    if cached is None:
+        return matrix
+
+    merged = merge_response_matrices(
+        cached.matrix,
+        matrix,
+        answer_values.get("deleted_response_ids", [])
+    )
+    if merged is None or len(merged) != watermark[0]:
+        return None
+
+    return merged
+
+
+response_matrix_cache = ResponseMatrixDiskCache()
@@ -0,0 +1,56 @@
+import os
+import threading
+from collections import OrderedDict
+
+# The maximum number of questionnaires whose results are kept in memory
+QUESTIONNAIRE_RESULTS_CACHE_SIZE = int(
+    os.getenv("QUESTIONNAIRE_RESULTS_CACHE_SIZE", 64)
+)
+
+
+# QuestionnaireResultsCache is a process-wide LRU cache of the computed
+# results of a questionnaire. Each entry is stored with the version of the
+# data that it was computed from, such as the data-version watermark of
+# the submitted responses or the modification time of a stored snapshot,
+# and it is only returned while the version stays the same.
+class QuestionnaireResultsCache:
+
+    def __init__(
+        self,
+        max_questionnaires: int = QUESTIONNAIRE_RESULTS_CACHE_SIZE
+    ):
+        self.max_questionnaires = max_questionnaires
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    '''
+    The get function returns the results of the questionnaire
+    if they have been computed for the watermark, or None.
+    '''
+    def get(self, questionnaire_id: str, watermark):
+        with self._lock:
+            entry = self._entries.get(questionnaire_id)
+            if entry is None or entry[0] != watermark:
+                return None
+            self._entries.move_to_end(questionnaire_id)
+            return entry[1]
+
+    '''
+    The set function stores the results of the questionnaire
+    for the watermark, replacing the ones of any older watermark.
+    '''
+    def set(self, questionnaire_id: str, watermark, results):
+        with self._lock:
+            self._entries[questionnaire_id] = (watermark, results)
+            self._entries.move_to_end(questionnaire_id)
+
+            while len(self._entries) > self.max_questionnaires:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, questionnaire_id: str):
+        with self._lock:
+            self._entries.pop(questionnaire_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,638 @@
+import dataclasses
+import fcntl
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from utils.analytics_pool import analytics_pool
+from utils.app_storage import APP_STORAGE_DIR, private_directory
+from utils.concurrent_fetch import gather_fetches
+from utils.logger_config import logger
+from utils.questionnaire_scoring import (
+    compute_questionnaire_results,
+    MIN_SPEARMAN_RESPONSES,
+    LabelHistogram,
+    ConstructHistograms,
+    CategoryTotals,
+    CorrelationTable,
+    SpearmanMatrix,
+    ConstructReliability,
+    QuestionnaireResults
+)
+from utils.response_matrix_cache import (
+    STALE_WRITE_SECONDS,
+    ResponseMatrixDiskCache,
+    refresh_response_matrix,
+    response_matrix_cache
+)
+from utils.results_cache import (
+    QuestionnaireResultsCache,
+    QUESTIONNAIRE_RESULTS_CACHE_SIZE
+)
+
+# The directory of the results' snapshots, shared by every process
+# of the host, and the disk space that the snapshots can take up
+RESULTS_SNAPSHOT_DIR = os.getenv(
+    "RESULTS_SNAPSHOT_DIR",
+    os.path.join(APP_STORAGE_DIR, "results_snapshots")
+)
+RESULTS_SNAPSHOT_BYTES = int(os.getenv("RESULTS_SNAPSHOT_BYTES", 256 << 20))
+
+# The version of the snapshots' format. The snapshots that have been
+# stored with another version get ignored and rebuilt.
+RESULTS_SNAPSHOT_VERSION = 2
+
+
+# ResultsSnapshot is the computed results of a questionnaire with the
+# data-version watermark of the submitted responses that they have been
+# computed from and the time that their data has started to be retrieved,
+# which orders the snapshots by the freshness of their data.
+# The results hold both the numbers and the data of every chart
+# of the results page.
+# A snapshot is complete when the submitted answers could be retrieved,
+# so its reliability and Spearman analysis are not missing.
+@dataclass(frozen=True)
+class ResultsSnapshot:
+    watermark: tuple
+    computed_at: datetime
+    results: QuestionnaireResults
+    complete: bool
+
+
+# The dataclasses that a stored snapshot can be made of
+_SNAPSHOT_TYPES = {
+    snapshot_type.__name__: snapshot_type
+    for snapshot_type in (
+        ResultsSnapshot,
+        QuestionnaireResults,
+        LabelHistogram,
+        ConstructHistograms,
+        CategoryTotals,
+        CorrelationTable,
+        SpearmanMatrix,
+        ConstructReliability
+    )
+}
+
+
+'''
+The encode_snapshot function turns a ResultsSnapshot into plain JSON
+values. The dataclasses, tuples, dictionaries, arrays, DataFrames and
+datetimes become objects tagged with their type, so decode_snapshot
+rebuilds the same snapshot, and only the types that a snapshot is
+made of can be decoded.
+'''
+
+
+def encode_snapshot(value):
+
+    if _SNAPSHOT_TYPES.get(type(value).__name__) is type(value):
+        return {
+            "type": type(value).__name__,
+            "fields": {
+                field.name: encode_snapshot(getattr(value, field.name))
+                for field in dataclasses.fields(value)
+            }
+        }
+    if isinstance(value, tuple):
+        return {
+            "type": "tuple",
+            "items": [encode_snapshot(item) for item in value]
+        }
+    if isinstance(value, list):
+        return [encode_snapshot(item) for item in value]
+    if isinstance(value, dict):
+        return {
+            "type": "dict",
+            "items": {
+                str(key): encode_snapshot(item)
+                for key, item in value.items()
+            }
+        }
+    if isinstance(value, np.ndarray):
+        return {
+            "type": "ndarray",
+            "dtype": value.dtype.str,
+            "items": value.tolist()
+        }
+    if isinstance(value, pd.DataFrame):
+        return {
+            "type": "DataFrame",
+            "columns": {
+                str(column): value[column].tolist()
+                for column in value.columns
+            }
+        }
+    if isinstance(value, datetime):
+        return {"type": "datetime", "value": value.isoformat()}
+    if isinstance(value, np.generic):
+        return value.item()
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+
+    raise TypeError(f"{type(value).__name__} can not be stored")
+
+
+'''
+The decode_snapshot function rebuilds the ResultsSnapshot that
+encode_snapshot has turned into JSON values. It raises a ValueError
+or a TypeError if the values are not a snapshot.
+'''
+
+
+def decode_snapshot(value):
+
+    if isinstance(value, list):
+        return [decode_snapshot(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+
+    value_type = value["type"]
+    if value_type in _SNAPSHOT_TYPES:
+        return _SNAPSHOT_TYPES[value_type](**{
+            name: decode_snapshot(field)
+            for name, field in value["fields"].items()
+        })
+    if value_type == "tuple":
+        return tuple(decode_snapshot(item) for item in value["items"])
+    if value_type == "dict":
+        return {
+            key: decode_snapshot(item)
+            for key, item in value["items"].items()
+        }
+    if value_type == "ndarray":
+        return np.array(value["items"], dtype=np.dtype(value["dtype"]))
+    if value_type == "DataFrame":
+        return pd.DataFrame(value["columns"])
+    if value_type == "datetime":
+        return datetime.fromisoformat(value["value"])
+
+    raise ValueError(f"{value_type} is not a part of a snapshot")
+
+
+# ResultsSnapshotStore is a host-wide store of the latest ResultsSnapshot
+# of each questionnaire, kept on disk as a JSON file per questionnaire,
+# so the results page shows the results of a questionnaire without
+# computing them, whatever process serves it. The files hold plain data,
+# which get decoded into the snapshot's dataclasses only, and the
+# directory gets used only while it is private to the app's user.
+# A snapshot gets written to a temporary file and renamed into place,
+# so the readers never see a partial snapshot. The snapshots that have
+# been read are kept in memory until their file gets replaced.
+# The access time of a file is its snapshot's last use, and the least
+# recently used snapshots get deleted when the store exceeds its disk
+# budget.
+class ResultsSnapshotStore:
+
+    def __init__(
+        self,
+        directory: str = RESULTS_SNAPSHOT_DIR,
+        max_questionnaires: int = QUESTIONNAIRE_RESULTS_CACHE_SIZE,
+        max_bytes: int = RESULTS_SNAPSHOT_BYTES
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._loaded = QuestionnaireResultsCache(max_questionnaires)
+
+    '''
+    The get_latest function returns the latest ResultsSnapshot
+    of the questionnaire, whatever its watermark, or None.
+    '''
+    def get_latest(self, questionnaire_id: str):
+        try:
+            private_directory(self.directory)
+            snapshot_file = open(self._path(questionnaire_id), "rb")
+        except OSError:
+            return None
+
+        with snapshot_file:
+            # the file is read through its descriptor, so its
+            # modification time is the one of the snapshot that gets read
+            # even if the file gets replaced meanwhile
+            modified = os.fstat(snapshot_file.fileno()).st_mtime_ns
+            try:
+                os.utime(
+                    snapshot_file.fileno(),
+                    ns=(time.time_ns(), modified)
+                )
+            except OSError:
+                pass
+
+            snapshot = self._loaded.get(questionnaire_id, modified)
+            if snapshot is not None:
+                return snapshot
+
+            try:
+                stored = json.load(snapshot_file)
+                if stored["version"] != RESULTS_SNAPSHOT_VERSION:
+                    return None
+                snapshot = decode_snapshot(stored["snapshot"])
+            except (ValueError, TypeError, KeyError):
+                # the snapshot has been stored by an incompatible version
+                return None
+
+        if not isinstance(snapshot, ResultsSnapshot):
+            return None
+
+        self._loaded.set(questionnaire_id, modified, snapshot)
+        return snapshot
+
+    '''
+    The set function stores the snapshot as the latest one
+    of the questionnaire, replacing the previous one, and evicts
+    the least recently used snapshots over the disk budget.
+    A snapshot whose data is not newer than the stored one's does not
+    get stored, so a slow rebuild never replaces a newer snapshot.
+    The check and the replacement hold a lock on the directory,
+    which the other processes of the host wait for.
+    '''
+    def set(self, questionnaire_id: str, snapshot: ResultsSnapshot):
+        try:
+            private_directory(self.directory)
+            descriptor, temporary_path = tempfile.mkstemp(
+                prefix=".",
+                dir=self.directory
+            )
+        except OSError:
+            # the snapshot just does not get stored
+            return
+
+        try:
+            with os.fdopen(descriptor, "w") as snapshot_file:
+                json.dump(
+                    {
+                        "version": RESULTS_SNAPSHOT_VERSION,
+                        "snapshot": encode_snapshot(snapshot)
+                    },
+                    snapshot_file
+                )
+
+            lock = os.open(self.directory, os.O_RDONLY)
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                stored = self.get_latest(questionnaire_id)
+                if (
+                    stored is not None
+                    and stored.computed_at >= snapshot.computed_at
+                ):
+                    os.remove(temporary_path)
+                    return
+                os.replace(temporary_path, self._path(questionnaire_id))
+            finally:
+                os.close(lock)
+
+            self._loaded.set(
+                questionnaire_id,
+                os.stat(self._path(questionnaire_id)).st_mtime_ns,
+                snapshot
+            )
+        except OSError:
+            # the disk is full
+            try:
+                os.remove(temporary_path)
+            except OSError:
+                pass
+
+        self._evict()
+
+    '''
+    The invalidate function deletes the snapshot of the questionnaire.
+    '''
+    def invalidate(self, questionnaire_id: str):
+        self._loaded.invalidate(questionnaire_id)
+        try:
+            os.remove(self._path(questionnaire_id))
+        except OSError:
+            pass
+
+    def clear(self):
+        self._loaded.clear()
+        try:
+            entries = os.listdir(self.directory)
+        except OSError:
+            return
+        for entry in entries:
+            try:
+                os.remove(os.path.join(self.directory, entry))
+            except OSError:
+                pass
+
+    def _path(self, questionnaire_id: str):
+        return os.path.join(self.directory, f"{questionnaire_id}.json")
+
+    def _evict(self):
+        try:
+            entries = os.listdir(self.directory)
+        except OSError:
+            return
+
+        now = time.time()
+        snapshots = []
+        for entry in entries:
+            path = os.path.join(self.directory, entry)
+            try:
+                status = os.stat(path)
+                if not entry.startswith("."):
+                    snapshots.append(
+                        (status.st_atime_ns, status.st_size, path)
+                    )
+                elif now - status.st_mtime > STALE_WRITE_SECONDS:
+                    # an interrupted write has left it behind
+                    os.remove(path)
+            except OSError:
+                continue
+
+        total = sum(size for _, size, _ in snapshots)
+        for _, size, path in sorted(snapshots):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+
+'''
+The compute_snapshot_results function computes the results of
+a questionnaire in a worker of the analytics pool. When the
+stored_matrix is given, as the directory of a response matrices' cache,
+the questionnaire's id and the watermark, the worker reads the
+ResponseMatrix off that cache instead of getting it pickled from the
+calling process. It returns the results and whether they have been
+computed with a ResponseMatrix, which the stored one may no longer be.
+'''
+
+
+def compute_snapshot_results(
+    title: str,
+    answer_label_counts: list,
+    category_scores: list,
+    likert_scale_options: list,
+    category_means: dict | None,
+    response_matrix,
+    stored_matrix: tuple | None = None
+):
+
+    if stored_matrix is not None:
+        directory, questionnaire_id, watermark = stored_matrix
+        response_matrix = ResponseMatrixDiskCache(directory).get(
+            questionnaire_id,
+            watermark
+        )
+
+    results = compute_questionnaire_results(
+        title,
+        answer_label_counts,
+        category_scores,
+        likert_scale_options,
+        category_means,
+        response_matrix
+    )
+    return results, response_matrix is not None
+
+
+'''
+The build_results_snapshot function retrieves the data of a questionnaire
+and computes its results for the watermark of its submitted responses.
+
+The independent fetches run concurrently. The submitted answers get
+aggregated by the database for the histograms and the TAM score, and
+they are only retrieved, as compact (response, question, value) tuples,
+for the reliability and the Spearman analysis. The ResponseMatrix of the
+submitted answers is shared on disk by all the processes of the host,
+including the worker that computes the results.
+If it has been stored for an older watermark, only the responses
+submitted or deleted since its synced_at get retrieved and merged into it.
+
+The auth_header is the one of the session's client, which is needed
+when the function runs outside of the session's script.
+It returns None if the questionnaire's data could not be retrieved,
+or if the analytics pool could not compute its results.
+'''
+
+
+def build_results_snapshot(
+    questionnaire_id: str,
+    watermark,
+    repos,
+    auth_header: str | None = None
+):
+
+    # the snapshot is as fresh as the data that its retrieval gets
+    computed_at = datetime.now(timezone.utc)
+
+    cached = response_matrix_cache.get_latest(questionnaire_id)
+    response_matrix = None
+    if cached is not None and cached.watermark == watermark:
+        response_matrix = cached.matrix
+    elif cached is not None and cached.synced_at is None:
+        cached = None
+
+    fetches = [
+        lambda repos: repos.questionnaires.get_questionnaire_by_id(
+            questionnaire_id
+        ),
+        lambda repos: (
+            repos.likert_scales.get_likert_scale_by_questionnaire_id(
+                questionnaire_id
+            )
+        ),
+        lambda repos: repos.answers.get_submitted_answer_label_counts(
+            questionnaire_id
+        ),
+        lambda repos: repos.answers.get_submitted_category_scores(
+            questionnaire_id
+        )
+    ]
+    if response_matrix is None:
+        fetches.append(
+            lambda repos: repos.answers.get_submitted_answer_values(
+                questionnaire_id,
+                cached.synced_at if cached is not None else None
+            )
+        )
+
+    try:
+        (
+            questionnaire_info,
+            likert_scale_info,
+            answer_label_counts,
+            category_scores,
+            *submitted_answers
+        ) = gather_fetches(*fetches, auth_header=auth_header)
+    except RuntimeError as e:
+        logger.error(f"Database error: {e}")
+        return None
+
+    if None in (
+        questionnaire_info,
+        likert_scale_info,
+        answer_label_counts,
+        category_scores
+    ):
+        return None
+
+    likert_scale_options = None
+    try:
+        likert_scale_options = (
+            repos.likert_scale_options.
+            get_options_by_likert_scale_id(
+                likert_scale_info.data[0]["id"]
+            )
+        )
+    except RuntimeError as e:
+        logger.error(f"Database error: {e}")
+        return None
+
+    # The submitted answers get joined with their questions into
+    # a ResponseMatrix, which the reliability and the Spearman
+    # analysis both use. The category means of the responses are
+    # only fetched for the Spearman analysis when the answers
+    # could not be.
+    category_means = None
+    if submitted_answers and submitted_answers[0] is not None:
+        answer_values = submitted_answers[0].data
+        del submitted_answers
+        response_matrix = refresh_response_matrix(
+            answer_values,
+            watermark,
+            cached
+        )
+
+        # The merged responses did not add up,
+        # so the answers get retrieved whole.
+        if response_matrix is None:
+            try:
+                answer_values = (
+                    repos.answers.get_submitted_answer_values(
+                        questionnaire_id
+                    ).data
+                )
+                response_matrix = refresh_response_matrix(
+                    answer_values,
+                    watermark
+                )
+            except RuntimeError as e:
+                logger.error(f"Database error: {e}")
+
+        if response_matrix is not None:
+            response_matrix_cache.set(
+                questionnaire_id,
+                watermark,
+                response_matrix,
+                answer_values["synced_at"]
+            )
+    elif (
+        response_matrix is None
+        and watermark[0] >= MIN_SPEARMAN_RESPONSES
+    ):
+        try:
+            category_means = (
+                repos.responses.get_all_responses_category_means(
+                    questionnaire_id
+                ).data
+            )
+        except RuntimeError as e:
+            logger.error(f"Database error: {e}")
+
+    # The results get computed by a worker process of the analytics pool,
+    # so they do not slow down the scripts of the other sessions.
+    # The worker reads a stored ResponseMatrix off the cache by itself,
+    # and only a matrix that could not be stored gets sent to it.
+    stored_matrix = None
+    if (
+        response_matrix is not None
+        and response_matrix_cache.get(questionnaire_id, watermark)
+        is not None
+    ):
+        stored_matrix = (
+            response_matrix_cache.directory,
+            questionnaire_id,
+            watermark
+        )
+        response_matrix = None
+
+    try:
+        results, complete = analytics_pool.run(
+            compute_snapshot_results,
+            questionnaire_info.data[0]["title"],
+            answer_label_counts.data,
+            category_scores.data,
+            likert_scale_options.data,
+            category_means,
+            response_matrix,
+            stored_matrix
+        )
+    except RuntimeError as e:
+        logger.error(f"Analytics error: {e}")
+        return None
+
+    return ResultsSnapshot(watermark, computed_at, results, complete)
+
+
+_rebuilding = set()
+_rebuilding_lock = threading.Lock()
+
+
+'''
+The rebuild_results_snapshot function builds the snapshot of
+a questionnaire's results in a background thread and stores it
+if it is complete. A questionnaire gets rebuilt by a single thread
+of the process at a time, and the function returns False
+without starting another one if it is already being rebuilt.
+'''
+
+
+def rebuild_results_snapshot(
+    questionnaire_id: str,
+    watermark,
+    repos,
+    auth_header: str
+):
+
+    with _rebuilding_lock:
+        if questionnaire_id in _rebuilding:
+            return False
+        _rebuilding.add(questionnaire_id)
+
+    def rebuild():
+        try:
+            snapshot = build_results_snapshot(
+                questionnaire_id,
+                watermark,
+                repos,
+                auth_header
+            )
+            if snapshot is not None and snapshot.complete:
+                results_snapshots.set(questionnaire_id, snapshot)
+        except Exception as e:
+            logger.error(f"Failed to rebuild the results' snapshot: {e}")
+        finally:
+            with _rebuilding_lock:
+                _rebuilding.discard(questionnaire_id)
+
+    threading.Thread(target=rebuild, daemon=True).start()
+    return True
+
+
+'''
+The invalidate_questionnaire_results function deletes the stored
+snapshot and response matrices of a questionnaire that has been deleted,
+so its results do not stay on disk.
+'''
+
+
+def invalidate_questionnaire_results(questionnaire_id: str):
+    results_snapshots.invalidate(questionnaire_id)
+    response_matrix_cache.invalidate(questionnaire_id)
+
+
+results_snapshots = ResultsSnapshotStore()
@@ -0,0 +1,671 @@
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
+
+import numpy as np
+from scipy.sparse import csc_matrix
+from scipy.stats import rankdata, t as t_distribution
+
+
+# ScoringArrays holds the submitted answers of a questionnaire as
+# NumPy arrays, one element per answer. The categories, the responses
+# and the questions are stored as integer codes that index the categories,
+# response_ids and question_ids lists, so the answers can be scattered
+# into a ResponseMatrix at once. question_rows holds the index of the first
+# answer of each question in the answers that the arrays came from.
+class ScoringArrays:
+
+    def __init__(
+        self,
+        categories: list,
+        response_ids: list,
+        question_ids: list,
+        category_codes: np.ndarray,
+        response_codes: np.ndarray,
+        question_codes: np.ndarray,
+        values: np.ndarray,
+        is_negative: np.ndarray,
+        question_rows: np.ndarray
+    ):
+        self.categories = categories
+        self.response_ids = response_ids
+        self.question_ids = question_ids
+        self.category_codes = category_codes
+        self.response_codes = response_codes
+        self.question_codes = question_codes
+        self.values = values
+        self.is_negative = is_negative
+        self.question_rows = question_rows
+
+    def __len__(self):
+        return len(self.values)
+
+
+'''
+The answers_to_arrays function turns the submitted answers' rows
+(answers with their questions and likert_scale_options) into
+ScoringArrays.
+Only the ids and the value of an answer are read from every row:
+the category and the wording of a question are taken from its first
+answer and spread over the others by its code, as they are the same
+on all of them.
+The categories' order is the one of their first appearance,
+unless a categories list is given, in which case the answers
+of any other category are left out.
+'''
+
+
+def answers_to_arrays(answers: list, categories: list | None = None):
+
+    response_ids, response_codes = _codes(
+        list(map(itemgetter("response_id"), answers))
+    )
+    question_ids, question_codes = _codes(
+        list(map(itemgetter("question_id"), answers))
+    )
+    values = np.fromiter(
+        map(
+            itemgetter("value"),
+            map(itemgetter("likert_scale_options"), answers)
+        ),
+        dtype=np.int16,
+        count=len(answers)
+    )
+
+    # the codes are given by first appearance, so the first answer of
+    # each question is where the running maximum of the codes grows
+    question_rows = np.flatnonzero(
+        np.diff(np.maximum.accumulate(question_codes), prepend=-1)
+    )
+    questions = [answers[row]["questions"] for row in question_rows]
+
+    if categories is None:
+        categories = list(dict.fromkeys(
+            question["category"] for question in questions
+        ))
+
+    category_index = {category: i for i, category in enumerate(categories)}
+    category_codes = np.array(
+        [
+            category_index.get(question["category"], -1)
+            for question in questions
+        ],
+        dtype=np.int32
+    )[question_codes]
+    is_negative = np.array(
+        [bool(question["is_negative"]) for question in questions],
+        dtype=bool
+    )[question_codes]
+
+    kept = category_codes >= 0
+    if not kept.all():
+        category_codes = category_codes[kept]
+        response_codes = response_codes[kept]
+        question_codes = question_codes[kept]
+        values = values[kept]
+        is_negative = is_negative[kept]
+
+    return ScoringArrays(
+        list(categories),
+        response_ids,
+        question_ids,
+        category_codes,
+        response_codes,
+        question_codes,
+        values,
+        is_negative,
+        question_rows
+    )
+
+
+def _codes(names: list):
+    index = {name: i for i, name in enumerate(dict.fromkeys(names))}
+    return list(index), np.fromiter(
+        map(index.__getitem__, names),
+        dtype=np.int32,
+        count=len(names)
+    )
+
+
+# ResponseMatrix holds the submitted answers of a questionnaire as a dense
+# responses x questions int8 matrix with the value of each selected option,
+# MISSING where a response has not answered a question. The questions'
+# metadata are arrays over its columns, with the categories stored as codes
+# that index the categories list. An answer takes a single byte instead of
+# the nested dictionaries of its row, and every statistic is an operation
+# over the matrix's rows or columns.
+class ResponseMatrix:
+
+    MISSING = 0
+
+    def __init__(
+        self,
+        response_ids: list,
+        question_ids: list,
+        categories: list,
+        values: np.ndarray,
+        question_categories: np.ndarray,
+        is_negative: np.ndarray,
+        is_custom: np.ndarray,
+        question_texts: list
+    ):
+        self.response_ids = response_ids
+        self.question_ids = question_ids
+        self.categories = categories
+        self.values = values
+        self.question_categories = question_categories
+        self.is_negative = is_negative
+        self.is_custom = is_custom
+        self.question_texts = question_texts
+
+    def __len__(self):
+        return len(self.response_ids)
+
+    @property
+    def nbytes(self):
+        return (
+            self.values.nbytes
+            + self.question_categories.nbytes
+            + self.is_negative.nbytes
+            + self.is_custom.nbytes
+        )
+
+
+'''
+The response_matrix_from_answers function builds a ResponseMatrix
+from the submitted answers' rows (answers with their questions
+and likert_scale_options), taking the questions' metadata
+from the first answer of each question.
+'''
+
+
+def response_matrix_from_answers(
+    answers: list,
+    categories: list | None = None
+):
+
+    arrays = answers_to_arrays(answers, categories)
+
+    questions = [
+        {
+            "id": question_id,
+            **answers[row]["questions"]
+        }
+        for question_id, row in zip(arrays.question_ids, arrays.question_rows)
+    ]
+    matrix = np.full(
+        (len(arrays.response_ids), len(questions)),
+        ResponseMatrix.MISSING,
+        dtype=np.int8
+    )
+    matrix[arrays.response_codes, arrays.question_codes] = arrays.values
+
+    return _response_matrix(
+        arrays.response_ids,
+        questions,
+        arrays.categories,
+        matrix
+    )
+
+
+'''
+The response_matrix_from_values function builds a ResponseMatrix from the
+normalized answers that get_submitted_answer_values retrieves: the
+questions and the responses' ids as side tables and the answers as
+(response, question, value) tuples, sent as three arrays, where response
+and question are positions in the side tables.
+The side tables get joined with the answers in memory, so every
+question's metadata is only decoded once.
+'''
+
+
+def response_matrix_from_values(
+    answer_values: dict,
+    categories: list | None = None
+):
+
+    questions = answer_values["questions"]
+    response_ids = answer_values["response_ids"]
+
+    if categories is None:
+        categories = list(dict.fromkeys(
+            question["category"] for question in questions
+        ))
+
+    answers = answer_values["answers"]
+
+    matrix = np.full(
+        (len(response_ids), len(questions)),
+        ResponseMatrix.MISSING,
+        dtype=np.int8
+    )
+    matrix[
+        np.array(answers["responses"], dtype=np.int64),
+        np.array(answers["questions"], dtype=np.int64)
+    ] = np.array(answers["values"], dtype=np.int8)
+
+    return _response_matrix(
+        list(response_ids),
+        questions,
+        list(categories),
+        matrix
+    )
+
+
+'''
+The merge_response_matrices function returns the ResponseMatrix of
+a matrix updated with the responses of an update matrix, without
+the responses whose ids are in deleted_response_ids.
+The responses of the update that the matrix already has are skipped.
+It returns None if the two matrices do not have the same questions,
+as their answers can not be merged.
+'''
+
+
+def merge_response_matrices(
+    matrix: ResponseMatrix,
+    update: ResponseMatrix,
+    deleted_response_ids: list
+):
+
+    if list(update.question_ids) != list(matrix.question_ids):
+        return None
+
+    response_ids, values = list(matrix.response_ids), matrix.values
+
+    deleted = set(deleted_response_ids)
+    if deleted:
+        kept = np.fromiter(
+            (response_id not in deleted for response_id in response_ids),
+            dtype=bool,
+            count=len(response_ids)
+        )
+        response_ids = [
+            response_id
+            for response_id in response_ids
+            if response_id not in deleted
+        ]
+        values = values[kept]
+
+    known = set(response_ids) | deleted
+    new = [
+        i
+        for i, response_id in enumerate(update.response_ids)
+        if response_id not in known
+    ]
+
+    return ResponseMatrix(
+        response_ids + [update.response_ids[i] for i in new],
+        list(matrix.question_ids),
+        list(matrix.categories),
+        np.concatenate([values, update.values[new]]),
+        np.asarray(matrix.question_categories),
+        np.asarray(matrix.is_negative),
+        np.asarray(matrix.is_custom),
+        list(matrix.question_texts)
+    )
+
+
+def _response_matrix(response_ids, questions, categories, matrix):
+    category_index = {category: i for i, category in enumerate(categories)}
+
+    return ResponseMatrix(
+        response_ids,
+        [question["id"] for question in questions],
+        categories,
+        matrix,
+        np.fromiter(
+            (
+                category_index.get(question["category"], -1)
+                for question in questions
+            ),
+            dtype=np.int32,
+            count=len(questions)
+        ),
+        np.array(
+            [bool(question["is_negative"]) for question in questions],
+            dtype=bool
+        ),
+        np.array(
+            [bool(question.get("is_custom")) for question in questions],
+            dtype=bool
+        ),
+        [question.get("question_text") for question in questions]
+    )
+
+
+'''
+The matrix_scores function returns the responses x questions matrix
+of the scores, with the negatively worded questions reversed
+(scale_levels + 1 - value), NaN where a response has not answered.
+'''
+
+
+def matrix_scores(matrix: ResponseMatrix, scale_levels: int):
+    scores = np.where(
+        matrix.is_negative,
+        scale_levels + 1 - matrix.values.astype(np.float64),
+        matrix.values
+    )
+    scores[matrix.values == ResponseMatrix.MISSING] = np.nan
+    return scores
+
+
+'''
+The matrix_category_totals function returns the sum of the scores and
+the number of answers of each category, in the order of
+matrix.categories.
+'''
+
+
+def matrix_category_totals(matrix: ResponseMatrix, scale_levels: int):
+    scores = matrix_scores(matrix, scale_levels)
+    kept = matrix.question_categories >= 0
+
+    total_scores = np.bincount(
+        matrix.question_categories[kept],
+        weights=np.nansum(scores[:, kept], axis=0),
+        minlength=len(matrix.categories)
+    ).astype(np.int64)
+    count_answers = np.bincount(
+        matrix.question_categories[kept],
+        weights=(matrix.values[:, kept] != ResponseMatrix.MISSING).sum(axis=0),
+        minlength=len(matrix.categories)
+    ).astype(np.int64)
+
+    return total_scores, count_answers
+
+
+'''
+The matrix_category_means function returns a responses x categories
+matrix with the mean score of each response on each category,
+NaN where a response has not answered a category.
+'''
+
+
+def matrix_category_means(matrix: ResponseMatrix, scale_levels: int):
+    scores = matrix_scores(matrix, scale_levels)
+    answered = ~np.isnan(scores)
+    scores[~answered] = 0
+
+    # a questions x categories indicator, so the sums of every response
+    # over the questions of every category are a single matrix product
+    kept = matrix.question_categories >= 0
+    membership = np.zeros((len(matrix.question_ids), len(matrix.categories)))
+    membership[np.flatnonzero(kept), matrix.question_categories[kept]] = 1
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (scores @ membership) / (answered @ membership)
+
+
+'''
+The matrix_label_counts function returns a questions x levels matrix
+with the number of times that each level of the likert scale
+(1 to scale_levels) has been selected on each question.
+'''
+
+
+def matrix_label_counts(matrix: ResponseMatrix, scale_levels: int):
+    n_questions = len(matrix.question_ids)
+    cells = (
+        matrix.values.astype(np.int64)
+        + np.arange(n_questions) * (scale_levels + 1)
+    )
+    counts = np.bincount(
+        cells.ravel(),
+        minlength=n_questions * (scale_levels + 1)
+    ).reshape(n_questions, scale_levels + 1)
+
+    return counts[:, 1:]
+
+
+'''
+The cronbach_reliability function computes the internal consistency
+of a scale from a responses x items matrix of scores, over the responses
+that have answered all the items: Cronbach's alpha, the alpha of the
+scale without each item and the corrected item-total correlation
+of each item (its correlation with the sum of the other items).
+All of them come from the items' variances and their covariances with
+the total score, so the matrix gets centered and multiplied once.
+'''
+
+
+def cronbach_reliability(items: np.ndarray):
+    items = np.asarray(items, dtype=np.float64)
+    items = items[~np.isnan(items).any(axis=1)]
+    n, k = items.shape
+
+    if n < 2 or k < 2:
+        return np.nan, np.full(k, np.nan), np.full(k, np.nan), n
+
+    centered = items - items.mean(axis=0)
+    total = centered.sum(axis=1)
+
+    item_variances = (centered * centered).sum(axis=0) / (n - 1)
+    total_variance = total @ total / (n - 1)
+    # the covariance of each item with the total score
+    item_total_covariances = total @ centered / (n - 1)
+
+    # the variance of the total score without each item,
+    # and the covariance of each item with it
+    rest_variances = (
+        total_variance - 2 * item_total_covariances + item_variances
+    )
+    rest_covariances = item_total_covariances - item_variances
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        alpha = k / (k - 1) * (1 - item_variances.sum() / total_variance)
+
+        if k > 2:
+            alpha_if_deleted = (k - 1) / (k - 2) * (
+                1 - (item_variances.sum() - item_variances) / rest_variances
+            )
+        else:
+            # a scale of a single item has no internal consistency
+            alpha_if_deleted = np.full(k, np.nan)
+
+        item_total = rest_covariances / np.sqrt(
+            item_variances * rest_variances
+        )
+
+    return float(alpha), alpha_if_deleted, item_total, n
+
+
+'''
+The spearman_matrix function ranks every column of a
+responses x constructs matrix once and computes the Spearman r and
+two-sided p values of all the column pairs in one matrix operation,
+the same way scipy.stats.spearmanr does for a single pair.
+The pairs of a column with missing values get NaN, as spearmanr
+propagates them.
+'''
+
+
+def spearman_matrix(values: np.ndarray):
+    values = np.asarray(values, dtype=np.float64)
+    n, n_columns = values.shape
+
+    complete = ~np.isnan(values).any(axis=0)
+
+    ranks = rankdata(values[:, complete], axis=0)
+    ranks -= ranks.mean(axis=0)
+    norms = np.sqrt((ranks * ranks).sum(axis=0))
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        complete_r = (ranks.T @ ranks) / np.outer(norms, norms)
+    complete_r = np.clip(complete_r, -1.0, 1.0)
+
+    r = np.full((n_columns, n_columns), np.nan)
+    r[np.ix_(complete, complete)] = complete_r
+
+    degrees_of_freedom = n - 2
+    with np.errstate(invalid="ignore", divide="ignore"):
+        t = r * np.sqrt(degrees_of_freedom / ((1.0 - r) * (1.0 + r)))
+    p = 2 * t_distribution.sf(np.abs(t), degrees_of_freedom)
+
+    return r, p
+
+
+'''
+The resample_spearman function computes the Spearman matrices of a batch
+of bootstrap resamples at once. The resamples are given as an index matrix
+(one row of response indexes per resample). Each resample is turned into
+the number of times that every response got drawn, so its ranks come from
+counting the drawn values of every level (levels_onehot is a sparse
+matrix that maps each response to the dense value level of each column)
+instead of sorting,
+and its correlations from a weighted matrix product over the responses.
+'''
+
+
+def resample_spearman(
+    levels_onehot: csc_matrix,
+    level_positions: np.ndarray,
+    n_columns: int,
+    indexes: np.ndarray
+):
+    n_resamples, n = indexes.shape
+
+    draws = np.bincount(
+        (indexes + np.arange(n_resamples)[:, None] * n).ravel(),
+        minlength=n_resamples * n
+    ).reshape(n_resamples, n).astype(np.float32)
+
+    counts = (levels_onehot.T @ draws.T).T.reshape(n_resamples, n_columns, -1)
+
+    # the average rank of every level: the number of smaller values
+    # plus the mean position among the equal ones, centered on the mean
+    level_ranks = np.cumsum(counts, axis=2) - counts + (counts + 1) / 2
+    level_ranks -= (n + 1) / 2
+
+    ranks = np.take(
+        level_ranks.reshape(n_resamples, -1),
+        level_positions,
+        axis=1
+    ).reshape(n_resamples, n_columns, n)
+
+    covariance = (ranks * draws[:, None, :]) @ ranks.transpose(0, 2, 1)
+    deviations = np.sqrt(np.diagonal(covariance, axis1=1, axis2=2))
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return covariance / (
+            deviations[:, :, None] * deviations[:, None, :]
+        )
+
+
+'''
+The bootstrap_chunk_size function returns the number of resamples
+that resample_spearman can take at once within memory_bytes, from the
+bytes that a resample of n responses over n_columns columns takes:
+its float32 ranks and their weighted copy for every cell, and its
+indexes, bincount and draws for every response.
+'''
+
+
+def bootstrap_chunk_size(n: int, n_columns: int, memory_bytes: int):
+    resample_bytes = n * (8 * n_columns + 24)
+    return max(1, memory_bytes // resample_bytes)
+
+
+def _bootstrap_chunk(codes, n_levels, n_resamples, seed, memory_bytes):
+    n, n_columns = codes.shape
+    chunk_size = bootstrap_chunk_size(n, n_columns, memory_bytes)
+
+    level_positions = codes + np.arange(n_columns) * n_levels
+    levels_onehot = csc_matrix(
+        (
+            np.ones(n * n_columns, dtype=np.float32),
+            (np.repeat(np.arange(n), n_columns), level_positions.ravel())
+        ),
+        shape=(n, n_columns * n_levels)
+    )
+    level_positions = level_positions.T.ravel()
+
+    rng = np.random.default_rng(seed)
+    matrices = []
+    for start in range(0, n_resamples, chunk_size):
+        size = min(chunk_size, n_resamples - start)
+        indexes = rng.integers(0, n, size=(size, n))
+        matrices.append(
+            resample_spearman(
+                levels_onehot,
+                level_positions,
+                n_columns,
+                indexes
+            )
+        )
+    return np.concatenate(matrices)
+
+
+'''
+The bootstrap_spearman_intervals function returns the lower and upper
+bounds of the percentile bootstrap confidence intervals of the Spearman r
+between all the column pairs of a responses x constructs matrix.
+
+The resamples get drawn with the seed, in batches that take at most
+memory_bytes each, and get spread over a pool of processes when
+processes is more than 1, each of them with its own memory_bytes.
+The pairs of a column with missing values get NaN.
+'''
+
+
+def bootstrap_spearman_intervals(
+    values: np.ndarray,
+    n_resamples: int = 2000,
+    seed: int | None = None,
+    confidence: float = 0.95,
+    processes: int = 1,
+    memory_bytes: int = 256 * 2**20
+):
+    values = np.asarray(values, dtype=np.float64)
+    n, n_columns = values.shape
+
+    low = np.full((n_columns, n_columns), np.nan)
+    high = np.full((n_columns, n_columns), np.nan)
+
+    complete = ~np.isnan(values).any(axis=0)
+    if n < 3 or not complete.any():
+        return low, high
+
+    # every column's values become dense codes 0..levels-1
+    codes = np.empty((n, int(complete.sum())), dtype=np.int64)
+    for i, column in enumerate(values[:, complete].T):
+        codes[:, i] = np.unique(column, return_inverse=True)[1].ravel()
+    n_levels = int(codes.max()) + 1
+
+    seeds = np.random.SeedSequence(seed).spawn(max(processes, 1))
+    shares = [
+        len(share)
+        for share in np.array_split(np.arange(n_resamples), len(seeds))
+    ]
+
+    if processes > 1:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            matrices = np.concatenate(list(executor.map(
+                _bootstrap_chunk,
+                [codes] * len(seeds),
+                [n_levels] * len(seeds),
+                shares,
+                seeds,
+                [memory_bytes] * len(seeds)
+            )))
+    else:
+        matrices = _bootstrap_chunk(
+            codes,
+            n_levels,
+            n_resamples,
+            seeds[0],
+            memory_bytes
+        )
+
+    alpha = (1 - confidence) / 2 * 100
+    with np.errstate(invalid="ignore"):
+        complete_low, complete_high = np.nanpercentile(
+            matrices,
+            [alpha, 100 - alpha],
+            axis=0
+        )
+
+    low[np.ix_(complete, complete)] = complete_low
+    high[np.ix_(complete, complete)] = complete_high
+
+    return low, high
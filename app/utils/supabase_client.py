@@ -1,12 +1,57 @@
 import os
+import asyncio
+import threading
+import httpx
 import streamlit as st
-from supabase import create_client, Client
+from dotenv import load_dotenv
+from supabase import (
+    create_client,
+    Client,
+    ClientOptions,
+    AsyncClient,
+    AsyncClientOptions
+)
+
+# The environment vars are getting loaded for the whole process of the app
+load_dotenv()
+
+# The limits of the HTTP connection pool that all the sessions share
+SUPABASE_MAX_CONNECTIONS = int(os.getenv("SUPABASE_MAX_CONNECTIONS", 100))
+SUPABASE_MAX_KEEPALIVE_CONNECTIONS = int(
+    os.getenv("SUPABASE_MAX_KEEPALIVE_CONNECTIONS", 20)
+)
+SUPABASE_HTTP_TIMEOUT = float(os.getenv("SUPABASE_HTTP_TIMEOUT", 30))
+
+
+'''
+The get_http_client() function returns the pooled HTTP transport
+of the app's process. It is created once and shared by the supabase
+clients of all the sessions, so they reuse the same connections
+instead of opening a pool each.
+The transport keeps no auth state, the session's auth is sent
+as a header on every request by the session's client.
+'''
+
+
+@st.cache_resource
+def get_http_client() -> httpx.Client:
+    return httpx.Client(
+        http2=True,
+        follow_redirects=True,
+        timeout=SUPABASE_HTTP_TIMEOUT,
+        limits=httpx.Limits(
+            max_connections=SUPABASE_MAX_CONNECTIONS,
+            max_keepalive_connections=SUPABASE_MAX_KEEPALIVE_CONNECTIONS
+        )
+    )
 
 
 '''
 The init_client() retrieves the supabase_url and anon_key
 from environment vars, so it can initialize and store in
-session_state a new supabase client
+session_state a new supabase client.
+The client holds only the session's auth and sends its requests
+through the shared HTTP transport.
 '''
 
 
@@ -14,7 +59,11 @@ def init_client() -> Client:
     supabase_url = os.getenv("SUPABASE_URL")
     anon_key = os.getenv("ANON_KEY")
 
-    client: Client = create_client(supabase_url, anon_key)
+    client: Client = create_client(
+        supabase_url,
+        anon_key,
+        ClientOptions(httpx_client=get_http_client())
+    )
     st.session_state["supabase"] = client
     return client
 
@@ -22,7 +71,7 @@ def init_client() -> Client:
 '''
 The get_client() function checks if there is a supabase client
 stored in the app's session state, if there isn't, the init_client()
-function is called.s
+function is called.
 '''
 
 
@@ -30,3 +79,58 @@ def get_client() -> Client:
     if "supabase" not in st.session_state:
         init_client()
     return st.session_state["supabase"]
+
+
+'''
+The get_event_loop() function returns the event loop of the app's process
+that runs the async queries. The loop runs forever in a daemon thread,
+so the script runs of all the sessions can submit their queries to it.
+'''
+
+
+@st.cache_resource
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return loop
+
+
+'''
+The get_async_http_client() function returns the pooled async HTTP
+transport of the app's process, which is shared by the async clients
+of all the sessions. It must only be used on the get_event_loop() loop.
+'''
+
+
+@st.cache_resource
+def get_async_http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        http2=True,
+        follow_redirects=True,
+        timeout=SUPABASE_HTTP_TIMEOUT,
+        limits=httpx.Limits(
+            max_connections=SUPABASE_MAX_CONNECTIONS,
+            max_keepalive_connections=SUPABASE_MAX_KEEPALIVE_CONNECTIONS
+        )
+    )
+
+
+'''
+The init_async_client() function initializes an async supabase client
+that carries the auth_header of a session's client
+and sends its requests through the shared async HTTP transport.
+'''
+
+
+def init_async_client(auth_header: str) -> AsyncClient:
+    supabase_url = os.getenv("SUPABASE_URL")
+    anon_key = os.getenv("ANON_KEY")
+
+    return AsyncClient(
+        supabase_url,
+        anon_key,
+        AsyncClientOptions(
+            headers={"Authorization": auth_header},
+            httpx_client=get_async_http_client()
+        )
+    )
@@ -0,0 +1,341 @@
+import math
+
+# The Vega-Lite specs of the results page's charts. Each spec function
+# takes the same data as the matching draw function of questionnaire_charts
+# and returns a spec that looks like its matplotlib chart, which the
+# browser draws instead of the server rasterizing it.
+
+# The color of matplotlib's bars
+BAR_COLOR = "#1f77b4"
+
+# The pixels of an inch of a matplotlib figure's height
+PIXELS_PER_INCH = 72
+
+# The look of matplotlib's default style: framed charts without a grid
+# and with regular titles
+MATPLOTLIB_CONFIG = {
+    "axis": {
+        "grid": False,
+        "domainColor": "black",
+        "tickColor": "black",
+        "labelColor": "black",
+        "titleFontWeight": "normal"
+    },
+    "view": {"stroke": "black"},
+    "title": {"fontWeight": "normal", "fontSize": 14}
+}
+
+
+'''
+The finite function returns the value, or None if it is NaN,
+as NaN is not valid JSON.
+'''
+
+
+def finite(value):
+    return None if math.isnan(value) else value
+
+
+'''
+The bar_layers function returns the layers of a bar chart with
+the value of each bar written above it, or below it if it is negative.
+'''
+
+
+def bar_layers(y_field: str, text_format: str, color=None):
+
+    bar = {"type": "bar", "width": {"band": 0.8}}
+    if color is None:
+        bar["color"] = BAR_COLOR
+
+    text = {"type": "text", "dy": -6, "color": "black"}
+
+    encoding = {"text": {"field": y_field, "format": text_format}}
+    if color is not None:
+        bar_encoding = {
+            "color": {"field": color, "type": "nominal", "scale": None}
+        }
+    else:
+        bar_encoding = {}
+
+    return [
+        {"mark": bar, "encoding": bar_encoding},
+        {
+            "mark": text,
+            "transform": [{"filter": f"datum['{y_field}'] >= 0"}],
+            "encoding": encoding
+        },
+        {
+            "mark": {**text, "dy": 6, "baseline": "top"},
+            "transform": [{"filter": f"datum['{y_field}'] < 0"}],
+            "encoding": encoding
+        }
+    ]
+
+
+'''
+The total_score_bar_chart_spec function returns the spec
+of the TAM score bar chart.
+'''
+
+
+def total_score_bar_chart_spec(
+    abbreviations: tuple,
+    values: tuple,
+    max_score
+):
+
+    return {
+        "config": MATPLOTLIB_CONFIG,
+        "title": "TAM Score Contribution by Category",
+        "height": 4 * PIXELS_PER_INCH,
+        "data": {
+            "values": [
+                {"category": abbreviation, "score": value}
+                for abbreviation, value in zip(abbreviations, values)
+            ]
+        },
+        "encoding": {
+            "x": {
+                "field": "category",
+                "type": "nominal",
+                "sort": None,
+                "title": None,
+                "axis": {"labelAngle": 0}
+            },
+            "y": {
+                "field": "score",
+                "type": "quantitative",
+                "title": None,
+                "scale": {"domain": [0, max_score + 50]},
+                "axis": {"tickMinStep": 1}
+            }
+        },
+        "layer": bar_layers("score", "d")
+    }
+
+
+'''
+The category_answers_bar_chart_spec function returns the spec
+of a question's or a construct's answers bar chart.
+'''
+
+
+def category_answers_bar_chart_spec(
+    title: str,
+    x_vals: tuple,
+    y_vals: tuple
+):
+
+    return {
+        "config": MATPLOTLIB_CONFIG,
+        "title": title,
+        "height": 2 * PIXELS_PER_INCH,
+        "data": {
+            "values": [
+                {"label": label, "count": count}
+                for label, count in zip(x_vals, y_vals)
+            ]
+        },
+        "encoding": {
+            "x": {
+                "field": "label",
+                "type": "nominal",
+                "sort": None,
+                "title": None,
+                "axis": {"labelAngle": 0}
+            },
+            "y": {
+                "field": "count",
+                "type": "quantitative",
+                "title": None,
+                "scale": {"domain": [0, max(y_vals) + 5]},
+                "axis": {"tickMinStep": 1}
+            }
+        },
+        "layer": bar_layers("count", "d")
+    }
+
+
+'''
+The spearman_by_response_spec function returns the spec of the bar chart
+of the r values, with their bootstrap confidence intervals if they exist.
+'''
+
+
+def spearman_by_response_spec(
+    labels: tuple,
+    r_values: tuple,
+    ci_low: tuple,
+    ci_high: tuple
+):
+
+    rows = []
+    for label, r, low, high in zip(labels, r_values, ci_low, ci_high):
+        if r < -0.5:
+            color = "red"
+        elif -0.5 <= r < 0:
+            color = "pink"
+        elif 0 <= r < 0.5:
+            color = "lightgreen"
+        else:
+            color = "green"
+
+        row = {"pair": label, "r": finite(r), "color": color}
+        if not math.isnan(low):
+            row["low"] = min(low, r)
+            row["high"] = max(high, r)
+        rows.append(row)
+
+    layers = bar_layers("r", ".2f", "color")
+    if any("low" in row for row in rows):
+        layers.append({
+            "mark": {
+                "type": "errorbar",
+                "ticks": {"size": 10},
+                "color": "black",
+                "thickness": 2
+            },
+            "encoding": {
+                "y": {"field": "low", "type": "quantitative"},
+                "y2": {"field": "high"}
+            }
+        })
+    layers.append({
+        "mark": {"type": "rule", "color": "black", "strokeWidth": 0.8},
+        "encoding": {
+            "x": {"value": 0},
+            "x2": {"value": "width"},
+            "y": {"datum": 0}
+        }
+    })
+
+    return {
+        "config": MATPLOTLIB_CONFIG,
+        "title": "Spearman correlations between predictors and responses",
+        "height": 3 * PIXELS_PER_INCH,
+        "data": {"values": rows},
+        "encoding": {
+            "x": {
+                "field": "pair",
+                "type": "nominal",
+                "sort": None,
+                "title": None,
+                "axis": {"labelAngle": 0}
+            },
+            "y": {
+                "field": "r",
+                "type": "quantitative",
+                "title": "Spearman r",
+                "scale": {"domain": [-1.1, 1.1]}
+            }
+        },
+        "layer": layers
+    }
+
+
+'''
+The pvalue_rows_spec function returns the spec
+of the bar chart of the p values.
+'''
+
+
+def pvalue_rows_spec(labels: tuple, p_values: tuple):
+
+    max_p_decimal_part = (
+        str(max(p_values)).split(".")[1]
+        if "." in str(max(p_values))
+        else ""
+    )
+
+    if max_p_decimal_part.startswith("00"):
+        padding = 0.001
+    else:
+        padding = 0.1
+
+    return {
+        "config": MATPLOTLIB_CONFIG,
+        "title": "Spearman p-values for predictors and responses",
+        "height": 3 * PIXELS_PER_INCH,
+        "data": {
+            "values": [
+                {
+                    "pair": label,
+                    "p": p,
+                    "color": "green" if p < 0.05 else "red"
+                }
+                for label, p in zip(labels, p_values)
+            ]
+        },
+        "encoding": {
+            "x": {
+                "field": "pair",
+                "type": "nominal",
+                "sort": None,
+                "title": None,
+                "axis": {"labelAngle": 0}
+            },
+            "y": {
+                "field": "p",
+                "type": "quantitative",
+                "title": "p-value",
+                "scale": {"domain": [0, max(p_values) + padding]}
+            }
+        },
+        "layer": bar_layers("p", ".4f", "color")
+    }
+
+
+'''
+The spearman_heatmap_spec function returns the spec of the heatmap
+of the Spearman r values between all the constructs.
+'''
+
+
+def spearman_heatmap_spec(constructs: tuple, r: tuple, n: int):
+
+    size = max(4, len(constructs) * 0.6) * PIXELS_PER_INCH
+    axis = {"type": "nominal", "sort": list(constructs)}
+
+    return {
+        "config": MATPLOTLIB_CONFIG,
+        "title": f"Spearman correlations between constructs (n={n})",
+        "width": size,
+        "height": size,
+        "data": {
+            "values": [
+                {"row": row, "column": column, "r": finite(r[i][j])}
+                for i, row in enumerate(constructs)
+                for j, column in enumerate(constructs)
+            ]
+        },
+        "encoding": {
+            "x": {
+                **axis,
+                "field": "column",
+                "title": None,
+                "axis": {"labelAngle": -45}
+            },
+            "y": {**axis, "field": "row", "title": None}
+        },
+        "layer": [
+            {
+                "mark": "rect",
+                "encoding": {
+                    "color": {
+                        "field": "r",
+                        "type": "quantitative",
+                        "title": "Spearman r",
+                        "scale": {
+                            "scheme": "redyellowgreen",
+                            "domain": [-1, 1]
+                        }
+                    }
+                }
+            },
+            {
+                "mark": {"type": "text", "fontSize": 8, "color": "black"},
+                "encoding": {"text": {"field": "r", "format": ".2f"}}
+            }
+        ]
+    }
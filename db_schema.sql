@@ -5,8 +5,8 @@ create table profiles (
     id uuid primary key references auth.users(id),
     full_name text not null,
     birthdate date,
-    created_at default now(),
-    updated_at default now(),
+    created_at timestamptz default now(),
+    updated_at timestamptz default now(),
     city text,
     country text
 );
@@ -15,7 +15,7 @@ create table questionnaires (
     id uuid primary key default gen_random_uuid(),
     title text not null,
     details text,
-    created_at default now(),
+    created_at timestamptz default now(),
     created_by uuid references public.profiles(id) ON DELETE CASCADE
 );
 
@@ -52,10 +52,103 @@ create table responses (
 create table answers (
     id uuid primary key default gen_random_uuid(),
     response_id uuid references public.responses(id) ON DELETE CASCADE,
-    question_id uuid references public.questions(id),
-    selected_option uuid references public.likert_scale_options(id)
+    question_id uuid references public.questions(id) ON DELETE CASCADE,
+    selected_option uuid
+        references public.likert_scale_options(id) ON DELETE CASCADE,
+    unique (response_id, question_id)
 );
 
+-- The submitted responses that have been deleted, which the incremental
+-- refresh of the results drops from its cached answers
+create table deleted_responses (
+    response_id uuid primary key,
+    questionnaire_id uuid not null,
+    deleted_at timestamptz not null default now()
+);
+
+-- Rollups of the submitted answers, which the triggers below keep up to
+-- date, so the results page reads a row per question and option and
+-- a row per category instead of all the answers
+
+-- The number of times that each likert scale option has been selected
+-- on each question by the submitted responses
+create table question_option_counts (
+    question_id uuid references public.questions(id) ON DELETE CASCADE,
+    option_id uuid
+        references public.likert_scale_options(id) ON DELETE CASCADE,
+    answer_count bigint not null default 0,
+    primary key (question_id, option_id)
+);
+
+-- The total score, the number of answers and the number of responses
+-- of the submitted answers on each category of each questionnaire
+create table questionnaire_category_stats (
+    questionnaire_id uuid
+        references public.questionnaires(id) ON DELETE CASCADE,
+    category text,
+    total_score bigint not null default 0,
+    count_answers bigint not null default 0,
+    count_responses bigint not null default 0,
+    primary key (questionnaire_id, category)
+);
+
+-- The total score and the number of answers of each submitted response
+-- on each category it has answers on, from which the category means of
+-- the responses are computed for the Spearman analysis, and through which
+-- the responses get counted once on each category
+create table response_category_stats (
+    response_id uuid references public.responses(id) ON DELETE CASCADE,
+    questionnaire_id uuid not null,
+    category text,
+    total_score bigint not null default 0,
+    count_answers bigint not null default 0,
+    primary key (response_id, category)
+);
+
+-- Definition of indexes for the hot query paths,
+-- the RLS EXISTS subqueries and the ON DELETE CASCADE chains
+
+CREATE INDEX answers_question_id_idx
+ON public.answers (question_id);
+
+CREATE INDEX answers_selected_option_idx
+ON public.answers (selected_option);
+
+CREATE INDEX questions_questionnaire_id_position_idx
+ON public.questions (questionnaire_id, position);
+
+CREATE INDEX likert_scales_questionnaire_id_idx
+ON public.likert_scales (questionnaire_id);
+
+CREATE INDEX likert_scale_options_likert_scale_id_value_idx
+ON public.likert_scale_options (likert_scale_id, value);
+
+CREATE INDEX responses_user_id_questionnaire_id_is_submitted_idx
+ON public.responses (user_id, questionnaire_id, is_submitted);
+
+CREATE INDEX responses_questionnaire_id_is_submitted_idx
+ON public.responses (questionnaire_id, is_submitted);
+
+CREATE INDEX responses_submitted_at_id_idx
+ON public.responses (submitted_at DESC NULLS LAST, id DESC)
+WHERE is_submitted;
+
+CREATE INDEX questionnaires_created_by_idx
+ON public.questionnaires (created_by);
+
+CREATE INDEX responses_questionnaire_id_submitted_at_idx
+ON public.responses (questionnaire_id, submitted_at)
+WHERE is_submitted;
+
+CREATE INDEX deleted_responses_questionnaire_id_deleted_at_idx
+ON public.deleted_responses (questionnaire_id, deleted_at);
+
+CREATE INDEX question_option_counts_option_id_idx
+ON public.question_option_counts (option_id);
+
+CREATE INDEX response_category_stats_questionnaire_id_idx
+ON public.response_category_stats (questionnaire_id);
+
 -- Activation of Row-Level Security for each table
 
 ALTER TABLE public.profiles ENABLE ROW LEVEL SECURITY;
@@ -65,6 +158,10 @@ ALTER TABLE public.likert_scales ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.likert_scale_options ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.responses ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.answers ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.deleted_responses ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.question_option_counts ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.questionnaire_category_stats ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.response_category_stats ENABLE ROW LEVEL SECURITY;
 
 -- Definition of RLS Policies
 
@@ -238,58 +335,721 @@ WITH CHECK (
     )
 );
 
-CREATE OR REPLACE FUNCTION get_all_response_category_means(q_id_param UUID)
+CREATE OR REPLACE FUNCTION get_questionnaires_without_user_response(user_id_param UUID)
+RETURNS SETOF public.questionnaires
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+BEGIN
+    RETURN QUERY
+    SELECT q.*
+    FROM public.questionnaires q
+    WHERE NOT EXISTS (
+        SELECT 1
+        FROM public.responses r
+        WHERE r.questionnaire_id = q.id
+          AND r.user_id = user_id_param
+    );
+END;
+$$;
+
+
+
+
+
+
+
+
+
+-- Tracking of the deleted submitted responses (for the results' refresh)
+
+-- Records every deleted submitted response. The responses that get deleted
+-- along with their questionnaire are not recorded, as their questionnaire
+-- is already gone when the cascade reaches them.
+CREATE OR REPLACE FUNCTION record_deleted_response()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+BEGIN
+    IF OLD.is_submitted AND EXISTS (
+        SELECT 1
+        FROM public.questionnaires q
+        WHERE q.id = OLD.questionnaire_id
+    ) THEN
+        INSERT INTO public.deleted_responses (response_id, questionnaire_id)
+        VALUES (OLD.id, OLD.questionnaire_id)
+        ON CONFLICT (response_id) DO NOTHING;
+    END IF;
+    RETURN OLD;
+END;
+$$;
+
+CREATE TRIGGER responses_record_deleted_response
+AFTER DELETE ON public.responses
+FOR EACH ROW
+EXECUTE FUNCTION record_deleted_response();
+
+-- Maintenance of the rollups of the submitted answers
+
+-- Adds (sign 1) or removes (sign -1) all the answers of a response
+-- to or from the rollups of its questionnaire. The responses that get
+-- deleted along with their questionnaire are skipped, as their
+-- rollups get deleted with it.
+CREATE OR REPLACE FUNCTION apply_response_to_rollups(
+    response_id_param UUID,
+    questionnaire_id_param UUID,
+    sign INTEGER
+)
+RETURNS VOID
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+DECLARE
+    scale_levels INTEGER;
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1
+        FROM public.questionnaires q
+        WHERE q.id = questionnaire_id_param
+    ) THEN
+        RETURN;
+    END IF;
+
+    -- Negatively worded answers are reversed on the questionnaire's scale
+    SELECT COUNT(*) INTO scale_levels
+    FROM public.likert_scale_options lso
+    JOIN public.likert_scales ls ON lso.likert_scale_id = ls.id
+    WHERE ls.questionnaire_id = questionnaire_id_param;
+
+    INSERT INTO public.question_option_counts AS c (
+        question_id,
+        option_id,
+        answer_count
+    )
+    SELECT a.question_id, a.selected_option, sign * COUNT(*)
+    FROM public.answers a
+    WHERE a.response_id = response_id_param
+      AND a.selected_option IS NOT NULL
+    GROUP BY a.question_id, a.selected_option
+    ON CONFLICT (question_id, option_id)
+    DO UPDATE SET answer_count = c.answer_count + excluded.answer_count;
+
+    INSERT INTO public.questionnaire_category_stats AS s (
+        questionnaire_id,
+        category,
+        total_score,
+        count_answers,
+        count_responses
+    )
+    SELECT
+        questionnaire_id_param,
+        q.category,
+        sign * SUM(
+            CASE
+                WHEN q.is_negative THEN scale_levels + 1 - lso.value
+                ELSE lso.value
+            END
+        ),
+        sign * COUNT(*),
+        sign
+    FROM public.answers a
+    JOIN public.questions q ON a.question_id = q.id
+    JOIN public.likert_scale_options lso ON a.selected_option = lso.id
+    WHERE a.response_id = response_id_param
+    GROUP BY q.category
+    ON CONFLICT (questionnaire_id, category)
+    DO UPDATE SET
+        total_score = s.total_score + excluded.total_score,
+        count_answers = s.count_answers + excluded.count_answers,
+        count_responses = s.count_responses + excluded.count_responses;
+
+    IF sign < 0 THEN
+        DELETE FROM public.response_category_stats s
+        WHERE s.response_id = response_id_param;
+        RETURN;
+    END IF;
+
+    INSERT INTO public.response_category_stats AS s (
+        response_id,
+        questionnaire_id,
+        category,
+        total_score,
+        count_answers
+    )
+    SELECT
+        response_id_param,
+        questionnaire_id_param,
+        q.category,
+        SUM(
+            CASE
+                WHEN q.is_negative THEN scale_levels + 1 - lso.value
+                ELSE lso.value
+            END
+        ),
+        COUNT(*)
+    FROM public.answers a
+    JOIN public.questions q ON a.question_id = q.id
+    JOIN public.likert_scale_options lso ON a.selected_option = lso.id
+    WHERE a.response_id = response_id_param
+    GROUP BY q.category
+    ON CONFLICT (response_id, category)
+    DO UPDATE SET
+        total_score = excluded.total_score,
+        count_answers = excluded.count_answers;
+END;
+$$;
+
+-- Adds (sign 1) or removes (sign -1) a single answer of a submitted
+-- response to or from the rollups of its questionnaire. The answers of
+-- drafts are skipped, as their response gets added whole on its
+-- submission, and so are the ones that get deleted along with their
+-- response or questionnaire. A response counts once on each category
+-- from its first answer on it, which inserts its row in the responses'
+-- rollups, until its last one gets removed, which deletes that row.
+CREATE OR REPLACE FUNCTION apply_answer_to_rollups(
+    response_id_param UUID,
+    question_id_param UUID,
+    option_id_param UUID,
+    sign INTEGER
+)
+RETURNS VOID
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+DECLARE
+    questionnaire_id_value UUID;
+    scale_levels INTEGER;
+    category_value TEXT;
+    score INTEGER;
+    response_answers BIGINT;
+    response_count INTEGER := 0;
+BEGIN
+    IF option_id_param IS NULL THEN
+        RETURN;
+    END IF;
+
+    SELECT r.questionnaire_id INTO questionnaire_id_value
+    FROM public.responses r
+    JOIN public.questionnaires q ON r.questionnaire_id = q.id
+    WHERE r.id = response_id_param
+      AND r.is_submitted = TRUE;
+
+    IF NOT FOUND THEN
+        RETURN;
+    END IF;
+
+    SELECT COUNT(*) INTO scale_levels
+    FROM public.likert_scale_options lso
+    JOIN public.likert_scales ls ON lso.likert_scale_id = ls.id
+    WHERE ls.questionnaire_id = questionnaire_id_value;
+
+    SELECT
+        q.category,
+        CASE
+            WHEN q.is_negative THEN scale_levels + 1 - lso.value
+            ELSE lso.value
+        END
+    INTO category_value, score
+    FROM public.questions q
+    JOIN public.likert_scale_options lso ON lso.id = option_id_param
+    WHERE q.id = question_id_param;
+
+    IF NOT FOUND THEN
+        RETURN;
+    END IF;
+
+    INSERT INTO public.question_option_counts AS c (
+        question_id,
+        option_id,
+        answer_count
+    )
+    VALUES (question_id_param, option_id_param, sign)
+    ON CONFLICT (question_id, option_id)
+    DO UPDATE SET answer_count = c.answer_count + excluded.answer_count;
+
+    INSERT INTO public.response_category_stats AS s (
+        response_id,
+        questionnaire_id,
+        category,
+        total_score,
+        count_answers
+    )
+    VALUES (
+        response_id_param,
+        questionnaire_id_value,
+        category_value,
+        sign * score,
+        sign
+    )
+    ON CONFLICT (response_id, category)
+    DO UPDATE SET
+        total_score = s.total_score + excluded.total_score,
+        count_answers = s.count_answers + excluded.count_answers
+    RETURNING s.count_answers INTO response_answers;
+
+    IF response_answers = 0 THEN
+        DELETE FROM public.response_category_stats s
+        WHERE s.response_id = response_id_param
+          AND s.category = category_value;
+        response_count := -1;
+    ELSIF sign > 0 AND response_answers = 1 THEN
+        response_count := 1;
+    END IF;
+
+    INSERT INTO public.questionnaire_category_stats AS s (
+        questionnaire_id,
+        category,
+        total_score,
+        count_answers,
+        count_responses
+    )
+    VALUES (
+        questionnaire_id_value,
+        category_value,
+        sign * score,
+        sign,
+        response_count
+    )
+    ON CONFLICT (questionnaire_id, category)
+    DO UPDATE SET
+        total_score = s.total_score + excluded.total_score,
+        count_answers = s.count_answers + excluded.count_answers,
+        count_responses = s.count_responses + excluded.count_responses;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION responses_rollups_trigger()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        IF OLD.is_submitted THEN
+            PERFORM apply_response_to_rollups(
+                OLD.id,
+                OLD.questionnaire_id,
+                -1
+            );
+        END IF;
+        RETURN OLD;
+    END IF;
+
+    IF TG_OP = 'UPDATE' AND OLD.is_submitted THEN
+        PERFORM apply_response_to_rollups(OLD.id, OLD.questionnaire_id, -1);
+    END IF;
+    IF NEW.is_submitted THEN
+        PERFORM apply_response_to_rollups(NEW.id, NEW.questionnaire_id, 1);
+    END IF;
+    RETURN NEW;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION answers_rollups_trigger()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM apply_answer_to_rollups(
+            OLD.response_id,
+            OLD.question_id,
+            OLD.selected_option,
+            -1
+        );
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM apply_answer_to_rollups(
+            NEW.response_id,
+            NEW.question_id,
+            NEW.selected_option,
+            1
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+-- A deleted response gets removed from the rollups before its answers
+-- get deleted along with it
+CREATE TRIGGER responses_delete_rollups
+BEFORE DELETE ON public.responses
+FOR EACH ROW
+EXECUTE FUNCTION responses_rollups_trigger();
+
+CREATE TRIGGER responses_submit_rollups
+AFTER INSERT OR UPDATE OF is_submitted, questionnaire_id ON public.responses
+FOR EACH ROW
+WHEN (NEW.is_submitted)
+EXECUTE FUNCTION responses_rollups_trigger();
+
+CREATE TRIGGER responses_unsubmit_rollups
+AFTER UPDATE OF is_submitted, questionnaire_id ON public.responses
+FOR EACH ROW
+WHEN (OLD.is_submitted AND NOT NEW.is_submitted)
+EXECUTE FUNCTION responses_rollups_trigger();
+
+CREATE TRIGGER answers_rollups
+AFTER INSERT OR UPDATE OR DELETE ON public.answers
+FOR EACH ROW
+EXECUTE FUNCTION answers_rollups_trigger();
+
+-- Aggregations of the submitted answers for the results page (for admins),
+-- read from their rollups
+
+CREATE OR REPLACE FUNCTION get_submitted_answer_label_counts(q_id_param UUID)
 RETURNS TABLE (
-    response_id UUID,
     category TEXT,
-    mean_score NUMERIC
-) 
+    question_id UUID,
+    question_text TEXT,
+    is_custom BOOL,
+    label TEXT,
+    value INTEGER,
+    answer_count BIGINT
+)
 LANGUAGE plpgsql
 SECURITY DEFINER
 AS $$
 BEGIN
+    IF coalesce(auth.jwt() -> 'app_metadata' ->> 'role', '') <> 'admin' THEN
+        RAISE EXCEPTION 'Only admins can aggregate the submitted answers';
+    END IF;
+
     RETURN QUERY
-    SELECT 
-        a.response_id, 
-        q.category, 
-        AVG(
-            CASE 
-                WHEN q.is_negative THEN 6 - lso.value 
-                ELSE lso.value 
-            END
-        )::NUMERIC AS mean_score 
-    FROM public.answers a 
-    JOIN public.questions q ON a.question_id = q.id 
-    JOIN public.likert_scale_options lso ON a.selected_option = lso.id 
-    JOIN public.responses r ON a.response_id = r.id 
-    WHERE q.questionnaire_id = q_id_param 
-      AND r.is_submitted = TRUE 
-    GROUP BY a.response_id, q.category;
+    SELECT
+        q.category,
+        q.id,
+        q.question_text,
+        q.is_custom,
+        lso.label,
+        lso.value,
+        c.answer_count
+    FROM public.question_option_counts c
+    JOIN public.questions q ON c.question_id = q.id
+    JOIN public.likert_scale_options lso ON c.option_id = lso.id
+    WHERE q.questionnaire_id = q_id_param
+      AND c.answer_count > 0
+    ORDER BY q.position, lso.value;
 END;
 $$;
 
-CREATE OR REPLACE FUNCTION get_questionnaires_without_user_response(user_id_param UUID)
-RETURNS SETOF public.questionnaires
+CREATE OR REPLACE FUNCTION get_submitted_category_scores(q_id_param UUID)
+RETURNS TABLE (
+    category TEXT,
+    total_score BIGINT,
+    count_answers BIGINT,
+    count_responses BIGINT
+)
 LANGUAGE plpgsql
 SECURITY DEFINER
 AS $$
 BEGIN
+    IF coalesce(auth.jwt() -> 'app_metadata' ->> 'role', '') <> 'admin' THEN
+        RAISE EXCEPTION 'Only admins can aggregate the submitted answers';
+    END IF;
+
     RETURN QUERY
-    SELECT q.*
-    FROM public.questionnaires q
-    WHERE NOT EXISTS (
-        SELECT 1
+    SELECT
+        s.category,
+        s.total_score,
+        s.count_answers,
+        s.count_responses
+    FROM public.questionnaire_category_stats s
+    WHERE s.questionnaire_id = q_id_param
+      AND s.count_answers > 0;
+END;
+$$;
+
+-- Returns the category means of every submitted response of a
+-- questionnaire as a single JSON document, pivoted to a responses x
+-- categories matrix: the categories, sorted by name, and the response
+-- ids are sent once, and the means are a row of numbers per response,
+-- null where it has not answered a category. The means are read from
+-- the responses' rollups, in which the negatively worded answers have
+-- been reversed on the questionnaire's scale.
+CREATE OR REPLACE FUNCTION get_response_category_means(q_id_param UUID)
+RETURNS JSON
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+DECLARE
+    categories TEXT[];
+    result JSON;
+BEGIN
+    IF coalesce(auth.jwt() -> 'app_metadata' ->> 'role', '') <> 'admin' THEN
+        RAISE EXCEPTION 'Only admins can aggregate the submitted answers';
+    END IF;
+
+    SELECT coalesce(array_agg(DISTINCT s.category ORDER BY s.category), '{}')
+    INTO categories
+    FROM public.response_category_stats s
+    WHERE s.questionnaire_id = q_id_param
+      AND s.count_answers > 0;
+
+    SELECT json_build_object(
+        'categories', to_json(categories),
+        'response_ids',
+            coalesce(json_agg(m.response_id ORDER BY m.response_id), '[]'),
+        'means', coalesce(json_agg(m.means ORDER BY m.response_id), '[]')
+    )
+    INTO result
+    FROM (
+        SELECT
+            r.response_id,
+            json_agg(
+                s.total_score::FLOAT8 / s.count_answers
+                ORDER BY c.position
+            ) AS means
+        FROM (
+            SELECT DISTINCT s.response_id
+            FROM public.response_category_stats s
+            WHERE s.questionnaire_id = q_id_param
+              AND s.count_answers > 0
+        ) r
+        CROSS JOIN unnest(categories) WITH ORDINALITY AS c(category, position)
+        LEFT JOIN public.response_category_stats s
+            ON s.response_id = r.response_id
+           AND s.category = c.category
+           AND s.count_answers > 0
+        GROUP BY r.response_id
+    ) m;
+
+    RETURN result;
+END;
+$$;
+
+-- Returns the submitted answers of a questionnaire as a single JSON
+-- document. The questions, the likert scale options and the ids of the
+-- submitted responses are sent once as side tables, and every answer is
+-- a (response, question, value) tuple, where response and question are
+-- positions in the response_ids and questions side tables. The tuples
+-- are sent column-wise, as three arrays of numbers.
+-- Being a single value, the document is never truncated by the
+-- PostgREST's max-rows limit.
+-- Given the synced_at of a previous document, only the responses that
+-- have been submitted since then get returned, along with the ids of the
+-- submitted responses that have been deleted since then. Both windows
+-- start a minute before synced_at, so the transactions that have
+-- committed late are not missed; the caller skips the responses that
+-- it already has.
+CREATE OR REPLACE FUNCTION get_submitted_answer_values(
+    q_id_param UUID,
+    since_param TIMESTAMPTZ DEFAULT NULL
+)
+RETURNS JSON
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+DECLARE
+    result JSON;
+    since TIMESTAMPTZ := since_param - INTERVAL '1 minute';
+BEGIN
+    IF coalesce(auth.jwt() -> 'app_metadata' ->> 'role', '') <> 'admin' THEN
+        RAISE EXCEPTION 'Only admins can retrieve the submitted answers';
+    END IF;
+
+    WITH submitted AS (
+        SELECT
+            r.id,
+            row_number() OVER (ORDER BY r.submitted_at, r.id) - 1 AS position
         FROM public.responses r
-        WHERE r.questionnaire_id = q.id
-          AND r.user_id = user_id_param
-    );
+        WHERE r.questionnaire_id = q_id_param
+          AND r.is_submitted = TRUE
+          AND (since IS NULL OR r.submitted_at > since)
+    ),
+    questionnaire_questions AS (
+        SELECT
+            q.*,
+            row_number() OVER (ORDER BY q.position, q.id) - 1
+                AS column_position
+        FROM public.questions q
+        WHERE q.questionnaire_id = q_id_param
+    )
+    SELECT json_build_object(
+        'synced_at', now(),
+        'deleted_response_ids', (
+            SELECT coalesce(json_agg(d.response_id), '[]')
+            FROM public.deleted_responses d
+            WHERE since IS NOT NULL
+              AND d.questionnaire_id = q_id_param
+              AND d.deleted_at > since
+        ),
+        'questions', (
+            SELECT coalesce(
+                json_agg(
+                    json_build_object(
+                        'id', q.id,
+                        'category', q.category,
+                        'question_text', q.question_text,
+                        'is_custom', q.is_custom,
+                        'is_negative', q.is_negative
+                    )
+                    ORDER BY q.column_position
+                ),
+                '[]'
+            )
+            FROM questionnaire_questions q
+        ),
+        'options', (
+            SELECT coalesce(
+                json_agg(
+                    json_build_object(
+                        'id', lso.id,
+                        'value', lso.value,
+                        'label', lso.label
+                    )
+                    ORDER BY lso.value
+                ),
+                '[]'
+            )
+            FROM public.likert_scale_options lso
+            JOIN public.likert_scales ls ON lso.likert_scale_id = ls.id
+            WHERE ls.questionnaire_id = q_id_param
+        ),
+        'response_ids', (
+            SELECT coalesce(json_agg(s.id ORDER BY s.position), '[]')
+            FROM submitted s
+        ),
+        'answers', (
+            SELECT json_build_object(
+                'responses', coalesce(
+                    json_agg(
+                        s.position
+                        ORDER BY s.position, q.column_position
+                    ),
+                    '[]'
+                ),
+                'questions', coalesce(
+                    json_agg(
+                        q.column_position
+                        ORDER BY s.position, q.column_position
+                    ),
+                    '[]'
+                ),
+                'values', coalesce(
+                    json_agg(
+                        lso.value
+                        ORDER BY s.position, q.column_position
+                    ),
+                    '[]'
+                )
+            )
+            FROM public.answers a
+            JOIN submitted s ON a.response_id = s.id
+            JOIN questionnaire_questions q ON a.question_id = q.id
+            JOIN public.likert_scale_options lso ON a.selected_option = lso.id
+        )
+    ) INTO result;
+
+    RETURN result;
 END;
 $$;
 
+-- Transactional submission of a response and its answers (for users)
+
+-- Writes a user's response and all of its answers in a single transaction.
+-- The response is keyed by its id, which the client generates for a new
+-- response, so a retried call never creates a second response.
+-- Drafts can have unanswered questions, while a submission needs all the
+-- questions answered. A submitted response is final, so submitting it
+-- again returns it unchanged.
+CREATE OR REPLACE FUNCTION submit_response(
+    response_id_param UUID,
+    questionnaire_id_param UUID,
+    answers_param JSONB,
+    is_submitted_param BOOL
+)
+RETURNS SETOF public.responses
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    current_response public.responses;
+BEGIN
+    IF auth.uid() IS NULL THEN
+        RAISE EXCEPTION 'Only authenticated users can submit responses';
+    END IF;
+
+    SELECT * INTO current_response
+    FROM public.responses r
+    WHERE r.id = response_id_param;
 
+    IF FOUND THEN
+        IF current_response.user_id <> auth.uid()
+           OR current_response.questionnaire_id <> questionnaire_id_param THEN
+            RAISE EXCEPTION 'The response does not belong to the user';
+        END IF;
 
+        IF current_response.is_submitted THEN
+            IF is_submitted_param THEN
+                RETURN NEXT current_response;
+                RETURN;
+            END IF;
+            RAISE EXCEPTION 'The response has already been submitted';
+        END IF;
 
+        -- Concurrent writes of the same draft get serialized
+        PERFORM 1
+        FROM public.responses r
+        WHERE r.id = response_id_param
+        FOR UPDATE;
+    END IF;
 
+    IF EXISTS (
+        SELECT 1
+        FROM jsonb_to_recordset(answers_param)
+            AS a(question_id UUID, selected_option UUID)
+        LEFT JOIN public.questions q
+            ON q.id = a.question_id
+           AND q.questionnaire_id = questionnaire_id_param
+        LEFT JOIN public.likert_scale_options lso
+            ON lso.id = a.selected_option
+        LEFT JOIN public.likert_scales ls
+            ON ls.id = lso.likert_scale_id
+           AND ls.questionnaire_id = questionnaire_id_param
+        WHERE q.id IS NULL
+           OR (a.selected_option IS NOT NULL AND ls.id IS NULL)
+    ) THEN
+        RAISE EXCEPTION
+            'The answers do not match the questionnaire''s questions';
+    END IF;
 
+    IF is_submitted_param AND EXISTS (
+        SELECT 1
+        FROM public.questions q
+        WHERE q.questionnaire_id = questionnaire_id_param
+          AND NOT EXISTS (
+              SELECT 1
+              FROM jsonb_to_recordset(answers_param)
+                  AS a(question_id UUID, selected_option UUID)
+              WHERE a.question_id = q.id
+                AND a.selected_option IS NOT NULL
+          )
+    ) THEN
+        RAISE EXCEPTION
+            'All the questions have to be answered before submitting';
+    END IF;
+
+    -- The answers get written while the response is still a draft,
+    -- as the RLS policies only allow changes on drafts.
+    INSERT INTO public.responses (id, user_id, questionnaire_id, is_submitted)
+    VALUES (response_id_param, auth.uid(), questionnaire_id_param, false)
+    ON CONFLICT (id) DO NOTHING;
 
+    INSERT INTO public.answers (response_id, question_id, selected_option)
+    SELECT response_id_param, a.question_id, a.selected_option
+    FROM jsonb_to_recordset(answers_param)
+        AS a(question_id UUID, selected_option UUID)
+    ON CONFLICT (response_id, question_id)
+    DO UPDATE SET selected_option = excluded.selected_option;
 
+    RETURN QUERY
+    UPDATE public.responses r
+    SET
+        is_submitted = is_submitted_param,
+        submitted_at = CASE WHEN is_submitted_param THEN now() END
+    WHERE r.id = response_id_param
+    RETURNING r.*;
+END;
+$$;
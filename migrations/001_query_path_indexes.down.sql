@@ -0,0 +1,14 @@
+-- Reverts the 001_query_path_indexes migration.
+
+DROP INDEX IF EXISTS public.questionnaires_created_by_idx;
+DROP INDEX IF EXISTS public.responses_submitted_at_id_idx;
+DROP INDEX IF EXISTS public.responses_questionnaire_id_is_submitted_idx;
+DROP INDEX IF EXISTS public.responses_user_id_questionnaire_id_is_submitted_idx;
+DROP INDEX IF EXISTS public.likert_scale_options_likert_scale_id_value_idx;
+DROP INDEX IF EXISTS public.likert_scales_questionnaire_id_idx;
+DROP INDEX IF EXISTS public.questions_questionnaire_id_position_idx;
+DROP INDEX IF EXISTS public.answers_selected_option_idx;
+DROP INDEX IF EXISTS public.answers_question_id_idx;
+
+ALTER TABLE public.answers
+DROP CONSTRAINT IF EXISTS answers_response_id_question_id_key;
@@ -0,0 +1,64 @@
+-- Indexes for the hot query paths of the repositories, the RLS EXISTS
+-- subqueries and the ON DELETE CASCADE chains.
+
+-- Answers.update_answers upserts on (response_id, question_id), which needs
+-- a unique constraint on those columns. Any duplicate answers get removed
+-- first, keeping a single row for each question of a response.
+DELETE FROM public.answers a
+USING public.answers duplicate
+WHERE a.response_id = duplicate.response_id
+  AND a.question_id = duplicate.question_id
+  AND a.ctid < duplicate.ctid;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1
+        FROM pg_constraint
+        WHERE conname = 'answers_response_id_question_id_key'
+    ) THEN
+        -- Also serves the lookups and cascades by answers.response_id
+        ALTER TABLE public.answers
+        ADD CONSTRAINT answers_response_id_question_id_key
+        UNIQUE (response_id, question_id);
+    END IF;
+END;
+$$;
+
+-- Joins of the answers with their questions and deletions of questions
+CREATE INDEX IF NOT EXISTS answers_question_id_idx
+ON public.answers (question_id);
+
+-- Joins of the answers with their options and deletions of options
+CREATE INDEX IF NOT EXISTS answers_selected_option_idx
+ON public.answers (selected_option);
+
+-- Questions of a questionnaire, ordered by position
+CREATE INDEX IF NOT EXISTS questions_questionnaire_id_position_idx
+ON public.questions (questionnaire_id, position);
+
+-- Likert scale of a questionnaire
+CREATE INDEX IF NOT EXISTS likert_scales_questionnaire_id_idx
+ON public.likert_scales (questionnaire_id);
+
+-- Options of a likert scale, ordered by value
+CREATE INDEX IF NOT EXISTS likert_scale_options_likert_scale_id_value_idx
+ON public.likert_scale_options (likert_scale_id, value);
+
+-- A user's responses and drafts for a questionnaire,
+-- also used by the RLS policies that check a response's owner
+CREATE INDEX IF NOT EXISTS responses_user_id_questionnaire_id_is_submitted_idx
+ON public.responses (user_id, questionnaire_id, is_submitted);
+
+-- Submitted responses of a questionnaire and deletions of questionnaires
+CREATE INDEX IF NOT EXISTS responses_questionnaire_id_is_submitted_idx
+ON public.responses (questionnaire_id, is_submitted);
+
+-- Keyset pagination of the submitted responses on (submitted_at, id)
+CREATE INDEX IF NOT EXISTS responses_submitted_at_id_idx
+ON public.responses (submitted_at DESC NULLS LAST, id DESC)
+WHERE is_submitted;
+
+-- Deletions of profiles cascading to their questionnaires
+CREATE INDEX IF NOT EXISTS questionnaires_created_by_idx
+ON public.questionnaires (created_by);
@@ -0,0 +1,3 @@
+-- Reverts the 002_submit_response_function migration.
+
+DROP FUNCTION IF EXISTS public.submit_response(UUID, UUID, JSONB, BOOL);
@@ -0,0 +1,106 @@
+-- Adds the submit_response function.
+
+-- Writes a user's response and all of its answers in a single transaction.
+-- The response is keyed by its id, which the client generates for a new
+-- response, so a retried call never creates a second response.
+-- Drafts can have unanswered questions, while a submission needs all the
+-- questions answered. A submitted response is final, so submitting it
+-- again returns it unchanged.
+CREATE OR REPLACE FUNCTION submit_response(
+    response_id_param UUID,
+    questionnaire_id_param UUID,
+    answers_param JSONB,
+    is_submitted_param BOOL
+)
+RETURNS SETOF public.responses
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    current_response public.responses;
+BEGIN
+    IF auth.uid() IS NULL THEN
+        RAISE EXCEPTION 'Only authenticated users can submit responses';
+    END IF;
+
+    SELECT * INTO current_response
+    FROM public.responses r
+    WHERE r.id = response_id_param;
+
+    IF FOUND THEN
+        IF current_response.user_id <> auth.uid()
+           OR current_response.questionnaire_id <> questionnaire_id_param THEN
+            RAISE EXCEPTION 'The response does not belong to the user';
+        END IF;
+
+        IF current_response.is_submitted THEN
+            IF is_submitted_param THEN
+                RETURN NEXT current_response;
+                RETURN;
+            END IF;
+            RAISE EXCEPTION 'The response has already been submitted';
+        END IF;
+
+        -- Concurrent writes of the same draft get serialized
+        PERFORM 1
+        FROM public.responses r
+        WHERE r.id = response_id_param
+        FOR UPDATE;
+    END IF;
+
+    IF EXISTS (
+        SELECT 1
+        FROM jsonb_to_recordset(answers_param)
+            AS a(question_id UUID, selected_option UUID)
+        LEFT JOIN public.questions q
+            ON q.id = a.question_id
+           AND q.questionnaire_id = questionnaire_id_param
+        LEFT JOIN public.likert_scale_options lso
+            ON lso.id = a.selected_option
+        LEFT JOIN public.likert_scales ls
+            ON ls.id = lso.likert_scale_id
+           AND ls.questionnaire_id = questionnaire_id_param
+        WHERE q.id IS NULL
+           OR (a.selected_option IS NOT NULL AND ls.id IS NULL)
+    ) THEN
+        RAISE EXCEPTION
+            'The answers do not match the questionnaire''s questions';
+    END IF;
+
+    IF is_submitted_param AND EXISTS (
+        SELECT 1
+        FROM public.questions q
+        WHERE q.questionnaire_id = questionnaire_id_param
+          AND NOT EXISTS (
+              SELECT 1
+              FROM jsonb_to_recordset(answers_param)
+                  AS a(question_id UUID, selected_option UUID)
+              WHERE a.question_id = q.id
+                AND a.selected_option IS NOT NULL
+          )
+    ) THEN
+        RAISE EXCEPTION
+            'All the questions have to be answered before submitting';
+    END IF;
+
+    -- The answers get written while the response is still a draft,
+    -- as the RLS policies only allow changes on drafts.
+    INSERT INTO public.responses (id, user_id, questionnaire_id, is_submitted)
+    VALUES (response_id_param, auth.uid(), questionnaire_id_param, false)
+    ON CONFLICT (id) DO NOTHING;
+
+    INSERT INTO public.answers (response_id, question_id, selected_option)
+    SELECT response_id_param, a.question_id, a.selected_option
+    FROM jsonb_to_recordset(answers_param)
+        AS a(question_id UUID, selected_option UUID)
+    ON CONFLICT (response_id, question_id)
+    DO UPDATE SET selected_option = excluded.selected_option;
+
+    RETURN QUERY
+    UPDATE public.responses r
+    SET
+        is_submitted = is_submitted_param,
+        submitted_at = CASE WHEN is_submitted_param THEN now() END
+    WHERE r.id = response_id_param
+    RETURNING r.*;
+END;
+$$;
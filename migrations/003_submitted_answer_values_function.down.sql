@@ -0,0 +1,3 @@
+-- Reverts the 003_submitted_answer_values_function migration.
+
+DROP FUNCTION IF EXISTS public.get_submitted_answer_values(UUID);
@@ -0,0 +1,118 @@
+-- Reverts the 004_incremental_answer_values migration.
+
+DROP FUNCTION IF EXISTS public.get_submitted_answer_values(UUID, TIMESTAMPTZ);
+
+-- Returns the submitted answers of a questionnaire as a single JSON
+-- document. The questions, the likert scale options and the ids of the
+-- submitted responses are sent once as side tables, and every answer is
+-- a (response, question, value) tuple, where response and question are
+-- positions in the response_ids and questions side tables. The tuples
+-- are sent column-wise, as three arrays of numbers.
+-- Being a single value, the document is never truncated by the
+-- PostgREST's max-rows limit.
+CREATE OR REPLACE FUNCTION get_submitted_answer_values(q_id_param UUID)
+RETURNS JSON
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+DECLARE
+    result JSON;
+BEGIN
+    IF coalesce(auth.jwt() -> 'app_metadata' ->> 'role', '') <> 'admin' THEN
+        RAISE EXCEPTION 'Only admins can retrieve the submitted answers';
+    END IF;
+
+    WITH submitted AS (
+        SELECT
+            r.id,
+            row_number() OVER (ORDER BY r.submitted_at, r.id) - 1 AS position
+        FROM public.responses r
+        WHERE r.questionnaire_id = q_id_param
+          AND r.is_submitted = TRUE
+    ),
+    questionnaire_questions AS (
+        SELECT
+            q.*,
+            row_number() OVER (ORDER BY q.position, q.id) - 1
+                AS column_position
+        FROM public.questions q
+        WHERE q.questionnaire_id = q_id_param
+    )
+    SELECT json_build_object(
+        'questions', (
+            SELECT coalesce(
+                json_agg(
+                    json_build_object(
+                        'id', q.id,
+                        'category', q.category,
+                        'question_text', q.question_text,
+                        'is_custom', q.is_custom,
+                        'is_negative', q.is_negative
+                    )
+                    ORDER BY q.column_position
+                ),
+                '[]'
+            )
+            FROM questionnaire_questions q
+        ),
+        'options', (
+            SELECT coalesce(
+                json_agg(
+                    json_build_object(
+                        'id', lso.id,
+                        'value', lso.value,
+                        'label', lso.label
+                    )
+                    ORDER BY lso.value
+                ),
+                '[]'
+            )
+            FROM public.likert_scale_options lso
+            JOIN public.likert_scales ls ON lso.likert_scale_id = ls.id
+            WHERE ls.questionnaire_id = q_id_param
+        ),
+        'response_ids', (
+            SELECT coalesce(json_agg(s.id ORDER BY s.position), '[]')
+            FROM submitted s
+        ),
+        'answers', (
+            SELECT json_build_object(
+                'responses', coalesce(
+                    json_agg(
+                        s.position
+                        ORDER BY s.position, q.column_position
+                    ),
+                    '[]'
+                ),
+                'questions', coalesce(
+                    json_agg(
+                        q.column_position
+                        ORDER BY s.position, q.column_position
+                    ),
+                    '[]'
+                ),
+                'values', coalesce(
+                    json_agg(
+                        lso.value
+                        ORDER BY s.position, q.column_position
+                    ),
+                    '[]'
+                )
+            )
+            FROM public.answers a
+            JOIN submitted s ON a.response_id = s.id
+            JOIN questionnaire_questions q ON a.question_id = q.id
+            JOIN public.likert_scale_options lso ON a.selected_option = lso.id
+        )
+    ) INTO result;
+
+    RETURN result;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS responses_record_deleted_response ON public.responses;
+DROP FUNCTION IF EXISTS public.record_deleted_response();
+
+DROP INDEX IF EXISTS public.responses_questionnaire_id_submitted_at_idx;
+
+DROP TABLE IF EXISTS public.deleted_responses;
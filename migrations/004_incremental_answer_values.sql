@@ -0,0 +1,175 @@
+-- Adds the incremental mode of the get_submitted_answer_values function
+-- and the tracking of the deleted submitted responses that it needs.
+
+-- The submitted responses that have been deleted, which the incremental
+-- refresh of the results drops from its cached answers
+create table deleted_responses (
+    response_id uuid primary key,
+    questionnaire_id uuid not null,
+    deleted_at timestamptz not null default now()
+);
+
+ALTER TABLE public.deleted_responses ENABLE ROW LEVEL SECURITY;
+
+CREATE INDEX IF NOT EXISTS responses_questionnaire_id_submitted_at_idx
+ON public.responses (questionnaire_id, submitted_at)
+WHERE is_submitted;
+
+CREATE INDEX IF NOT EXISTS deleted_responses_questionnaire_id_deleted_at_idx
+ON public.deleted_responses (questionnaire_id, deleted_at);
+
+-- Records every deleted submitted response. The responses that get deleted
+-- along with their questionnaire are not recorded, as their questionnaire
+-- is already gone when the cascade reaches them.
+CREATE OR REPLACE FUNCTION record_deleted_response()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+BEGIN
+    IF OLD.is_submitted AND EXISTS (
+        SELECT 1
+        FROM public.questionnaires q
+        WHERE q.id = OLD.questionnaire_id
+    ) THEN
+        INSERT INTO public.deleted_responses (response_id, questionnaire_id)
+        VALUES (OLD.id, OLD.questionnaire_id)
+        ON CONFLICT (response_id) DO NOTHING;
+    END IF;
+    RETURN OLD;
+END;
+$$;
+
+CREATE TRIGGER responses_record_deleted_response
+AFTER DELETE ON public.responses
+FOR EACH ROW
+EXECUTE FUNCTION record_deleted_response();
+
+DROP FUNCTION IF EXISTS public.get_submitted_answer_values(UUID);
+
+-- Returns the submitted answers of a questionnaire as a single JSON
+-- document. The questions, the likert scale options and the ids of the
+-- submitted responses are sent once as side tables, and every answer is
+-- a (response, question, value) tuple, where response and question are
+-- positions in the response_ids and questions side tables. The tuples
+-- are sent column-wise, as three arrays of numbers.
+-- Being a single value, the document is never truncated by the
+-- PostgREST's max-rows limit.
+-- Given the synced_at of a previous document, only the responses that
+-- have been submitted since then get returned, along with the ids of the
+-- submitted responses that have been deleted since then. Both windows
+-- start a minute before synced_at, so the transactions that have
+-- committed late are not missed; the caller skips the responses that
+-- it already has.
+CREATE OR REPLACE FUNCTION get_submitted_answer_values(
+    q_id_param UUID,
+    since_param TIMESTAMPTZ DEFAULT NULL
+)
+RETURNS JSON
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+DECLARE
+    result JSON;
+    since TIMESTAMPTZ := since_param - INTERVAL '1 minute';
+BEGIN
+    IF coalesce(auth.jwt() -> 'app_metadata' ->> 'role', '') <> 'admin' THEN
+        RAISE EXCEPTION 'Only admins can retrieve the submitted answers';
+    END IF;
+
+    WITH submitted AS (
+        SELECT
+            r.id,
+            row_number() OVER (ORDER BY r.submitted_at, r.id) - 1 AS position
+        FROM public.responses r
+        WHERE r.questionnaire_id = q_id_param
+          AND r.is_submitted = TRUE
+          AND (since IS NULL OR r.submitted_at > since)
+    ),
+    questionnaire_questions AS (
+        SELECT
+            q.*,
+            row_number() OVER (ORDER BY q.position, q.id) - 1
+                AS column_position
+        FROM public.questions q
+        WHERE q.questionnaire_id = q_id_param
+    )
+    SELECT json_build_object(
+        'synced_at', now(),
+        'deleted_response_ids', (
+            SELECT coalesce(json_agg(d.response_id), '[]')
+            FROM public.deleted_responses d
+            WHERE since IS NOT NULL
+              AND d.questionnaire_id = q_id_param
+              AND d.deleted_at > since
+        ),
+        'questions', (
+            SELECT coalesce(
+                json_agg(
+                    json_build_object(
+                        'id', q.id,
+                        'category', q.category,
+                        'question_text', q.question_text,
+                        'is_custom', q.is_custom,
+                        'is_negative', q.is_negative
+                    )
+                    ORDER BY q.column_position
+                ),
+                '[]'
+            )
+            FROM questionnaire_questions q
+        ),
+        'options', (
+            SELECT coalesce(
+                json_agg(
+                    json_build_object(
+                        'id', lso.id,
+                        'value', lso.value,
+                        'label', lso.label
+                    )
+                    ORDER BY lso.value
+                ),
+                '[]'
+            )
+            FROM public.likert_scale_options lso
+            JOIN public.likert_scales ls ON lso.likert_scale_id = ls.id
+            WHERE ls.questionnaire_id = q_id_param
+        ),
+        'response_ids', (
+            SELECT coalesce(json_agg(s.id ORDER BY s.position), '[]')
+            FROM submitted s
+        ),
+        'answers', (
+            SELECT json_build_object(
+                'responses', coalesce(
+                    json_agg(
+                        s.position
+                        ORDER BY s.position, q.column_position
+                    ),
+                    '[]'
+                ),
+                'questions', coalesce(
+                    json_agg(
+                        q.column_position
+                        ORDER BY s.position, q.column_position
+                    ),
+                    '[]'
+                ),
+                'values', coalesce(
+                    json_agg(
+                        lso.value
+                        ORDER BY s.position, q.column_position
+                    ),
+                    '[]'
+                )
+            )
+            FROM public.answers a
+            JOIN submitted s ON a.response_id = s.id
+            JOIN questionnaire_questions q ON a.question_id = q.id
+            JOIN public.likert_scale_options lso ON a.selected_option = lso.id
+        )
+    ) INTO result;
+
+    RETURN result;
+END;
+$$;
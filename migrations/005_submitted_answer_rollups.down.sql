@@ -0,0 +1,98 @@
+-- Reverts the 005_submitted_answer_rollups migration.
+
+CREATE OR REPLACE FUNCTION get_submitted_answer_label_counts(q_id_param UUID)
+RETURNS TABLE (
+    category TEXT,
+    question_id UUID,
+    question_text TEXT,
+    is_custom BOOL,
+    label TEXT,
+    value INTEGER,
+    answer_count BIGINT
+)
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+BEGIN
+    IF coalesce(auth.jwt() -> 'app_metadata' ->> 'role', '') <> 'admin' THEN
+        RAISE EXCEPTION 'Only admins can aggregate the submitted answers';
+    END IF;
+
+    RETURN QUERY
+    SELECT
+        q.category,
+        q.id,
+        q.question_text,
+        q.is_custom,
+        lso.label,
+        lso.value,
+        COUNT(*) AS answer_count
+    FROM public.answers a
+    JOIN public.questions q ON a.question_id = q.id
+    JOIN public.likert_scale_options lso ON a.selected_option = lso.id
+    JOIN public.responses r ON a.response_id = r.id
+    WHERE q.questionnaire_id = q_id_param
+      AND r.is_submitted = TRUE
+    GROUP BY q.category, q.id, lso.id
+    ORDER BY q.position, lso.value;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION get_submitted_category_scores(q_id_param UUID)
+RETURNS TABLE (
+    category TEXT,
+    total_score BIGINT,
+    count_answers BIGINT,
+    count_responses BIGINT
+)
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+DECLARE
+    scale_levels INTEGER;
+BEGIN
+    IF coalesce(auth.jwt() -> 'app_metadata' ->> 'role', '') <> 'admin' THEN
+        RAISE EXCEPTION 'Only admins can aggregate the submitted answers';
+    END IF;
+
+    -- Negatively worded answers are reversed on the questionnaire's scale
+    SELECT COUNT(*) INTO scale_levels
+    FROM public.likert_scale_options lso
+    JOIN public.likert_scales ls ON lso.likert_scale_id = ls.id
+    WHERE ls.questionnaire_id = q_id_param;
+
+    RETURN QUERY
+    SELECT
+        q.category,
+        SUM(
+            CASE
+                WHEN q.is_negative THEN scale_levels + 1 - lso.value
+                ELSE lso.value
+            END
+        )::BIGINT AS total_score,
+        COUNT(*) AS count_answers,
+        COUNT(DISTINCT a.response_id) AS count_responses
+    FROM public.answers a
+    JOIN public.questions q ON a.question_id = q.id
+    JOIN public.likert_scale_options lso ON a.selected_option = lso.id
+    JOIN public.responses r ON a.response_id = r.id
+    WHERE q.questionnaire_id = q_id_param
+      AND r.is_submitted = TRUE
+    GROUP BY q.category;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS answers_rollups ON public.answers;
+DROP TRIGGER IF EXISTS responses_unsubmit_rollups ON public.responses;
+DROP TRIGGER IF EXISTS responses_submit_rollups ON public.responses;
+DROP TRIGGER IF EXISTS responses_delete_rollups ON public.responses;
+
+DROP FUNCTION IF EXISTS public.answers_rollups_trigger();
+DROP FUNCTION IF EXISTS public.responses_rollups_trigger();
+DROP FUNCTION IF EXISTS
+    public.apply_answer_to_rollups(UUID, UUID, UUID, INTEGER);
+DROP FUNCTION IF EXISTS public.apply_response_to_rollups(UUID, UUID, INTEGER);
+
+DROP TABLE IF EXISTS public.response_category_stats;
+DROP TABLE IF EXISTS public.questionnaire_category_stats;
+DROP TABLE IF EXISTS public.question_option_counts;
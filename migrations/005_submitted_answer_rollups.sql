@@ -0,0 +1,489 @@
+-- Adds the rollups of the submitted answers, the triggers that keep them
+-- up to date, and reads the results page's aggregations from them.
+
+-- The number of times that each likert scale option has been selected
+-- on each question by the submitted responses
+create table question_option_counts (
+    question_id uuid references public.questions(id) ON DELETE CASCADE,
+    option_id uuid
+        references public.likert_scale_options(id) ON DELETE CASCADE,
+    answer_count bigint not null default 0,
+    primary key (question_id, option_id)
+);
+
+-- The total score, the number of answers and the number of responses
+-- of the submitted answers on each category of each questionnaire
+create table questionnaire_category_stats (
+    questionnaire_id uuid
+        references public.questionnaires(id) ON DELETE CASCADE,
+    category text,
+    total_score bigint not null default 0,
+    count_answers bigint not null default 0,
+    count_responses bigint not null default 0,
+    primary key (questionnaire_id, category)
+);
+
+-- The total score and the number of answers of each submitted response
+-- on each category it has answers on, from which the category means of
+-- the responses are computed for the Spearman analysis, and through which
+-- the responses get counted once on each category
+create table response_category_stats (
+    response_id uuid references public.responses(id) ON DELETE CASCADE,
+    questionnaire_id uuid not null,
+    category text,
+    total_score bigint not null default 0,
+    count_answers bigint not null default 0,
+    primary key (response_id, category)
+);
+
+ALTER TABLE public.question_option_counts ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.questionnaire_category_stats ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.response_category_stats ENABLE ROW LEVEL SECURITY;
+
+CREATE INDEX question_option_counts_option_id_idx
+ON public.question_option_counts (option_id);
+
+CREATE INDEX response_category_stats_questionnaire_id_idx
+ON public.response_category_stats (questionnaire_id);
+
+-- Adds (sign 1) or removes (sign -1) all the answers of a response
+-- to or from the rollups of its questionnaire. The responses that get
+-- deleted along with their questionnaire are skipped, as their
+-- rollups get deleted with it.
+CREATE OR REPLACE FUNCTION apply_response_to_rollups(
+    response_id_param UUID,
+    questionnaire_id_param UUID,
+    sign INTEGER
+)
+RETURNS VOID
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+DECLARE
+    scale_levels INTEGER;
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1
+        FROM public.questionnaires q
+        WHERE q.id = questionnaire_id_param
+    ) THEN
+        RETURN;
+    END IF;
+
+    -- Negatively worded answers are reversed on the questionnaire's scale
+    SELECT COUNT(*) INTO scale_levels
+    FROM public.likert_scale_options lso
+    JOIN public.likert_scales ls ON lso.likert_scale_id = ls.id
+    WHERE ls.questionnaire_id = questionnaire_id_param;
+
+    INSERT INTO public.question_option_counts AS c (
+        question_id,
+        option_id,
+        answer_count
+    )
+    SELECT a.question_id, a.selected_option, sign * COUNT(*)
+    FROM public.answers a
+    WHERE a.response_id = response_id_param
+      AND a.selected_option IS NOT NULL
+    GROUP BY a.question_id, a.selected_option
+    ON CONFLICT (question_id, option_id)
+    DO UPDATE SET answer_count = c.answer_count + excluded.answer_count;
+
+    INSERT INTO public.questionnaire_category_stats AS s (
+        questionnaire_id,
+        category,
+        total_score,
+        count_answers,
+        count_responses
+    )
+    SELECT
+        questionnaire_id_param,
+        q.category,
+        sign * SUM(
+            CASE
+                WHEN q.is_negative THEN scale_levels + 1 - lso.value
+                ELSE lso.value
+            END
+        ),
+        sign * COUNT(*),
+        sign
+    FROM public.answers a
+    JOIN public.questions q ON a.question_id = q.id
+    JOIN public.likert_scale_options lso ON a.selected_option = lso.id
+    WHERE a.response_id = response_id_param
+    GROUP BY q.category
+    ON CONFLICT (questionnaire_id, category)
+    DO UPDATE SET
+        total_score = s.total_score + excluded.total_score,
+        count_answers = s.count_answers + excluded.count_answers,
+        count_responses = s.count_responses + excluded.count_responses;
+
+    IF sign < 0 THEN
+        DELETE FROM public.response_category_stats s
+        WHERE s.response_id = response_id_param;
+        RETURN;
+    END IF;
+
+    INSERT INTO public.response_category_stats AS s (
+        response_id,
+        questionnaire_id,
+        category,
+        total_score,
+        count_answers
+    )
+    SELECT
+        response_id_param,
+        questionnaire_id_param,
+        q.category,
+        SUM(
+            CASE
+                WHEN q.is_negative THEN scale_levels + 1 - lso.value
+                ELSE lso.value
+            END
+        ),
+        COUNT(*)
+    FROM public.answers a
+    JOIN public.questions q ON a.question_id = q.id
+    JOIN public.likert_scale_options lso ON a.selected_option = lso.id
+    WHERE a.response_id = response_id_param
+    GROUP BY q.category
+    ON CONFLICT (response_id, category)
+    DO UPDATE SET
+        total_score = excluded.total_score,
+        count_answers = excluded.count_answers;
+END;
+$$;
+
+-- Adds (sign 1) or removes (sign -1) a single answer of a submitted
+-- response to or from the rollups of its questionnaire. The answers of
+-- drafts are skipped, as their response gets added whole on its
+-- submission, and so are the ones that get deleted along with their
+-- response or questionnaire. A response counts once on each category
+-- from its first answer on it, which inserts its row in the responses'
+-- rollups, until its last one gets removed, which deletes that row.
+CREATE OR REPLACE FUNCTION apply_answer_to_rollups(
+    response_id_param UUID,
+    question_id_param UUID,
+    option_id_param UUID,
+    sign INTEGER
+)
+RETURNS VOID
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+DECLARE
+    questionnaire_id_value UUID;
+    scale_levels INTEGER;
+    category_value TEXT;
+    score INTEGER;
+    response_answers BIGINT;
+    response_count INTEGER := 0;
+BEGIN
+    IF option_id_param IS NULL THEN
+        RETURN;
+    END IF;
+
+    SELECT r.questionnaire_id INTO questionnaire_id_value
+    FROM public.responses r
+    JOIN public.questionnaires q ON r.questionnaire_id = q.id
+    WHERE r.id = response_id_param
+      AND r.is_submitted = TRUE;
+
+    IF NOT FOUND THEN
+        RETURN;
+    END IF;
+
+    SELECT COUNT(*) INTO scale_levels
+    FROM public.likert_scale_options lso
+    JOIN public.likert_scales ls ON lso.likert_scale_id = ls.id
+    WHERE ls.questionnaire_id = questionnaire_id_value;
+
+    SELECT
+        q.category,
+        CASE
+            WHEN q.is_negative THEN scale_levels + 1 - lso.value
+            ELSE lso.value
+        END
+    INTO category_value, score
+    FROM public.questions q
+    JOIN public.likert_scale_options lso ON lso.id = option_id_param
+    WHERE q.id = question_id_param;
+
+    IF NOT FOUND THEN
+        RETURN;
+    END IF;
+
+    INSERT INTO public.question_option_counts AS c (
+        question_id,
+        option_id,
+        answer_count
+    )
+    VALUES (question_id_param, option_id_param, sign)
+    ON CONFLICT (question_id, option_id)
+    DO UPDATE SET answer_count = c.answer_count + excluded.answer_count;
+
+    INSERT INTO public.response_category_stats AS s (
+        response_id,
+        questionnaire_id,
+        category,
+        total_score,
+        count_answers
+    )
+    VALUES (
+        response_id_param,
+        questionnaire_id_value,
+        category_value,
+        sign * score,
+        sign
+    )
+    ON CONFLICT (response_id, category)
+    DO UPDATE SET
+        total_score = s.total_score + excluded.total_score,
+        count_answers = s.count_answers + excluded.count_answers
+    RETURNING s.count_answers INTO response_answers;
+
+    IF response_answers = 0 THEN
+        DELETE FROM public.response_category_stats s
+        WHERE s.response_id = response_id_param
+          AND s.category = category_value;
+        response_count := -1;
+    ELSIF sign > 0 AND response_answers = 1 THEN
+        response_count := 1;
+    END IF;
+
+    INSERT INTO public.questionnaire_category_stats AS s (
+        questionnaire_id,
+        category,
+        total_score,
+        count_answers,
+        count_responses
+    )
+    VALUES (
+        questionnaire_id_value,
+        category_value,
+        sign * score,
+        sign,
+        response_count
+    )
+    ON CONFLICT (questionnaire_id, category)
+    DO UPDATE SET
+        total_score = s.total_score + excluded.total_score,
+        count_answers = s.count_answers + excluded.count_answers,
+        count_responses = s.count_responses + excluded.count_responses;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION responses_rollups_trigger()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        IF OLD.is_submitted THEN
+            PERFORM apply_response_to_rollups(
+                OLD.id,
+                OLD.questionnaire_id,
+                -1
+            );
+        END IF;
+        RETURN OLD;
+    END IF;
+
+    IF TG_OP = 'UPDATE' AND OLD.is_submitted THEN
+        PERFORM apply_response_to_rollups(OLD.id, OLD.questionnaire_id, -1);
+    END IF;
+    IF NEW.is_submitted THEN
+        PERFORM apply_response_to_rollups(NEW.id, NEW.questionnaire_id, 1);
+    END IF;
+    RETURN NEW;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION answers_rollups_trigger()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM apply_answer_to_rollups(
+            OLD.response_id,
+            OLD.question_id,
+            OLD.selected_option,
+            -1
+        );
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM apply_answer_to_rollups(
+            NEW.response_id,
+            NEW.question_id,
+            NEW.selected_option,
+            1
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+-- A deleted response gets removed from the rollups before its answers
+-- get deleted along with it
+CREATE TRIGGER responses_delete_rollups
+BEFORE DELETE ON public.responses
+FOR EACH ROW
+EXECUTE FUNCTION responses_rollups_trigger();
+
+CREATE TRIGGER responses_submit_rollups
+AFTER INSERT OR UPDATE OF is_submitted, questionnaire_id ON public.responses
+FOR EACH ROW
+WHEN (NEW.is_submitted)
+EXECUTE FUNCTION responses_rollups_trigger();
+
+CREATE TRIGGER responses_unsubmit_rollups
+AFTER UPDATE OF is_submitted, questionnaire_id ON public.responses
+FOR EACH ROW
+WHEN (OLD.is_submitted AND NOT NEW.is_submitted)
+EXECUTE FUNCTION responses_rollups_trigger();
+
+CREATE TRIGGER answers_rollups
+AFTER INSERT OR UPDATE OR DELETE ON public.answers
+FOR EACH ROW
+EXECUTE FUNCTION answers_rollups_trigger();
+
+-- The rollups of the responses that have already been submitted
+INSERT INTO public.question_option_counts (
+    question_id,
+    option_id,
+    answer_count
+)
+SELECT a.question_id, a.selected_option, COUNT(*)
+FROM public.answers a
+JOIN public.responses r ON a.response_id = r.id
+WHERE r.is_submitted = TRUE
+  AND a.selected_option IS NOT NULL
+GROUP BY a.question_id, a.selected_option;
+
+INSERT INTO public.questionnaire_category_stats (
+    questionnaire_id,
+    category,
+    total_score,
+    count_answers,
+    count_responses
+)
+SELECT
+    q.questionnaire_id,
+    q.category,
+    SUM(
+        CASE
+            WHEN q.is_negative THEN levels.scale_levels + 1 - lso.value
+            ELSE lso.value
+        END
+    ),
+    COUNT(*),
+    COUNT(DISTINCT a.response_id)
+FROM public.answers a
+JOIN public.questions q ON a.question_id = q.id
+JOIN public.likert_scale_options lso ON a.selected_option = lso.id
+JOIN public.responses r ON a.response_id = r.id
+JOIN (
+    SELECT ls.questionnaire_id, COUNT(*) AS scale_levels
+    FROM public.likert_scale_options o
+    JOIN public.likert_scales ls ON o.likert_scale_id = ls.id
+    GROUP BY ls.questionnaire_id
+) levels ON levels.questionnaire_id = q.questionnaire_id
+WHERE r.is_submitted = TRUE
+GROUP BY q.questionnaire_id, q.category;
+
+INSERT INTO public.response_category_stats (
+    response_id,
+    questionnaire_id,
+    category,
+    total_score,
+    count_answers
+)
+SELECT
+    a.response_id,
+    q.questionnaire_id,
+    q.category,
+    SUM(
+        CASE
+            WHEN q.is_negative THEN levels.scale_levels + 1 - lso.value
+            ELSE lso.value
+        END
+    ),
+    COUNT(*)
+FROM public.answers a
+JOIN public.questions q ON a.question_id = q.id
+JOIN public.likert_scale_options lso ON a.selected_option = lso.id
+JOIN public.responses r ON a.response_id = r.id
+JOIN (
+    SELECT ls.questionnaire_id, COUNT(*) AS scale_levels
+    FROM public.likert_scale_options o
+    JOIN public.likert_scales ls ON o.likert_scale_id = ls.id
+    GROUP BY ls.questionnaire_id
+) levels ON levels.questionnaire_id = q.questionnaire_id
+WHERE r.is_submitted = TRUE
+GROUP BY a.response_id, q.questionnaire_id, q.category;
+
+CREATE OR REPLACE FUNCTION get_submitted_answer_label_counts(q_id_param UUID)
+RETURNS TABLE (
+    category TEXT,
+    question_id UUID,
+    question_text TEXT,
+    is_custom BOOL,
+    label TEXT,
+    value INTEGER,
+    answer_count BIGINT
+)
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+BEGIN
+    IF coalesce(auth.jwt() -> 'app_metadata' ->> 'role', '') <> 'admin' THEN
+        RAISE EXCEPTION 'Only admins can aggregate the submitted answers';
+    END IF;
+
+    RETURN QUERY
+    SELECT
+        q.category,
+        q.id,
+        q.question_text,
+        q.is_custom,
+        lso.label,
+        lso.value,
+        c.answer_count
+    FROM public.question_option_counts c
+    JOIN public.questions q ON c.question_id = q.id
+    JOIN public.likert_scale_options lso ON c.option_id = lso.id
+    WHERE q.questionnaire_id = q_id_param
+      AND c.answer_count > 0
+    ORDER BY q.position, lso.value;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION get_submitted_category_scores(q_id_param UUID)
+RETURNS TABLE (
+    category TEXT,
+    total_score BIGINT,
+    count_answers BIGINT,
+    count_responses BIGINT
+)
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+BEGIN
+    IF coalesce(auth.jwt() -> 'app_metadata' ->> 'role', '') <> 'admin' THEN
+        RAISE EXCEPTION 'Only admins can aggregate the submitted answers';
+    END IF;
+
+    RETURN QUERY
+    SELECT
+        s.category,
+        s.total_score,
+        s.count_answers,
+        s.count_responses
+    FROM public.questionnaire_category_stats s
+    WHERE s.questionnaire_id = q_id_param
+      AND s.count_answers > 0;
+END;
+$$;
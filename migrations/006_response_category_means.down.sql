@@ -0,0 +1,33 @@
+-- Reverts the 006_response_category_means migration.
+
+DROP FUNCTION IF EXISTS get_response_category_means(UUID);
+
+CREATE OR REPLACE FUNCTION get_all_response_category_means(q_id_param UUID)
+RETURNS TABLE (
+    response_id UUID,
+    category TEXT,
+    mean_score NUMERIC
+) 
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+BEGIN
+    RETURN QUERY
+    SELECT 
+        a.response_id, 
+        q.category, 
+        AVG(
+            CASE 
+                WHEN q.is_negative THEN 6 - lso.value 
+                ELSE lso.value 
+            END
+        )::NUMERIC AS mean_score 
+    FROM public.answers a 
+    JOIN public.questions q ON a.question_id = q.id 
+    JOIN public.likert_scale_options lso ON a.selected_option = lso.id 
+    JOIN public.responses r ON a.response_id = r.id 
+    WHERE q.questionnaire_id = q_id_param 
+      AND r.is_submitted = TRUE 
+    GROUP BY a.response_id, q.category;
+END;
+$$;
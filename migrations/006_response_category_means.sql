@@ -0,0 +1,63 @@
+-- Reads the category means of the responses for the Spearman analysis
+-- from the responses' rollups, in which the negatively worded answers
+-- have been reversed on the questionnaire's scale.
+
+DROP FUNCTION IF EXISTS get_all_response_category_means(UUID);
+
+-- Returns the category means of every submitted response of a
+-- questionnaire as a single JSON document, pivoted to a responses x
+-- categories matrix: the categories, sorted by name, and the response
+-- ids are sent once, and the means are a row of numbers per response,
+-- null where it has not answered a category. The means are read from
+-- the responses' rollups, in which the negatively worded answers have
+-- been reversed on the questionnaire's scale.
+CREATE OR REPLACE FUNCTION get_response_category_means(q_id_param UUID)
+RETURNS JSON
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+DECLARE
+    categories TEXT[];
+    result JSON;
+BEGIN
+    IF coalesce(auth.jwt() -> 'app_metadata' ->> 'role', '') <> 'admin' THEN
+        RAISE EXCEPTION 'Only admins can aggregate the submitted answers';
+    END IF;
+
+    SELECT coalesce(array_agg(DISTINCT s.category ORDER BY s.category), '{}')
+    INTO categories
+    FROM public.response_category_stats s
+    WHERE s.questionnaire_id = q_id_param
+      AND s.count_answers > 0;
+
+    SELECT json_build_object(
+        'categories', to_json(categories),
+        'response_ids',
+            coalesce(json_agg(m.response_id ORDER BY m.response_id), '[]'),
+        'means', coalesce(json_agg(m.means ORDER BY m.response_id), '[]')
+    )
+    INTO result
+    FROM (
+        SELECT
+            r.response_id,
+            json_agg(
+                s.total_score::FLOAT8 / s.count_answers
+                ORDER BY c.position
+            ) AS means
+        FROM (
+            SELECT DISTINCT s.response_id
+            FROM public.response_category_stats s
+            WHERE s.questionnaire_id = q_id_param
+              AND s.count_answers > 0
+        ) r
+        CROSS JOIN unnest(categories) WITH ORDINALITY AS c(category, position)
+        LEFT JOIN public.response_category_stats s
+            ON s.response_id = r.response_id
+           AND s.category = c.category
+           AND s.count_answers > 0
+        GROUP BY r.response_id
+    ) m;
+
+    RETURN result;
+END;
+$$;
@@ -0,0 +1,11 @@
+-- Reverts the 007_answers_cascade_deletes migration.
+
+ALTER TABLE public.answers
+DROP CONSTRAINT IF EXISTS answers_selected_option_fkey,
+ADD CONSTRAINT answers_selected_option_fkey
+FOREIGN KEY (selected_option) REFERENCES public.likert_scale_options(id);
+
+ALTER TABLE public.answers
+DROP CONSTRAINT IF EXISTS answers_question_id_fkey,
+ADD CONSTRAINT answers_question_id_fkey
+FOREIGN KEY (question_id) REFERENCES public.questions(id);
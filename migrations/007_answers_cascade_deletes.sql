@@ -0,0 +1,20 @@
+-- Makes the answers follow the deletion of their question and of their
+-- likert scale option.
+--
+-- Deleting a questionnaire cascades to its questions, its likert scale's
+-- options and its responses. Each cascade runs as a statement of its own,
+-- so the NO ACTION check of answers.question_id runs when the questions
+-- get deleted, before the cascade of the responses has deleted their
+-- answers, and the deletion of any questionnaire with answers fails.
+-- migrations/reproduce_questionnaire_delete.sh reproduces it.
+
+ALTER TABLE public.answers
+DROP CONSTRAINT IF EXISTS answers_question_id_fkey,
+ADD CONSTRAINT answers_question_id_fkey
+FOREIGN KEY (question_id) REFERENCES public.questions(id) ON DELETE CASCADE;
+
+ALTER TABLE public.answers
+DROP CONSTRAINT IF EXISTS answers_selected_option_fkey,
+ADD CONSTRAINT answers_selected_option_fkey
+FOREIGN KEY (selected_option) REFERENCES public.likert_scale_options(id)
+ON DELETE CASCADE;
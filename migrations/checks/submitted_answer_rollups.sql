@@ -0,0 +1,265 @@
+-- Writes responses and answers in every order that the app and the
+-- migrations do, and checks after each step that the rollups of the
+-- submitted answers match the aggregations of the answers themselves.
+-- Everything gets rolled back.
+
+BEGIN;
+
+-- Raises an exception naming the step if a rollup row differs
+-- from the aggregation of the submitted answers
+CREATE FUNCTION pg_temp.check_rollups(step TEXT)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    mismatches BIGINT;
+BEGIN
+    WITH scored AS (
+        SELECT
+            a.response_id,
+            a.question_id,
+            a.selected_option,
+            q.questionnaire_id,
+            q.category,
+            CASE
+                WHEN q.is_negative THEN levels.scale_levels + 1 - lso.value
+                ELSE lso.value
+            END AS score
+        FROM public.answers a
+        JOIN public.responses r ON a.response_id = r.id
+        JOIN public.questions q ON a.question_id = q.id
+        JOIN public.likert_scale_options lso ON a.selected_option = lso.id
+        JOIN (
+            SELECT ls.questionnaire_id, COUNT(*) AS scale_levels
+            FROM public.likert_scale_options o
+            JOIN public.likert_scales ls ON o.likert_scale_id = ls.id
+            GROUP BY ls.questionnaire_id
+        ) levels ON levels.questionnaire_id = q.questionnaire_id
+        WHERE r.is_submitted
+    ),
+    expected_categories AS (
+        SELECT
+            questionnaire_id,
+            category,
+            SUM(score) AS total_score,
+            COUNT(*) AS count_answers,
+            COUNT(DISTINCT response_id) AS count_responses
+        FROM scored
+        GROUP BY questionnaire_id, category
+    ),
+    categories AS (
+        SELECT
+            questionnaire_id,
+            category,
+            total_score,
+            count_answers,
+            count_responses
+        FROM public.questionnaire_category_stats
+        WHERE total_score <> 0
+           OR count_answers <> 0
+           OR count_responses <> 0
+    ),
+    expected_responses AS (
+        SELECT
+            response_id,
+            category,
+            SUM(score) AS total_score,
+            COUNT(*) AS count_answers
+        FROM scored
+        GROUP BY response_id, category
+    ),
+    responses AS (
+        SELECT response_id, category, total_score, count_answers
+        FROM public.response_category_stats
+    ),
+    expected_options AS (
+        SELECT question_id, selected_option AS option_id, COUNT(*) AS n
+        FROM scored
+        GROUP BY question_id, selected_option
+    ),
+    options AS (
+        SELECT question_id, option_id, answer_count AS n
+        FROM public.question_option_counts
+        WHERE answer_count <> 0
+    )
+    SELECT
+        (
+            SELECT COUNT(*)
+            FROM (
+                (TABLE expected_categories EXCEPT TABLE categories)
+                UNION ALL
+                (TABLE categories EXCEPT TABLE expected_categories)
+            ) d
+        ) + (
+            SELECT COUNT(*)
+            FROM (
+                (TABLE expected_responses EXCEPT TABLE responses)
+                UNION ALL
+                (TABLE responses EXCEPT TABLE expected_responses)
+            ) d
+        ) + (
+            SELECT COUNT(*)
+            FROM (
+                (TABLE expected_options EXCEPT TABLE options)
+                UNION ALL
+                (TABLE options EXCEPT TABLE expected_options)
+            ) d
+        )
+    INTO mismatches;
+
+    IF mismatches > 0 THEN
+        RAISE EXCEPTION 'The rollups are wrong after: %', step;
+    END IF;
+    RAISE NOTICE 'The rollups are right after: %', step;
+END;
+$$;
+
+INSERT INTO auth.users (id)
+VALUES ('00000000-0000-0000-0000-000000000001');
+
+INSERT INTO public.profiles (id, full_name)
+VALUES ('00000000-0000-0000-0000-000000000001', 'Rollups');
+
+INSERT INTO public.questionnaires (id, title, created_by)
+VALUES (
+    '00000000-0000-0000-0000-000000000010',
+    'Rollups questionnaire',
+    '00000000-0000-0000-0000-000000000001'
+);
+
+INSERT INTO public.questions (
+    id,
+    questionnaire_id,
+    question_text,
+    position,
+    category,
+    is_negative
+)
+VALUES
+    (
+        '00000000-0000-0000-0000-000000000021',
+        '00000000-0000-0000-0000-000000000010',
+        'Question 1', 1, 'Perceived Usefulness', false
+    ),
+    (
+        '00000000-0000-0000-0000-000000000022',
+        '00000000-0000-0000-0000-000000000010',
+        'Question 2', 2, 'Perceived Usefulness', true
+    ),
+    (
+        '00000000-0000-0000-0000-000000000023',
+        '00000000-0000-0000-0000-000000000010',
+        'Question 3', 3, 'Attitude', false
+    );
+
+INSERT INTO public.likert_scales (id, questionnaire_id)
+VALUES (
+    '00000000-0000-0000-0000-000000000030',
+    '00000000-0000-0000-0000-000000000010'
+);
+
+INSERT INTO public.likert_scale_options (id, likert_scale_id, value, label)
+SELECT
+    ('00000000-0000-0000-0000-00000000003' || v)::uuid,
+    '00000000-0000-0000-0000-000000000030',
+    v,
+    'Level ' || v
+FROM generate_series(1, 5) v;
+
+-- A response inserted as submitted, whose answers come afterwards
+INSERT INTO public.responses (id, user_id, questionnaire_id, is_submitted)
+VALUES (
+    '00000000-0000-0000-0000-000000000041',
+    '00000000-0000-0000-0000-000000000001',
+    '00000000-0000-0000-0000-000000000010',
+    true
+);
+
+INSERT INTO public.answers (response_id, question_id, selected_option)
+VALUES
+    (
+        '00000000-0000-0000-0000-000000000041',
+        '00000000-0000-0000-0000-000000000021',
+        '00000000-0000-0000-0000-000000000035'
+    ),
+    (
+        '00000000-0000-0000-0000-000000000041',
+        '00000000-0000-0000-0000-000000000022',
+        '00000000-0000-0000-0000-000000000032'
+    );
+
+SELECT pg_temp.check_rollups('answering a response inserted as submitted');
+
+-- A draft that gets answered and then submitted
+INSERT INTO public.responses (id, user_id, questionnaire_id)
+VALUES (
+    '00000000-0000-0000-0000-000000000042',
+    '00000000-0000-0000-0000-000000000001',
+    '00000000-0000-0000-0000-000000000010'
+);
+
+INSERT INTO public.answers (response_id, question_id, selected_option)
+SELECT
+    '00000000-0000-0000-0000-000000000042',
+    id,
+    '00000000-0000-0000-0000-000000000034'
+FROM public.questions
+WHERE questionnaire_id = '00000000-0000-0000-0000-000000000010';
+
+SELECT pg_temp.check_rollups('answering a draft');
+
+UPDATE public.responses
+SET is_submitted = true, submitted_at = now()
+WHERE id = '00000000-0000-0000-0000-000000000042';
+
+SELECT pg_temp.check_rollups('submitting a draft');
+
+UPDATE public.answers
+SET selected_option = '00000000-0000-0000-0000-000000000031'
+WHERE response_id = '00000000-0000-0000-0000-000000000041'
+  AND question_id = '00000000-0000-0000-0000-000000000021';
+
+SELECT pg_temp.check_rollups('changing an answer');
+
+UPDATE public.answers
+SET selected_option = NULL
+WHERE response_id = '00000000-0000-0000-0000-000000000042'
+  AND question_id = '00000000-0000-0000-0000-000000000023';
+
+SELECT pg_temp.check_rollups('clearing the only answer on a category');
+
+INSERT INTO public.answers (response_id, question_id, selected_option)
+VALUES (
+    '00000000-0000-0000-0000-000000000041',
+    '00000000-0000-0000-0000-000000000023',
+    '00000000-0000-0000-0000-000000000033'
+)
+ON CONFLICT (response_id, question_id)
+DO UPDATE SET selected_option = excluded.selected_option;
+
+SELECT pg_temp.check_rollups('answering a new category of a submitted response');
+
+DELETE FROM public.answers
+WHERE response_id = '00000000-0000-0000-0000-000000000041'
+  AND question_id = '00000000-0000-0000-0000-000000000022';
+
+SELECT pg_temp.check_rollups('deleting one of the answers on a category');
+
+DELETE FROM public.answers
+WHERE response_id = '00000000-0000-0000-0000-000000000041'
+  AND question_id = '00000000-0000-0000-0000-000000000021';
+
+SELECT pg_temp.check_rollups('deleting the last answer on a category');
+
+UPDATE public.responses
+SET is_submitted = false
+WHERE id = '00000000-0000-0000-0000-000000000041';
+
+SELECT pg_temp.check_rollups('unsubmitting a response');
+
+DELETE FROM public.responses
+WHERE id = '00000000-0000-0000-0000-000000000042';
+
+SELECT pg_temp.check_rollups('deleting a submitted response');
+
+ROLLBACK;
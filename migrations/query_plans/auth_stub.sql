@@ -0,0 +1,27 @@
+-- Minimal stand-in of Supabase's auth schema, so db_schema.sql can be
+-- loaded on a plain Postgres server.
+
+CREATE SCHEMA IF NOT EXISTS auth;
+
+CREATE TABLE IF NOT EXISTS auth.users (
+    id uuid primary key default gen_random_uuid()
+);
+
+CREATE OR REPLACE FUNCTION auth.uid()
+RETURNS uuid
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT nullif(current_setting('request.jwt.claim.sub', true), '')::uuid
+$$;
+
+CREATE OR REPLACE FUNCTION auth.jwt()
+RETURNS jsonb
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT coalesce(
+        nullif(current_setting('request.jwt.claims', true), ''),
+        '{}'
+    )::jsonb
+$$;
@@ -0,0 +1,103 @@
+-- The queries of the repositories' hot paths, the RLS EXISTS subqueries
+-- and the ON DELETE CASCADE chains, as PostgREST runs them.
+
+-- Without the unique constraint on answers(response_id, question_id)
+-- the upsert fails, so the errors get printed instead of stopping the run.
+\set ON_ERROR_STOP off
+
+SELECT id AS questionnaire_id
+FROM public.questionnaires
+ORDER BY title
+LIMIT 1 \gset
+
+SELECT id AS response_id, user_id
+FROM public.responses
+WHERE questionnaire_id = :'questionnaire_id'
+ORDER BY id
+LIMIT 1 \gset
+
+\echo '--- Questions.get_questions_by_questionnaire_id'
+EXPLAIN (ANALYZE, BUFFERS)
+SELECT id, question_text, category
+FROM public.questions
+WHERE questionnaire_id = :'questionnaire_id'
+ORDER BY position;
+
+\echo '--- Likert_scales.get_likert_scale_by_questionnaire_id'
+EXPLAIN (ANALYZE, BUFFERS)
+SELECT id
+FROM public.likert_scales
+WHERE questionnaire_id = :'questionnaire_id';
+
+\echo '--- Likert_scale_options.get_options_by_likert_scale_id'
+EXPLAIN (ANALYZE, BUFFERS)
+SELECT lso.id, lso.value, lso.label
+FROM public.likert_scale_options lso
+WHERE lso.likert_scale_id = (
+    SELECT id FROM public.likert_scales
+    WHERE questionnaire_id = :'questionnaire_id'
+)
+ORDER BY lso.value;
+
+\echo '--- Answers.get_answers_by_response_id'
+EXPLAIN (ANALYZE, BUFFERS)
+SELECT a.*, q.question_text, q.position, lso.label, lso.value
+FROM public.answers a
+LEFT JOIN public.questions q ON q.id = a.question_id
+LEFT JOIN public.likert_scale_options lso ON lso.id = a.selected_option
+WHERE a.response_id = :'response_id'
+ORDER BY q.position;
+
+\echo '--- Responses.get_responses_by_questionnaire_id (draft lookup)'
+EXPLAIN (ANALYZE, BUFFERS)
+SELECT id
+FROM public.responses
+WHERE user_id = :'user_id'
+  AND questionnaire_id = :'questionnaire_id'
+  AND is_submitted = false;
+
+\echo '--- Responses.get_submitted_responses_page'
+EXPLAIN (ANALYZE, BUFFERS)
+SELECT id, submitted_at
+FROM public.responses
+WHERE is_submitted
+ORDER BY submitted_at DESC NULLS LAST, id DESC
+LIMIT 21;
+
+\echo '--- Answers.get_submitted_answers_by_questionnaire_id'
+EXPLAIN (ANALYZE, BUFFERS)
+SELECT a.response_id, q.category, q.is_negative, lso.value, lso.label
+FROM public.answers a
+JOIN public.questions q ON q.id = a.question_id
+JOIN public.responses r ON r.id = a.response_id
+JOIN public.likert_scale_options lso ON lso.id = a.selected_option
+WHERE q.questionnaire_id = :'questionnaire_id'
+  AND r.is_submitted;
+
+\echo '--- RLS "Users can view their own answers" EXISTS subquery'
+EXPLAIN (ANALYZE, BUFFERS)
+SELECT a.id
+FROM public.answers a
+WHERE EXISTS (
+    SELECT 1 FROM public.responses r
+    WHERE r.id = a.response_id
+      AND r.user_id = :'user_id'
+);
+
+\echo '--- Answers.update_answers upsert on (response_id, question_id)'
+BEGIN;
+EXPLAIN (ANALYZE, BUFFERS)
+INSERT INTO public.answers (response_id, question_id, selected_option)
+SELECT response_id, question_id, selected_option
+FROM public.answers
+WHERE response_id = :'response_id'
+ON CONFLICT (response_id, question_id)
+DO UPDATE SET selected_option = excluded.selected_option;
+ROLLBACK;
+
+\echo '--- Questionnaires.delete_questionnaire_by_id (ON DELETE CASCADE)'
+BEGIN;
+EXPLAIN (ANALYZE, BUFFERS)
+DELETE FROM public.questionnaires
+WHERE id = :'questionnaire_id';
+ROLLBACK;
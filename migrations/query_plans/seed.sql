@@ -0,0 +1,68 @@
+-- Synthetic data for the query plans: :users profiles answering
+-- :questionnaires questionnaires of 16 questions on a 5 level scale,
+-- each questionnaire being answered by a :response_rate share of the users.
+
+INSERT INTO auth.users (id)
+SELECT gen_random_uuid()
+FROM generate_series(1, :users);
+
+INSERT INTO public.profiles (id, full_name)
+SELECT id, 'User ' || row_number() OVER ()
+FROM auth.users;
+
+INSERT INTO public.questionnaires (title, created_by)
+SELECT
+    'App ' || g || ' TAM Questionnaire',
+    (SELECT id FROM public.profiles LIMIT 1)
+FROM generate_series(1, :questionnaires) g;
+
+INSERT INTO public.questions (
+    questionnaire_id,
+    question_text,
+    position,
+    category,
+    is_negative
+)
+SELECT
+    q.id,
+    'Question ' || p,
+    p,
+    (ARRAY[
+        'Perceived Usefulness',
+        'Perceived Ease of Use',
+        'Attitude',
+        'Behavioral Intention'
+    ])[1 + (p - 1) / 4],
+    false
+FROM public.questionnaires q, generate_series(1, 16) p;
+
+INSERT INTO public.likert_scales (questionnaire_id)
+SELECT id FROM public.questionnaires;
+
+INSERT INTO public.likert_scale_options (likert_scale_id, value, label)
+SELECT ls.id, v, 'Level ' || v
+FROM public.likert_scales ls, generate_series(1, 5) v;
+
+-- The responses get inserted as drafts and submitted once they have
+-- been answered, the way that the app writes them
+INSERT INTO public.responses (user_id, questionnaire_id, submitted_at)
+SELECT
+    p.id,
+    q.id,
+    now() - random() * interval '90 days'
+FROM public.profiles p
+CROSS JOIN public.questionnaires q
+WHERE random() < :response_rate;
+
+INSERT INTO public.answers (response_id, question_id, selected_option)
+SELECT r.id, qs.id, lso.id
+FROM public.responses r
+JOIN public.questions qs ON qs.questionnaire_id = r.questionnaire_id
+JOIN public.likert_scales ls ON ls.questionnaire_id = r.questionnaire_id
+JOIN public.likert_scale_options lso
+    ON lso.likert_scale_id = ls.id
+   AND lso.value = 1 + abs(hashtext(r.id::text || qs.id::text)) % 5;
+
+UPDATE public.responses
+SET is_submitted = true
+WHERE random() < 0.9;
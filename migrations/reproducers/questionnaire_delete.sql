@@ -0,0 +1,51 @@
+-- Deletes a questionnaire that has a response with an answer,
+-- the way that the admin page does, and rolls everything back.
+
+BEGIN;
+
+WITH new_user AS (
+    INSERT INTO auth.users DEFAULT VALUES
+    RETURNING id
+)
+INSERT INTO public.profiles (id, full_name)
+SELECT id, 'Reproducer' FROM new_user;
+
+INSERT INTO public.questionnaires (title, created_by)
+SELECT 'Reproducer questionnaire', id
+FROM public.profiles
+WHERE full_name = 'Reproducer';
+
+INSERT INTO public.questions (questionnaire_id, question_text, category)
+SELECT id, 'Question', 'Perceived Usefulness'
+FROM public.questionnaires
+WHERE title = 'Reproducer questionnaire';
+
+INSERT INTO public.likert_scales (questionnaire_id)
+SELECT id
+FROM public.questionnaires
+WHERE title = 'Reproducer questionnaire';
+
+INSERT INTO public.likert_scale_options (likert_scale_id, value, label)
+SELECT ls.id, 1, 'Level 1'
+FROM public.likert_scales ls
+JOIN public.questionnaires q ON q.id = ls.questionnaire_id
+WHERE q.title = 'Reproducer questionnaire';
+
+INSERT INTO public.responses (user_id, questionnaire_id, is_submitted)
+SELECT created_by, id, true
+FROM public.questionnaires
+WHERE title = 'Reproducer questionnaire';
+
+INSERT INTO public.answers (response_id, question_id, selected_option)
+SELECT r.id, qs.id, lso.id
+FROM public.responses r
+JOIN public.questions qs ON qs.questionnaire_id = r.questionnaire_id
+JOIN public.likert_scales ls ON ls.questionnaire_id = r.questionnaire_id
+JOIN public.likert_scale_options lso ON lso.likert_scale_id = ls.id
+JOIN public.questionnaires q ON q.id = r.questionnaire_id
+WHERE q.title = 'Reproducer questionnaire';
+
+DELETE FROM public.questionnaires
+WHERE title = 'Reproducer questionnaire';
+
+ROLLBACK;